@@ -43,30 +43,75 @@ def _utf8_open(file, mode='r', buffering=-1, encoding=None, errors=None,
 builtins.open = _utf8_open
 
 import threading
+import functools
+import hashlib
 import tempfile
 import time
 import json
+import queue
+import heapq
+import itertools
+import atexit
 import logging
-import traceback
-from datetime import datetime
+import logging.handlers
+import stat
+import shlex
+from concurrent.futures import ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
 from pathlib import Path
 
-import rumps
+import numpy as np
 import pyperclip
+import rumps
+import sounddevice as sd
 import subprocess
-import webbrowser
 import signal
 
+try:
+    # pyobjc comes with rumps; writing the pasteboard in-process avoids
+    # pyperclip's pbcopy fork
+    from AppKit import NSPasteboard, NSPasteboardTypeString
+except ImportError:
+    NSPasteboard = None
+
+try:
+    from PyObjCTools.AppHelper import callAfter
+except ImportError:
+    callAfter = None
+
 # Setup logging to file
+# Records are handed to a queue and written by a listener thread, so logging
+# from the rumps main thread never blocks on disk I/O.
+# Set PARAKEET_DEBUG=1 for verbose logs.
 LOG_PATH = Path.home() / ".parakeet_mlx.log"
+# stdout/stderr of the API server subprocess; rolled over to .1 at startup
+SERVER_LOG_PATH = Path.home() / ".parakeet_mlx.server.log"
+SERVER_LOG_MAX_BYTES = 5_000_000
+LOG_LEVEL = (
+    logging.DEBUG
+    if os.environ.get("PARAKEET_DEBUG", "").lower() in ("1", "true")
+    else logging.INFO
+)
+_log_formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
+_log_file_handler = logging.handlers.RotatingFileHandler(
+    LOG_PATH, maxBytes=2_000_000, backupCount=3
+)
+_log_file_handler.setLevel(LOG_LEVEL)
+_log_file_handler.setFormatter(_log_formatter)
+_log_console_handler = logging.StreamHandler()  # Also print to console
+_log_console_handler.setFormatter(_log_formatter)
+
+_log_queue = queue.Queue(-1)
 logging.basicConfig(
-    level=logging.DEBUG,
-    format='%(asctime)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler(LOG_PATH),
-        logging.StreamHandler()  # Also print to console
-    ]
+    level=LOG_LEVEL,
+    handlers=[logging.handlers.QueueHandler(_log_queue)]
+)
+_log_listener = logging.handlers.QueueListener(
+    _log_queue, _log_file_handler, _log_console_handler,
+    respect_handler_level=True
 )
+_log_listener.start()
+atexit.register(_log_listener.stop)
 logger = logging.getLogger("parakeet")
 
 # Add current dir for local imports
@@ -74,108 +119,68 @@ current_dir = os.path.dirname(os.path.abspath(__file__))
 sys.path.insert(0, current_dir)
 
 from parakeet_mlx_guiapi.utils.config import get_config, save_config
+from parakeet_mlx_guiapi.utils import jsonio
+from parakeet_mlx_guiapi.audio import AudioProcessor
+
+# Append-only JSON Lines, oldest first; compacted once it holds
+# HISTORY_COMPACT_AT entries
+HISTORY_PATH = Path.home() / ".parakeet_history.jsonl"
+LEGACY_HISTORY_PATH = Path.home() / ".parakeet_history.json"
+HISTORY_LIMIT = 20
+HISTORY_COMPACT_AT = 2 * HISTORY_LIMIT
+# Newest entries listed in the History submenu
+HISTORY_MENU_SIZE = 10
+
+
+@dataclass(frozen=True, slots=True)
+class ModelInfo:
+    """Static metadata for a Parakeet model shown in the menu."""
+    id: str
+    name: str
+    category: str = "Other"
+    description: str = ""
+    size: str = "Unknown"
+    languages: str = "Unknown"
+    lang_list: tuple[str, ...] = ("en",)
+    wer: str = "N/A"
+    speed: str = "N/A"
+    features: tuple[str, ...] = ()
+    recommended: bool = False
+    # Menu strings derived once from the fields above
+    info_lines: tuple[str, ...] = field(init=False, repr=False, compare=False)
+    feature_bullets: tuple[str, ...] = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        object.__setattr__(self, "info_lines", (
+            f"Current: {self.name}",
+            f"Languages: {self.languages}",
+            f"WER: {self.wer}",
+            f"Speed: {self.speed}",
+            f"Size: {self.size}",
+        ))
+        object.__setattr__(self, "feature_bullets", tuple(f"• {feat}" for feat in self.features))
 
 
-# Available models (from mlx-community on HuggingFace)
-# Organized by category with detailed metadata
-AVAILABLE_MODELS = [
-    # === TDT Models (Best accuracy, good speed) ===
-    {
-        "id": "mlx-community/parakeet-tdt-0.6b-v3",
-        "name": "TDT 0.6B v3 Multilingual",
-        "category": "Multilingual",
-        "description": "25 languages incl. French, Spanish",
-        "size": "~1.2GB",
-        "languages": "EN, FR, ES, DE, IT, PT + 19 more",
-        "lang_list": ["en", "de", "fr", "es", "it", "pt", "nl", "pl", "ru", "uk", "cs", "sk", "bg", "hr", "da", "et", "fi", "el", "hu", "lv", "lt", "mt", "ro", "sl", "sv"],
-        "wer": "6.34%",
-        "speed": "Fast",
-        "features": ["Auto punctuation", "Auto language detection", "Best for multilingual"],
-        "recommended": True,
-    },
-    {
-        "id": "mlx-community/parakeet-tdt-0.6b-v2",
-        "name": "TDT 0.6B v2 English",
-        "category": "English",
-        "description": "English-only, very accurate",
-        "size": "~1.2GB",
-        "languages": "English only",
-        "lang_list": ["en"],
-        "wer": "6.5%",
-        "speed": "Fast",
-        "features": ["Auto punctuation", "Timestamps"],
-        "recommended": False,
-    },
-    {
-        "id": "mlx-community/parakeet-tdt-1.1b",
-        "name": "TDT 1.1B English",
-        "category": "English",
-        "description": "Best English accuracy",
-        "size": "~2.2GB",
-        "languages": "English only",
-        "lang_list": ["en"],
-        "wer": "~5.5%",
-        "speed": "Slower",
-        "features": ["Auto punctuation", "Best for meetings/interviews"],
-        "recommended": False,
-    },
+@functools.cache
+def _load_model_catalog():
+    """Load the Parakeet model catalog from the packaged models.json."""
+    from importlib.resources import files
+    text = files("parakeet_mlx_guiapi.data").joinpath("models.json").read_text(encoding="utf-8")
+    return tuple(
+        ModelInfo(**{
+            **entry,
+            "lang_list": tuple(entry.get("lang_list", ("en",))),
+            "features": tuple(entry.get("features", ())),
+        })
+        for entry in json.loads(text)
+    )
 
-    # === CTC Models (Fastest inference) ===
-    {
-        "id": "mlx-community/parakeet-ctc-0.6b",
-        "name": "CTC 0.6B English",
-        "category": "Fast",
-        "description": "Fastest inference",
-        "size": "~1.2GB",
-        "languages": "English only",
-        "lang_list": ["en"],
-        "wer": "~7%",
-        "speed": "Fastest",
-        "features": ["Non-autoregressive", "Real-time capable"],
-        "recommended": False,
-    },
-    {
-        "id": "mlx-community/parakeet-ctc-1.1b",
-        "name": "CTC 1.1B English",
-        "category": "Fast",
-        "description": "Fast + better accuracy",
-        "size": "~2.2GB",
-        "languages": "English only",
-        "lang_list": ["en"],
-        "wer": "~6%",
-        "speed": "Very Fast",
-        "features": ["Non-autoregressive", "Long audio support"],
-        "recommended": False,
-    },
 
-    # === Hybrid & Special Models ===
-    {
-        "id": "mlx-community/parakeet-tdt_ctc-1.1b",
-        "name": "TDT+CTC 1.1B English",
-        "category": "Long Audio",
-        "description": "11hr audio in one pass",
-        "size": "~2.2GB",
-        "languages": "English only",
-        "lang_list": ["en"],
-        "wer": "~5.8%",
-        "speed": "Medium",
-        "features": ["Dual decoder", "Best for long recordings", "Podcasts/lectures"],
-        "recommended": False,
-    },
-    {
-        "id": "mlx-community/parakeet-tdt_ctc-110m",
-        "name": "TDT+CTC 110M Tiny",
-        "category": "Lightweight",
-        "description": "Smallest, instant loading",
-        "size": "~220MB",
-        "languages": "English only",
-        "lang_list": ["en"],
-        "wer": "~12%",
-        "speed": "Instant",
-        "features": ["Ultra lightweight", "Quick notes"],
-        "recommended": False,
-    },
-]
+# Available models (from mlx-community on HuggingFace)
+# Organized by category with detailed metadata, see parakeet_mlx_guiapi/data/models.json
+AVAILABLE_MODELS = _load_model_catalog()
+
+_MODELS_BY_ID = {model.id: model for model in AVAILABLE_MODELS}
 
 # Available STT providers
 AVAILABLE_PROVIDERS = [
@@ -184,7 +189,7 @@ AVAILABLE_PROVIDERS = [
         "name": "Parakeet-MLX (Local)",
         "description": "Local transcription on Apple Silicon",
         "requires_api_key": False,
-        "models": AVAILABLE_MODELS,  # Uses the AVAILABLE_MODELS list
+        "models": AVAILABLE_MODELS,  # Uses the AVAILABLE_MODELS tuple
     },
     {
         "id": "deepgram",
@@ -219,24 +224,171 @@ AVAILABLE_PROVIDERS = [
 ]
 
 
+# Preset speaker counts offered in the diarization menu
+SPEAKER_CHOICES = tuple((num, f"{num} speakers") for num in range(2, 7))
+
+
+# Seconds of audio preallocated per recording (grows if exceeded)
+RECORDING_PREALLOC_SECONDS = 300
+# Grow the capture buffer in the background once less than this much is left
+RECORDING_HEADROOM_SECONDS = 60
+# Past this much audio in RAM, older samples are spilled to a temp WAV instead
+RECORDING_MEMORY_CAP_SECONDS = 1800
+
+
+def _copy_to_clipboard(text):
+    """Put text on the general pasteboard."""
+    if NSPasteboard is None:
+        pyperclip.copy(text)
+        return
+    pasteboard = NSPasteboard.generalPasteboard()
+    pasteboard.clearContents()
+    pasteboard.setString_forType_(text, NSPasteboardTypeString)
+
+
+def _on_main_thread(fn, *args):
+    """Run fn on the AppKit main thread; menus must not be changed from workers."""
+    if callAfter is None:
+        fn(*args)
+        return
+    callAfter(fn, *args)
+
+
+def _pyannote_installed():
+    """Return True if pyannote.audio can be imported (warms the import too)."""
+    try:
+        import pyannote.audio  # noqa: F401
+        return True
+    except Exception:
+        return False  # Missing, or a broken torch install
+
+
+def _prewarm_transcriber_import():
+    """Import the transcriber module (mlx, parakeet_mlx, ...) ahead of the first model load."""
+    try:
+        import parakeet_mlx_guiapi.transcription.transcriber  # noqa: F401
+    except Exception as e:
+        # The loader will hit and report the same error
+        logger.debug(f"Transcriber prewarm import failed: {e}")
+
+
+def _menu_number(title):
+    """Parse the leading number from a menu title like "✓ 120s" (0 if none)."""
+    digits = ""
+    for ch in title.lstrip("✓ "):
+        if not ch.isdigit():
+            break
+        digits += ch
+    return int(digits) if digits else 0
+
+
+# Short-lived cache of os.stat results, keyed by path
+_STAT_CACHE = {}
+_STAT_TTL = 2.0
+
+
+def cached_stat(path):
+    """Return os.stat(path), or None if it doesn't exist, cached for a couple of seconds."""
+    path = os.fspath(path)
+    now = time.monotonic()
+    hit = _STAT_CACHE.get(path)
+    if hit is not None and now - hit[0] < _STAT_TTL:
+        return hit[1]
+    try:
+        st = os.stat(path)
+    except OSError:
+        st = None
+    _STAT_CACHE[path] = (now, st)
+    return st
+
+
+# Fixed AppleScript that runs its first argument in a new Terminal window;
+# the command is passed via argv so it never needs escaping into the script
+_TERMINAL_SCRIPT = (
+    "on run argv",
+    'tell application "Terminal"',
+    "activate",
+    "do script (item 1 of argv)",
+    "end tell",
+    "end run",
+)
+
+
+_FILE_PICKER_SCRIPT = (
+    'set theFile to choose file with prompt "Select an audio file to transcribe:" '
+    'of type {"public.audio", "com.apple.m4a-audio", "public.mp3", "com.microsoft.waveform-audio"}',
+    "return POSIX path of theFile",
+)
+
+# Compiled AppleScripts, keyed by a hash of their source
+SCRIPT_CACHE_DIR = Path.home() / "Library" / "Caches" / "parakeet"
+
+
+@functools.cache
+def _osascript_args(script_lines):
+    """
+    Return the osascript command for a script, compiled once with osacompile.
+
+    The .scpt is cached on disk so later runs skip parsing and compiling the
+    source; if compiling fails the source is passed with -e as before.
+    """
+    source_args = []
+    for line in script_lines:
+        source_args += ["-e", line]
+    digest = hashlib.sha1("\n".join(script_lines).encode()).hexdigest()[:12]
+    compiled = SCRIPT_CACHE_DIR / f"{digest}.scpt"
+    if not compiled.exists():
+        try:
+            SCRIPT_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+            tmp = compiled.with_suffix(".tmp.scpt")
+            subprocess.run(["osacompile", "-o", str(tmp), *source_args], check=True, capture_output=True)
+            os.replace(tmp, compiled)
+        except (OSError, subprocess.CalledProcessError) as e:
+            logger.debug("osacompile failed, using script source: %s", e)
+            return ("osascript", *source_args)
+    return ("osascript", str(compiled))
+
+
+def _run_in_terminal(command):
+    """Run a shell command in a new Terminal window."""
+    subprocess.run([*_osascript_args(_TERMINAL_SCRIPT), command], check=True)
+
+
+def _download_command(model, then_load=False):
+    """Build the shell command that runs the packaged model download script."""
+    from importlib.resources import files
+    script = files("parakeet_mlx_guiapi.data").joinpath("download_model.sh")
+    args = ["bash", str(script), sys.executable, model.id, model.name, model.size]
+    if then_load:
+        args.append("--then-load")
+    return shlex.join(args)
+
+
+def _set_checked(item, checked):
+    """Add or remove the "✓ " prefix on a menu item's title in place."""
+    base = item.title.removeprefix("✓ ")
+    item.title = f"✓ {base}" if checked else base
+
+
+def _shorten_path(path):
+    """Shorten a long path for display in a menu item."""
+    return path if len(path) < 40 else "..." + path[-37:]
+
+
+_PROVIDERS_BY_ID = {provider["id"]: provider for provider in AVAILABLE_PROVIDERS}
+
+
 def get_provider_by_id(provider_id):
     """Get provider dict by its ID."""
-    for provider in AVAILABLE_PROVIDERS:
-        if provider["id"] == provider_id:
-            return provider
-    return None
+    return _PROVIDERS_BY_ID.get(provider_id)
 
 
-# Group models by category for menu display
-def get_models_by_category():
-    """Group models by their category."""
-    categories = {}
-    for model in AVAILABLE_MODELS:
-        cat = model.get("category", "Other")
-        if cat not in categories:
-            categories[cat] = []
-        categories[cat].append(model)
-    return categories
+# Category submenus in display order, grouped once at import
+CATEGORY_ORDER = ("Multilingual", "English", "Fast", "Long Audio", "Lightweight")
+_MODELS_BY_CATEGORY = {
+    category: tuple(m for m in AVAILABLE_MODELS if m.category == category)
+    for category in CATEGORY_ORDER
+}
 
 
 class ParakeetMenuBarApp(rumps.App):
@@ -259,10 +411,19 @@ class ParakeetMenuBarApp(rumps.App):
         self.recording = False
         self.processing = False
         self.transcriber = None
+        self._transcriber_ready = threading.Event()  # Set while self.transcriber is usable
         self._stream = None
-        self._audio_data = []
+        self._audio_buf = None  # Preallocated int16 capture buffer
+        self._audio_len = 0  # Samples written into _audio_buf
+        self._audio_lock = threading.Lock()  # Guards _audio_buf swaps against the callback
+        self._audio_growing = False
+        self._grow_lock = threading.Lock()  # Held while growing or spilling the buffer
+        self._spill_fh = None  # Temp WAV holding the start of very long recordings
+        self._spill_path = None
+        self._spill_samples = 0
         self._recording_start_time = None
-        self._timer = None
+        # Recording duration in the title; fires on the main run loop
+        self._timer = rumps.Timer(self._tick_title, 1)
 
         # Server control
         self._server_process = None
@@ -271,38 +432,103 @@ class ParakeetMenuBarApp(rumps.App):
 
         # Load config
         self.config = get_config()
-
-        # History of transcriptions (last 10)
+        self._show_notifications = self.config.get("show_notifications", True)
+        self._save_timer = None
+        self._save_lock = threading.Lock()
+
+        # Paths shown in the Advanced menu don't change while running
+        self._hf_cache = None
+        self._python_short = _shorten_path(sys.executable)
+        self._cache_short = _shorten_path(self._get_cache_path())
+        self._model_cache_dirs = {
+            model.id: os.path.join(self._hf_cache, "models--" + model.id.replace("/", "--"))
+            for model in AVAILABLE_MODELS
+        }
+        # model id -> (checked at, cached?), kept as long as cached_stat results
+        self._model_cached_results = {}
+
+        # Fan out independent startup probes (disk, network, imports) so they
+        # overlap instead of running back to back
+        model_name = self.config.get("model_name", AVAILABLE_MODELS[0].id)
+        self._probe_pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix="probe")
+        self._f_cached = self._probe_pool.submit(self._is_model_cached, model_name)
+        # Last pyannote probe result; None until the first one finishes
+        self._pyannote_ok = None
+        self._submit_pyannote_probe()
+        self._probe_pool.submit(_prewarm_transcriber_import)
+        self._probe_pool.submit(_osascript_args, _FILE_PICKER_SCRIPT)
+        self._submit_access_probe()
+
+        # One diarizer shared by recordings and dropped files; its pipeline
+        # isn't thread-safe, so every use holds _diarizer_lock
+        self._diarizer = None
+        self._diarizer_lock = threading.Lock()
+        if self.config.get("diarization_enabled", False):
+            self._probe_pool.submit(self._warm_diarizer)
+
+        # History of transcriptions (last 10 shown), loaded and written off
+        # the main thread by one worker
         self.history = []
-        self._load_history()
+        self._history_rendered = None
+        self._history_items = []  # History submenu entries, newest first
+        self._history_queue = queue.Queue()
+        threading.Thread(target=self._history_writer, daemon=True).start()
+
+        # Delayed UI callbacks (icon resets) share one timer thread
+        self._ui_timer_q = queue.Queue()
+        threading.Thread(target=self._ui_timer_worker, daemon=True).start()
 
         # Error tracking for debugging
         self._last_error = None
 
+        # Fire-and-forget helper processes (`open` etc.), reaped lazily
+        self._children = set()
+
         # Build menu - rumps requires menu items to be created here
         self._setup_menu()
 
+        # Model loads run one at a time on a single loader thread; each
+        # request gets a generation number and only the newest may install
+        # its transcriber
+        self._loader = ThreadPoolExecutor(max_workers=1, thread_name_prefix="loader")
+        self._load_lock = threading.Lock()
+        self._load_generation = 0
+        self._load_future = None
+
         # Lazy-load transcriber in background (with download progress if needed)
-        threading.Thread(target=self._init_transcriber_with_download, daemon=True).start()
+        self._submit_load(self._init_transcriber_with_download)
 
-    def _init_transcriber_with_download(self):
+    def _submit_load(self, fn):
+        """Queue a model load, superseding any load that hasn't finished yet."""
+        with self._load_lock:
+            self._load_generation += 1
+            if self._load_future is not None:
+                self._load_future.cancel()  # No-op if it's already running
+            self._load_future = self._loader.submit(fn, self._load_generation)
+
+    def _init_transcriber_with_download(self, generation=None):
         """Initialize transcriber, downloading in Terminal if needed."""
-        model_name = self.config.get("model_name", AVAILABLE_MODELS[0]["id"])
-        model_info = self._get_model_by_id(model_name) or {}
+        model_name = self.config.get("model_name", AVAILABLE_MODELS[0].id)
+        model_info = self._get_model_by_id(model_name)
 
         logger.info(f"Starting transcriber initialization for: {model_name}")
 
-        is_cached = self._is_model_cached(model_name)
+        # Use the startup probe once; later reloads re-check the cache
+        future, self._f_cached = self._f_cached, None
+        if future is not None:
+            is_cached = future.result()
+        else:
+            is_cached = self._is_model_cached(model_name)
         logger.info(f"Model cache check: {'cached' if is_cached else 'not cached'}")
 
         if not is_cached:
             # Model needs download - use Terminal for progress
             logger.info("Model needs download, opening Terminal...")
-            self._download_and_load_model(model_info if model_info else {"id": model_name, "name": model_name.split("/")[-1]})
+            self._download_and_load_model(model_info or ModelInfo(id=model_name, name=model_name.split("/")[-1]))
         else:
             # Model is cached, load directly
             logger.info("Model is cached, loading directly...")
-            self._init_transcriber()
+            self._init_transcriber(generation)
 
     def _setup_menu(self):
         """Set up the initial menu structure."""
@@ -374,6 +600,23 @@ class ParakeetMenuBarApp(rumps.App):
         # Hide cancel button initially
         self.cancel_button.set_callback(None)  # Disable it initially
 
+    def _schedule_save(self):
+        """Save config after a short quiet period so bursts of changes write once."""
+        with self._save_lock:
+            if self._save_timer:
+                self._save_timer.cancel()
+            self._save_timer = threading.Timer(0.3, self._flush_save)
+            self._save_timer.daemon = True
+            self._save_timer.start()
+
+    def _flush_save(self):
+        """Write any pending config change to disk now."""
+        with self._save_lock:
+            if self._save_timer:
+                self._save_timer.cancel()
+            self._save_timer = None
+        save_config(self.config)
+
     def _populate_server_menu(self):
         """Populate the server control menu."""
         # Server status
@@ -410,7 +653,7 @@ class ParakeetMenuBarApp(rumps.App):
         current_port = self.config.get("server_port", 8080)
         for port in [8080, 8000, 3000, 5000]:
             title = f"{'✓ ' if port == current_port else ''}{port}"
-            port_menu.add(rumps.MenuItem(title, callback=lambda _, p=port: self.set_server_port(p)))
+            port_menu.add(rumps.MenuItem(title, callback=self._on_port_pick))
         config_menu.add(port_menu)
 
         # Gradio port
@@ -418,7 +661,7 @@ class ParakeetMenuBarApp(rumps.App):
         current_gradio = self.config.get("gradio_port", 8081)
         for port in [8081, 7860, 5001]:
             title = f"{'✓ ' if port == current_gradio else ''}{port}"
-            gradio_port_menu.add(rumps.MenuItem(title, callback=lambda _, p=port: self.set_gradio_port(p)))
+            gradio_port_menu.add(rumps.MenuItem(title, callback=self._on_gradio_port_pick))
         config_menu.add(gradio_port_menu)
 
         # Debug mode toggle
@@ -428,6 +671,14 @@ class ParakeetMenuBarApp(rumps.App):
 
         self.server_menu.add(config_menu)
 
+    def _on_port_pick(self, sender):
+        """Menu callback for the API port items."""
+        self.set_server_port(_menu_number(sender.title))
+
+    def _on_gradio_port_pick(self, sender):
+        """Menu callback for the Gradio port items."""
+        self.set_gradio_port(_menu_number(sender.title))
+
     def _refresh_server_menu(self):
         """Refresh the server menu."""
         keys = list(self.server_menu.keys())
@@ -493,35 +744,33 @@ class ParakeetMenuBarApp(rumps.App):
 
         # Update config
         self.config["stt_provider"] = provider_id
-        save_config(self.config)
+        self._schedule_save()
 
         # Refresh menus
         self._refresh_provider_menu()
         self._refresh_model_menu()
 
-        if self.config.get("show_notifications", True):
-            rumps.notification(
-                title="Provider Changed",
-                subtitle="",
-                message=f"Now using {provider['name']}",
-                sound=False
-            )
+        self._notify(
+            title="Provider Changed",
+            subtitle="",
+            message=f"Now using {provider['name']}",
+            sound=False
+        )
 
         logger.info(f"Switched to provider: {provider_id}")
 
     def select_deepgram_model(self, model):
         """Select a Deepgram model."""
         self.config["deepgram_model"] = model["id"]
-        save_config(self.config)
+        self._schedule_save()
         self._refresh_model_menu()
 
-        if self.config.get("show_notifications", True):
-            rumps.notification(
-                title="Model Changed",
-                subtitle="",
-                message=f"Deepgram model: {model['name']}",
-                sound=False
-            )
+        self._notify(
+            title="Model Changed",
+            subtitle="",
+            message=f"Deepgram model: {model['name']}",
+            sound=False
+        )
 
         logger.info(f"Selected Deepgram model: {model['id']}")
 
@@ -546,16 +795,15 @@ class ParakeetMenuBarApp(rumps.App):
             new_key = response.text.strip()
             if new_key:
                 self.config["deepgram_api_key"] = new_key
-                save_config(self.config)
+                self._schedule_save()
                 self._refresh_provider_menu()
 
-                if self.config.get("show_notifications", True):
-                    rumps.notification(
-                        title="API Key Saved",
-                        subtitle="",
-                        message="Deepgram API key has been configured",
-                        sound=False
-                    )
+                self._notify(
+                    title="API Key Saved",
+                    subtitle="",
+                    message="Deepgram API key has been configured",
+                    sound=False
+                )
                 logger.info("Deepgram API key saved")
             else:
                 rumps.alert(
@@ -565,6 +813,7 @@ class ParakeetMenuBarApp(rumps.App):
 
     def open_deepgram_console(self, _):
         """Open Deepgram console in browser."""
+        import webbrowser
         webbrowser.open("https://console.deepgram.com")
 
     def configure_huggingface_token(self, _):
@@ -586,22 +835,28 @@ class ParakeetMenuBarApp(rumps.App):
             new_token = response.text.strip()
             if new_token:
                 self.config["huggingface_token"] = new_token
-                save_config(self.config)
+                self._schedule_save()
+                self._submit_access_probe()
+                self._reset_diarizer()
                 self._refresh_settings_menu()
 
-                if self.config.get("show_notifications", True):
-                    rumps.notification(
-                        title="Token Saved",
-                        subtitle="",
-                        message="HuggingFace token has been configured",
-                        sound=False
-                    )
+                self._notify(
+                    title="Token Saved",
+                    subtitle="",
+                    message="HuggingFace token has been configured",
+                    sound=False
+                )
                 logger.info("HuggingFace token saved")
 
     def _populate_model_menu(self):
         """Populate the model selection menu based on current provider."""
         current_provider = self.config.get("stt_provider", "parakeet")
 
+        # Items kept for in-place updates (see _update_model_menu)
+        self._model_items = {}
+        self._model_info_items = []
+        self._model_features_menu = None
+
         if current_provider == "parakeet":
             self._populate_parakeet_models()
         elif current_provider == "deepgram":
@@ -609,31 +864,21 @@ class ParakeetMenuBarApp(rumps.App):
 
     def _populate_parakeet_models(self):
         """Populate Parakeet model menu organized by category."""
-        current_model = self.config.get("model_name", AVAILABLE_MODELS[0]["id"])
-        categories = get_models_by_category()
-
-        # Define category order
-        category_order = [
-            "Multilingual",
-            "English",
-            "Fast",
-            "Long Audio",
-            "Lightweight",
-        ]
+        current_model = self.config.get("model_name", AVAILABLE_MODELS[0].id)
 
-        for category in category_order:
-            if category not in categories:
+        for category, models in _MODELS_BY_CATEGORY.items():
+            if not models:
                 continue
 
             # Add category header
             cat_submenu = rumps.MenuItem(category)
 
-            for model in categories[category]:
+            for model in models:
                 # Build display title with checkmark and details
-                title = model["name"]
-                if model["id"] == current_model:
+                title = model.name
+                if model.id == current_model:
                     title = f"✓ {title}"
-                if model.get("recommended"):
+                if model.recommended:
                     title = f"⭐ {title}"
 
                 item = rumps.MenuItem(
@@ -641,6 +886,7 @@ class ParakeetMenuBarApp(rumps.App):
                     callback=lambda sender, m=model: self.select_model(m)
                 )
                 cat_submenu.add(item)
+                self._model_items[model.id] = item
 
             self.model_menu.add(cat_submenu)
 
@@ -650,24 +896,19 @@ class ParakeetMenuBarApp(rumps.App):
         # Show current model details
         current = self._get_model_by_id(current_model)
         if current:
-            info_items = [
-                f"Current: {current['name']}",
-                f"Languages: {current.get('languages', 'Unknown')}",
-                f"WER: {current.get('wer', 'N/A')}",
-                f"Speed: {current.get('speed', 'N/A')}",
-                f"Size: {current.get('size', 'Unknown')}",
-            ]
-            for info in info_items:
-                self.model_menu.add(rumps.MenuItem(info))
+            for info in current.info_lines:
+                info_item = rumps.MenuItem(info)
+                self.model_menu.add(info_item)
+                self._model_info_items.append(info_item)
 
             # Show features if available
-            features = current.get("features", [])
-            if features:
+            if current.feature_bullets:
                 self.model_menu.add(None)
                 feat_menu = rumps.MenuItem("Features")
-                for feat in features:
-                    feat_menu.add(rumps.MenuItem(f"• {feat}"))
+                for bullet in current.feature_bullets:
+                    feat_menu.add(rumps.MenuItem(bullet))
                 self.model_menu.add(feat_menu)
+                self._model_features_menu = feat_menu
 
     def _populate_deepgram_models(self):
         """Populate Deepgram model menu."""
@@ -677,11 +918,13 @@ class ParakeetMenuBarApp(rumps.App):
         if not deepgram_provider:
             return
 
-        # List all Deepgram models
+        # List all Deepgram models, noting the current one on the way
+        current = None
         for model in deepgram_provider["models"]:
             title = model["name"]
             if model["id"] == current_model:
                 title = f"✓ {title}"
+                current = model
 
             self.model_menu.add(rumps.MenuItem(
                 title,
@@ -691,41 +934,31 @@ class ParakeetMenuBarApp(rumps.App):
         # Add separator and current model info
         self.model_menu.add(None)
 
-        # Find current model info
-        current = None
-        for m in deepgram_provider["models"]:
-            if m["id"] == current_model:
-                current = m
-                break
-
         if current:
             self.model_menu.add(rumps.MenuItem(f"Current: {current['name']}"))
             if current.get("description"):
                 self.model_menu.add(rumps.MenuItem(f"📝 {current['description']}"))
 
     def _get_model_by_id(self, model_id):
-        """Get model dict by its ID."""
-        for model in AVAILABLE_MODELS:
-            if model["id"] == model_id:
-                return model
-        return None
+        """Get ModelInfo by its ID."""
+        return _MODELS_BY_ID.get(model_id)
 
     def _get_model_short_name(self, model_id):
         """Get short display name for a model ID."""
-        for model in AVAILABLE_MODELS:
-            if model["id"] == model_id:
-                return model["name"]
-        return model_id.split("/")[-1]
+        model = _MODELS_BY_ID.get(model_id)
+        return model.name if model else model_id.split("/")[-1]
 
     def _get_model_size(self, model_id):
         """Get model size for display."""
-        for model in AVAILABLE_MODELS:
-            if model["id"] == model_id:
-                return model["size"]
-        return "Unknown"
+        model = _MODELS_BY_ID.get(model_id)
+        return model.size if model else "Unknown"
 
     def _populate_settings_menu(self):
         """Populate the settings submenu."""
+        # Chunk duration items from every submenu that offers them, kept
+        # for in-place checkmark updates (see set_chunk_duration)
+        self._chunk_items = {}
+
         # === Diarization (Speaker ID) ===
         diarize_enabled = self.config.get("diarization_enabled", False)
         diarize_available, diarize_msg = self._check_diarization_available()
@@ -733,14 +966,19 @@ class ParakeetMenuBarApp(rumps.App):
         # Create diarization submenu
         diarize_menu = rumps.MenuItem("Speaker Diarization")
 
-        if diarize_available:
-            # Check for missing model access (do this in background to avoid blocking menu)
+        if diarize_available is None:
+            # The pyannote import probe is still running; the menu is
+            # rebuilt when it finishes
+            diarize_menu.add(rumps.MenuItem("⏳ Checking pyannote.audio…"))
+        elif diarize_available:
+            # Model access is probed in the background; until the result is
+            # in, proceed optimistically rather than blocking the menu
             missing_models = []
-            try:
-                # Quick check - only block briefly
-                missing_models = self._check_all_models_accessible()
-            except Exception:
-                pass  # Network error, etc. - proceed optimistically
+            if self._f_access.done():
+                try:
+                    missing_models = self._f_access.result()
+                except Exception:
+                    pass  # Network error, etc. - proceed optimistically
 
             if missing_models:
                 # Some models still need access
@@ -766,18 +1004,17 @@ class ParakeetMenuBarApp(rumps.App):
                 auto_title = "✓ Auto-detect" if current_speakers == 0 else "Auto-detect"
                 speakers_menu.add(rumps.MenuItem(
                     auto_title,
-                    callback=lambda _: self.set_num_speakers(0)
+                    callback=self._on_speakers_pick
                 ))
                 speakers_menu.add(None)
 
                 # Preset options: 2-6 speakers
-                for num in range(2, 7):
-                    title = f"{num} speakers"
+                for num, title in SPEAKER_CHOICES:
                     if current_speakers == num:
                         title = f"✓ {title}"
                     speakers_menu.add(rumps.MenuItem(
                         title,
-                        callback=lambda _, n=num: self.set_num_speakers(n)
+                        callback=self._on_speakers_pick
                     ))
 
                 diarize_menu.add(speakers_menu)
@@ -826,21 +1063,7 @@ class ParakeetMenuBarApp(rumps.App):
             self.settings_menu.add(None)
 
         # === Chunk duration options ===
-        chunk_menu = rumps.MenuItem("Chunk Duration")
-        chunk_options = [30, 60, 120, 180, 300]
-        current_chunk = self.config.get("default_chunk_duration", 120)
-
-        for duration in chunk_options:
-            title = f"{duration}s"
-            if duration == current_chunk:
-                title = f"✓ {title}"
-            item = rumps.MenuItem(
-                title,
-                callback=lambda sender, d=duration: self.set_chunk_duration(d)
-            )
-            chunk_menu.add(item)
-
-        self.settings_menu.add(chunk_menu)
+        self.settings_menu.add(self._build_chunk_menu())
 
         # Auto-copy to clipboard toggle
         auto_copy = self.config.get("auto_copy_clipboard", True)
@@ -849,7 +1072,7 @@ class ParakeetMenuBarApp(rumps.App):
         self.settings_menu.add(copy_item)
 
         # Show notifications toggle
-        show_notif = self.config.get("show_notifications", True)
+        show_notif = self._show_notifications
         notif_title = "✓ Show Notifications" if show_notif else "Show Notifications"
         notif_item = rumps.MenuItem(notif_title, callback=self.toggle_notifications)
         self.settings_menu.add(notif_item)
@@ -892,14 +1115,10 @@ class ParakeetMenuBarApp(rumps.App):
         advanced_menu = rumps.MenuItem("Advanced")
 
         # Show Python environment
-        python_path = sys.executable
-        python_short = python_path if len(python_path) < 40 else "..." + python_path[-37:]
-        advanced_menu.add(rumps.MenuItem(f"Python: {python_short}"))
+        advanced_menu.add(rumps.MenuItem(f"Python: {self._python_short}"))
 
         # Show cache location
-        cache_path = self._get_cache_path()
-        cache_short = cache_path if len(cache_path) < 40 else "..." + cache_path[-37:]
-        advanced_menu.add(rumps.MenuItem(f"Cache: {cache_short}"))
+        advanced_menu.add(rumps.MenuItem(f"Cache: {self._cache_short}"))
 
         advanced_menu.add(None)
 
@@ -969,7 +1188,7 @@ class ParakeetMenuBarApp(rumps.App):
 
         # Save to config
         self.config["deepgram_options"] = current_options
-        save_config(self.config)
+        self._schedule_save()
 
         # Refresh the settings menu
         self._refresh_settings_menu()
@@ -979,9 +1198,8 @@ class ParakeetMenuBarApp(rumps.App):
         status = "enabled" if current_options[option_key] else "disabled"
         logger.info(f"Deepgram option '{option_name}' {status}")
 
-    def _populate_parakeet_options_menu(self, menu):
-        """Populate the Parakeet options submenu."""
-        # Chunk duration submenu
+    def _build_chunk_menu(self):
+        """Build a Chunk Duration submenu and register its items in _chunk_items."""
         chunk_menu = rumps.MenuItem("Chunk Duration")
         chunk_options = [30, 60, 120, 180, 300]
         current_chunk = self.config.get("default_chunk_duration", 120)
@@ -990,17 +1208,24 @@ class ParakeetMenuBarApp(rumps.App):
             title = f"{duration}s"
             if duration == current_chunk:
                 title = f"✓ {title}"
-            chunk_menu.add(rumps.MenuItem(
+            item = rumps.MenuItem(
                 title,
-                callback=lambda _, d=duration: self.set_chunk_duration(d)
-            ))
-        menu.add(chunk_menu)
+                callback=self._on_chunk_pick
+            )
+            chunk_menu.add(item)
+            self._chunk_items.setdefault(duration, []).append(item)
+        return chunk_menu
+
+    def _populate_parakeet_options_menu(self, menu):
+        """Populate the Parakeet options submenu."""
+        # Chunk duration submenu
+        menu.add(self._build_chunk_menu())
 
         # Language selection submenu (for multilingual models)
-        current_model = self.config.get("model_name", AVAILABLE_MODELS[0]["id"])
+        current_model = self.config.get("model_name", AVAILABLE_MODELS[0].id)
         model_info = self._get_model_by_id(current_model)
 
-        if model_info and "lang_list" in model_info and len(model_info["lang_list"]) > 1:
+        if model_info and len(model_info.lang_list) > 1:
             lang_menu = rumps.MenuItem("Language")
             current_lang = self.config.get("parakeet_language", "auto")
 
@@ -1043,7 +1268,7 @@ class ParakeetMenuBarApp(rumps.App):
             lang_menu.add(None)
 
             # Add supported languages
-            for lang_code in model_info["lang_list"]:
+            for lang_code in model_info.lang_list:
                 lang_name = lang_names.get(lang_code, lang_code.upper())
                 title = f"{'✓ ' if current_lang == lang_code else ''}{lang_name}"
                 lang_menu.add(rumps.MenuItem(
@@ -1056,14 +1281,13 @@ class ParakeetMenuBarApp(rumps.App):
         # Info about current model
         menu.add(None)
         if model_info:
-            menu.add(rumps.MenuItem(f"📝 Model: {model_info.get('name', current_model)}"))
-            if "wer" in model_info:
-                menu.add(rumps.MenuItem(f"📊 WER: {model_info['wer']}"))
+            menu.add(rumps.MenuItem(f"📝 Model: {model_info.name}"))
+            menu.add(rumps.MenuItem(f"📊 WER: {model_info.wer}"))
 
     def set_parakeet_language(self, lang_code):
         """Set the Parakeet transcription language."""
         self.config["parakeet_language"] = lang_code
-        save_config(self.config)
+        self._schedule_save()
         self._refresh_settings_menu()
 
         lang_name = "Auto-detect" if lang_code == "auto" else lang_code.upper()
@@ -1112,7 +1336,7 @@ class ParakeetMenuBarApp(rumps.App):
     def select_microphone(self, device_index):
         """Select a microphone device."""
         self.config["selected_microphone"] = device_index
-        save_config(self.config)
+        self._schedule_save()
         self._refresh_settings_menu()
 
         if device_index is None:
@@ -1123,29 +1347,44 @@ class ParakeetMenuBarApp(rumps.App):
             logger.info(f"Microphone set to: {device_name}")
 
     def _check_diarization_available(self):
-        """Check if diarization is fully available."""
-        try:
-            from parakeet_mlx_guiapi.diarization import SpeakerDiarizer
-            # Also check config for token
-            token = (
-                self.config.get("huggingface_token")
-                or os.environ.get("HUGGINGFACE_TOKEN")
-                or os.environ.get("HF_TOKEN")
-            )
-            if not token:
-                return False, "HuggingFace token not set"
-            return SpeakerDiarizer.is_available()
-        except ImportError:
+        """
+        Check if diarization is fully available, without blocking.
+
+        Returns:
+        - (available, message); available is None while the pyannote probe runs
+        """
+        pyannote_ok, token_ok = self._check_diarization_components()
+        if pyannote_ok is None:
+            return None, "Checking pyannote.audio…"
+        if not pyannote_ok:
             return False, "pyannote.audio not installed"
+        if not token_ok:
+            return False, "HuggingFace token not set"
+        return True, "Diarization available"
+
+    def _submit_pyannote_probe(self):
+        """(Re)start the background pyannote import check; Settings is rebuilt if the answer changes."""
+        def on_done(future):
+            changed = future.result() != self._pyannote_ok
+            self._pyannote_ok = future.result()
+            if changed and hasattr(self, "settings_menu"):
+                _on_main_thread(self._refresh_settings_menu)
+
+        self._f_pyannote = self._probe_pool.submit(_pyannote_installed)
+        self._f_pyannote.add_done_callback(on_done)
 
     def _check_diarization_components(self):
-        """Check individual diarization components."""
-        # Check pyannote
-        try:
-            import pyannote.audio
-            pyannote_ok = True
-        except ImportError:
-            pyannote_ok = False
+        """
+        Check individual diarization components from the startup probes.
+
+        Returns:
+        - (pyannote_ok, token_ok); pyannote_ok is None until its probe finishes
+        """
+        # Check pyannote (probed in the background, never imported here)
+        pyannote_ok = self._pyannote_ok
+        if pyannote_ok is False and self._f_pyannote.done():
+            # Probe again so an install done meanwhile shows up
+            self._submit_pyannote_probe()
 
         # Check token (config or env)
         token = (
@@ -1160,7 +1399,6 @@ class ParakeetMenuBarApp(rumps.App):
     def _get_input_devices(self):
         """Get list of available input devices."""
         try:
-            import sounddevice as sd
             devices = sd.query_devices()
             input_devices = []
             for i, d in enumerate(devices):
@@ -1178,7 +1416,6 @@ class ParakeetMenuBarApp(rumps.App):
     def _get_default_input_device(self):
         """Get the default input device index."""
         try:
-            import sounddevice as sd
             return sd.default.device[0]  # Returns (input, output) tuple
         except Exception:
             return None
@@ -1211,6 +1448,10 @@ class ParakeetMenuBarApp(rumps.App):
             ("pyannote/speaker-diarization-community-1", "Community model"),
         ]
 
+    def _submit_access_probe(self):
+        """(Re)start the background model-access check, e.g. after a token change."""
+        self._f_access = self._probe_pool.submit(self._check_all_models_accessible)
+
     def _check_all_models_accessible(self):
         """Check if all required diarization models are accessible."""
         models = self._get_required_diarization_models()
@@ -1223,28 +1464,36 @@ class ParakeetMenuBarApp(rumps.App):
     def toggle_diarization(self, _):
         """Toggle speaker diarization."""
         available, msg = self._check_diarization_available()
+        if available is None:
+            self._notify(title="Speaker Diarization", message=msg)
+            return
         if not available:
             self.start_diarization_setup(None)
             return
 
         current = self.config.get("diarization_enabled", False)
         self.config["diarization_enabled"] = not current
-        save_config(self.config)
+        self._schedule_save()
         self._refresh_settings_menu()
+        if not current:
+            self._probe_pool.submit(self._warm_diarizer)
 
         status = "enabled" if not current else "disabled"
-        if self.config.get("show_notifications", True):
-            rumps.notification(
-                title="Speaker Diarization",
-                subtitle=status.capitalize(),
-                message="Transcripts will include speaker labels" if not current else "Speaker labels disabled",
-                sound=False
-            )
+        self._notify(
+            title="Speaker Diarization",
+            subtitle=status.capitalize(),
+            message="Transcripts will include speaker labels" if not current else "Speaker labels disabled",
+            sound=False
+        )
+
+    def _on_speakers_pick(self, sender):
+        """Menu callback for the speaker count items ("Auto-detect" maps to 0)."""
+        self.set_num_speakers(_menu_number(sender.title))
 
     def set_num_speakers(self, num_speakers):
         """Set the number of speakers for diarization."""
         self.config["diarization_num_speakers"] = num_speakers
-        save_config(self.config)
+        self._schedule_save()
         self._refresh_settings_menu()
 
         if num_speakers == 0:
@@ -1252,22 +1501,24 @@ class ParakeetMenuBarApp(rumps.App):
         else:
             msg = f"Will identify {num_speakers} speakers"
 
-        if self.config.get("show_notifications", True):
-            rumps.notification(
-                title="Speaker Diarization",
-                subtitle=f"{'Auto-detect' if num_speakers == 0 else f'{num_speakers} speakers'}",
-                message=msg,
-                sound=False
-            )
+        self._notify(
+            title="Speaker Diarization",
+            subtitle=f"{'Auto-detect' if num_speakers == 0 else f'{num_speakers} speakers'}",
+            message=msg,
+            sound=False
+        )
 
     def start_diarization_setup(self, _):
         """Interactive diarization setup wizard."""
-        pyannote_ok, token_ok = self._check_diarization_components()
+        pyannote_ok, _ = self._check_diarization_components()
+        if pyannote_ok is None:
+            self._notify(title="Speaker Diarization Setup", message="Checking pyannote.audio…")
+            return
 
         # Step 1: Check pyannote
         if not pyannote_ok:
             response = rumps.alert(
-                title="Speaker Diarization Setup (1/3)",
+                title="Speaker Diarization Setup",
                 message=(
                     "pyannote.audio is not installed.\n\n"
                     "This is required for speaker identification.\n"
@@ -1281,30 +1532,8 @@ class ParakeetMenuBarApp(rumps.App):
                 self._install_pyannote()
             return
 
-        # Step 2: Check token
-        if not token_ok:
-            response = rumps.alert(
-                title="Speaker Diarization Setup (2/3)",
-                message=(
-                    "HuggingFace token is required.\n\n"
-                    "You need:\n"
-                    "1. A free HuggingFace account\n"
-                    "2. Accept the pyannote model license\n"
-                    "3. A 'Read' access token (not Write)\n\n"
-                    "Already have a token starting with 'hf_...'?"
-                ),
-                ok="I have a token",
-                cancel="Guide me through setup"
-            )
-
-            if response == 0:  # Cancel = Open HuggingFace
-                self._open_huggingface_setup()
-            else:  # OK = Enter token
-                self._prompt_for_token()
-            return
-
-        # Step 3: All set - enable and test
-        self._finalize_diarization_setup()
+        # Token, license pages and enabling all happen in one window
+        self._diarization_setup_window()
 
     def _install_pyannote(self):
         """Install pyannote.audio package with visible progress in Terminal."""
@@ -1347,15 +1576,8 @@ read -n 1
 '''
 
         # Open Terminal with the install command
-        script = f'''
-        tell application "Terminal"
-            activate
-            do script "{install_cmd.replace('"', '\\"').replace('\n', '\\n')}"
-        end tell
-        '''
-
         try:
-            subprocess.run(["osascript", "-e", script], check=True)
+            _run_in_terminal(install_cmd)
             self.status_item.title = "Installing... (see Terminal)"
         except Exception as e:
             rumps.alert(
@@ -1364,135 +1586,139 @@ read -n 1
             )
 
     def _open_huggingface_setup(self):
-        """Open HuggingFace pages for setup."""
-        # Show detailed instructions with ALL required models
+        """Open every model license page plus the token page in one go."""
+        urls = [f"https://huggingface.co/{model}" for model, _ in self._get_required_diarization_models()]
+        urls.append("https://huggingface.co/settings/tokens/new?tokenType=read")
+        # A single `open` call handles every URL at once
+        self._spawn(["open", *urls])
+
+    def _diarization_setup_window(self):
+        """Single-window diarization setup: license pages, token, enable."""
         models = self._get_required_diarization_models()
-        rumps.alert(
-            title=f"HuggingFace Setup (Step 1 of {len(models) + 1})",
-            message=(
-                f"Speaker diarization requires access to {len(models)} models.\n\n"
-                "For each model, you need to:\n"
-                "1. Sign in (or create a free account)\n"
-                "2. Scroll to 'Agree and access repository'\n"
-                "3. Click to accept the license\n\n"
-                "I'll open each model page in sequence."
-            ),
-            ok="Start Setup"
+        model_lines = "\n".join(f"• {model} ({desc})" for model, desc in models)
+        message = (
+            f"Speaker diarization needs access to {len(models)} HuggingFace models:\n\n"
+            f"{model_lines}\n\n"
+            "1. Click 'Open License Pages', sign in and accept each license\n"
+            "2. Create a 'Read' token (the token page opens too)\n"
+            "3. Paste the token (starts with 'hf_...') below\n\n"
+            "First use downloads the diarization model (~1GB) and adds\n"
+            "~10-30 seconds of processing per transcription."
         )
-
-        for i, (model, desc) in enumerate(models, 1):
-            rumps.alert(
-                title=f"Accept Model License ({i}/{len(models)})",
-                message=(
-                    f"Model: {model}\n"
-                    f"Purpose: {desc}\n\n"
-                    "Click OK to open the model page.\n"
-                    "Accept the license, then come back."
-                ),
-                ok="Open Model Page"
+        token = self.config.get("huggingface_token", "")
+
+        while True:
+            window = rumps.Window(
+                title="Speaker Diarization Setup",
+                message=message,
+                default_text=token,
+                ok="Save & Enable",
+                cancel="Cancel",
+                dimensions=(320, 24)
             )
-            webbrowser.open(f"https://huggingface.co/{model}")
-
-        # Show token instructions
-        rumps.alert(
-            title=f"HuggingFace Setup (Final Step)",
-            message=(
-                "Now create an access token.\n\n"
-                "Create a token with these settings:\n"
-                "• Name: 'Parakeet' (or anything)\n"
-                "• Type: 'Read' (NOT Write)\n\n"
-                "Copy the token (starts with 'hf_...')\n"
-                "Then click 'Quick Setup' → 'I have a token'"
-            ),
-            ok="Open Token Page"
-        )
+            window.add_button("Open License Pages")
+            response = window.run()
+            token = response.text.strip()
 
-        webbrowser.open("https://huggingface.co/settings/tokens/new?tokenType=read")
-
-    def _prompt_for_token(self):
-        """Prompt user to enter their HuggingFace token."""
-        # Use AppleScript for text input (rumps doesn't have input dialogs)
-        script = '''
-        tell application "System Events"
-            display dialog "Paste your HuggingFace token:" default answer "" with title "Enter Token" buttons {"Cancel", "Save"} default button "Save"
-            if button returned of result is "Save" then
-                return text returned of result
-            end if
-        end tell
-        '''
-        try:
-            result = subprocess.run(
-                ["osascript", "-e", script],
-                capture_output=True,
-                text=True
+            if response.clicked == 0:  # Cancel
+                return
+            if response.clicked != 1:  # Open License Pages, then come back
+                self._open_huggingface_setup()
+                continue
+            if len(token) > 10:  # Basic validation
+                break
+            rumps.alert(
+                title="Invalid Token",
+                message="The token seems too short. Please try again."
             )
-            token = result.stdout.strip()
 
-            if token and len(token) > 10:  # Basic validation
-                # Save to config
-                self.config["huggingface_token"] = token
-                save_config(self.config)
-                self._refresh_settings_menu()
-
-                rumps.notification(
-                    title="Token Saved",
-                    subtitle="",
-                    message="HuggingFace token saved to config",
-                    sound=False
-                )
+        # Persist token and enable once
+        self.config["huggingface_token"] = token
+        self.config["diarization_enabled"] = True
+        self._schedule_save()
+        self._submit_access_probe()
+        self._reset_diarizer()
+        self._refresh_settings_menu()
 
-                # Continue to finalize
-                self._finalize_diarization_setup()
-            elif token:
-                rumps.alert(
-                    title="Invalid Token",
-                    message="The token seems too short. Please try again."
-                )
-        except Exception as e:
-            rumps.alert(
-                title="Error",
-                message=f"Could not prompt for token: {e}"
-            )
+        rumps.notification(
+            title="Speaker Diarization Enabled",
+            subtitle="",
+            message="Your next transcription will identify speakers",
+            sound=False
+        )
 
-    def _finalize_diarization_setup(self):
-        """Final step: enable diarization and test."""
-        response = rumps.alert(
-            title="Speaker Diarization Setup (3/3)",
-            message=(
-                "Setup complete! ✅\n\n"
-                "First use will download the diarization model (~1GB).\n"
-                "Diarization adds ~10-30 seconds processing time.\n\n"
-                "Enable speaker diarization now?"
-            ),
-            ok="Enable",
-            cancel="Later"
+    def _input_dialog(self, title, message, default_text="", ok="OK"):
+        """Show a native text-input dialog; return the stripped text, or None if cancelled."""
+        # rumps.Window is an in-process NSAlert with a text field, no osascript spawn
+        window = rumps.Window(
+            title=title,
+            message=message,
+            default_text=default_text,
+            ok=ok,
+            cancel="Cancel",
+            dimensions=(320, 24)
         )
+        response = window.run()
+        if not response.clicked:
+            return None
+        return response.text.strip()
 
-        if response == 1:  # Enable
-            self.config["diarization_enabled"] = True
-            save_config(self.config)
-            self._refresh_settings_menu()
+    def _get_cache_path(self):
+        """Get the HuggingFace cache path (resolved once)."""
+        if self._hf_cache is None:
+            try:
+                from huggingface_hub import constants
+                self._hf_cache = constants.HF_HUB_CACHE
+            except Exception:
+                self._hf_cache = os.path.expanduser("~/.cache/huggingface/hub")
+        return self._hf_cache
 
-            rumps.notification(
-                title="Speaker Diarization Enabled",
-                subtitle="",
-                message="Your next transcription will identify speakers",
-                sound=False
-            )
+    def _shared_diarizer(self):
+        """Return the shared SpeakerDiarizer, creating it on first use (hold _diarizer_lock)."""
+        if self._diarizer is None:
+            from parakeet_mlx_guiapi.diarization import SpeakerDiarizer
+            self._diarizer = SpeakerDiarizer()
+        return self._diarizer
 
-    def _get_cache_path(self):
-        """Get the HuggingFace cache path."""
+    def _warm_diarizer(self):
+        """Load the diarization pipeline ahead of the first transcription."""
         try:
-            from huggingface_hub import constants
-            return constants.HF_HUB_CACHE
-        except Exception:
-            return os.path.expanduser("~/.cache/huggingface/hub")
+            with self._diarizer_lock:
+                self._shared_diarizer()._ensure_initialized()
+            logger.debug("Diarization pipeline warmed up")
+        except Exception as e:
+            # Surfaced properly when a transcription actually diarizes
+            logger.debug("Diarizer warmup skipped: %s", e)
+
+    def _reset_diarizer(self):
+        """Drop the shared diarizer after a token change and warm a new one if enabled."""
+        with self._diarizer_lock:
+            self._diarizer = None
+        if self.config.get("diarization_enabled", False):
+            self._probe_pool.submit(self._warm_diarizer)
+
+    def _notify(self, title, message, subtitle="", sound=False):
+        """Show a notification unless the user has turned them off."""
+        if not self._show_notifications:
+            return
+        rumps.notification(title=title, subtitle=subtitle, message=message, sound=sound)
+
+    def _spawn(self, args):
+        """Start a helper process without waiting for it; reap finished ones."""
+        self._children = {p for p in self._children if p.poll() is None}
+        self._children.add(subprocess.Popen(
+            args,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            close_fds=True,
+            start_new_session=True
+        ))
 
     def open_cache_folder(self, _):
         """Open the model cache folder in Finder."""
         cache_path = self._get_cache_path()
-        if os.path.exists(cache_path):
-            subprocess.run(["open", cache_path])
+        if cached_stat(cache_path) is not None:
+            self._spawn(["open", cache_path])
         else:
             rumps.alert(
                 title="Cache Not Found",
@@ -1502,8 +1728,8 @@ read -n 1
     def open_config_file(self, _):
         """Open the config file in default editor."""
         config_path = os.path.expanduser("~/.parakeet_mlx_guiapi.json")
-        if os.path.exists(config_path):
-            subprocess.run(["open", config_path])
+        if cached_stat(config_path) is not None:
+            self._spawn(["open", config_path])
         else:
             rumps.alert(
                 title="Config File",
@@ -1512,9 +1738,9 @@ read -n 1
 
     def view_logs(self, _):
         """Open the log file in Console.app or default text editor."""
-        if LOG_PATH.exists():
+        if cached_stat(LOG_PATH) is not None:
             # Use Console.app for better log viewing on macOS
-            subprocess.run(["open", "-a", "Console", str(LOG_PATH)])
+            self._spawn(["open", "-a", "Console", str(LOG_PATH)])
         else:
             rumps.alert(
                 title="No Logs Yet",
@@ -1567,15 +1793,15 @@ read -n 1
                 message="Model is still loading. Please wait."
             )
         else:
-            model_name = self.config.get("model_name", AVAILABLE_MODELS[0]["id"])
+            model_name = self.config.get("model_name", AVAILABLE_MODELS[0].id)
             model_info = self._get_model_by_id(model_name)
             if model_info:
                 rumps.alert(
                     title="Parakeet Ready",
                     message=(
-                        f"Model: {model_info['name']}\n"
-                        f"Languages: {model_info.get('languages', 'Unknown')}\n"
-                        f"Accuracy: {model_info.get('wer', 'N/A')}\n\n"
+                        f"Model: {model_info.name}\n"
+                        f"Languages: {model_info.languages}\n"
+                        f"Accuracy: {model_info.wer}\n\n"
                         "Click the mic icon to start recording!"
                     )
                 )
@@ -1591,11 +1817,12 @@ read -n 1
             )
             return
 
-        model_name = self.config.get("model_name", AVAILABLE_MODELS[0]["id"])
+        model_name = self.config.get("model_name", AVAILABLE_MODELS[0].id)
         model_short = self._get_model_short_name(model_name)
 
         # Clear existing transcriber
         self.transcriber = None
+        self._transcriber_ready.clear()
         self._last_error = None
 
         # Reset status
@@ -1604,7 +1831,7 @@ read -n 1
         logger.info(f"User requested model reload: {model_name}")
 
         # Reload in background
-        threading.Thread(target=self._init_transcriber_with_download, daemon=True).start()
+        self._submit_load(self._init_transcriber_with_download)
 
         rumps.notification(
             title="Reloading Model",
@@ -1615,11 +1842,13 @@ read -n 1
 
     def predownload_model(self, _):
         """Pre-download a model with progress display in Terminal."""
-        # Build list of models not yet cached
-        uncached = []
-        for model in AVAILABLE_MODELS:
-            if not self._is_model_cached(model["id"]):
-                uncached.append(model)
+        # Build list of models not yet cached: one directory read rules out
+        # models that were never downloaded, only the rest need a snapshot check
+        present = self._scan_cached_models()
+        uncached = [
+            model for model in AVAILABLE_MODELS
+            if model.id not in present or not self._is_model_cached(model.id)
+        ]
 
         if not uncached:
             rumps.alert(
@@ -1629,20 +1858,15 @@ read -n 1
             return
 
         # Show selection dialog
-        model_list = "\n".join([f"  {i+1}. {m['name']} ({m['size']})" for i, m in enumerate(uncached)])
-
-        script = f'''
-        tell application "System Events"
-            display dialog "Select model to download:\\n\\n{model_list}\\n\\nEnter number (1-{len(uncached)}):" default answer "1" with title "Download Model" buttons {{"Cancel", "Download"}} default button "Download"
-            if button returned of result is "Download" then
-                return text returned of result
-            end if
-        end tell
-        '''
+        model_list = "\n".join([f"  {i+1}. {m.name} ({m.size})" for i, m in enumerate(uncached)])
 
         try:
-            result = subprocess.run(["osascript", "-e", script], capture_output=True, text=True)
-            choice = result.stdout.strip()
+            choice = self._input_dialog(
+                title="Download Model",
+                message=f"Select model to download:\n\n{model_list}\n\nEnter number (1-{len(uncached)}):",
+                default_text="1",
+                ok="Download"
+            )
 
             if choice and choice.isdigit():
                 idx = int(choice) - 1
@@ -1654,52 +1878,8 @@ read -n 1
 
     def _download_model_in_terminal(self, model):
         """Download a model with visible progress in Terminal."""
-        model_id = model["id"]
-        model_name = model["name"]
-        model_size = model.get("size", "unknown size")
-        python_path = sys.executable
-
-        download_cmd = f'''
-clear
-echo "══════════════════════════════════════════════════════════════"
-echo "  Downloading: {model_name}"
-echo "══════════════════════════════════════════════════════════════"
-echo ""
-echo "Model: {model_id}"
-echo "Size: {model_size}"
-echo ""
-echo "Downloading from HuggingFace..."
-echo ""
-"{python_path}" -c "
-from huggingface_hub import snapshot_download
-import sys
-
-def progress_callback(progress):
-    pass  # HF handles its own progress bar
-
-print('Starting download...')
-try:
-    path = snapshot_download('{model_id}', local_files_only=False)
-    print(f'\\n✅ Download complete!')
-    print(f'Saved to: {{path}}')
-except Exception as e:
-    print(f'\\n❌ Download failed: {{e}}')
-    sys.exit(1)
-"
-echo ""
-echo "Press any key to close..."
-read -n 1
-'''
-
-        script = f'''
-        tell application "Terminal"
-            activate
-            do script "{download_cmd.replace('"', '\\"').replace('\n', '\\n')}"
-        end tell
-        '''
-
         try:
-            subprocess.run(["osascript", "-e", script], check=True)
+            _run_in_terminal(_download_command(model))
             self.status_item.title = f"Downloading... (see Terminal)"
         except Exception as e:
             rumps.alert(
@@ -1709,28 +1889,49 @@ read -n 1
 
     def _populate_history_menu(self):
         """Populate the history submenu."""
+        self._history_rendered = self.history
+        self._history_items = []
         if not self.history:
             empty_item = rumps.MenuItem("No transcriptions yet")
             self.history_menu.add(empty_item)
         else:
-            for i, entry in enumerate(self.history[:10]):
-                # Truncate text for menu display
-                text = entry.get("text", "")[:50]
-                if len(entry.get("text", "")) > 50:
-                    text += "..."
-                timestamp = entry.get("timestamp", "")
-
-                item = rumps.MenuItem(
-                    f"{timestamp}: {text}",
-                    callback=lambda sender, e=entry: self.copy_history_item(e)
-                )
+            for entry in self.history[:HISTORY_MENU_SIZE]:
+                item = self._history_item(entry)
                 self.history_menu.add(item)
+                self._history_items.append(item)
 
             # Clear history option
             self.history_menu.add(None)
             clear_item = rumps.MenuItem("Clear History", callback=self.clear_history)
             self.history_menu.add(clear_item)
 
+    def _history_item(self, entry):
+        """Build the History submenu item for an entry."""
+        # Truncate text for menu display
+        text = entry.get("text", "")
+        if len(text) > 50:
+            text = text[:50] + "..."
+        timestamp = entry.get("timestamp", "")
+
+        item = rumps.MenuItem(f"{timestamp}: {text}", callback=self._on_history_pick)
+        item.history_entry = entry
+        return item
+
+    def _prepend_history_item(self):
+        """Show the newest history entry without rebuilding the submenu."""
+        item = self._history_item(self.history[0])
+        # Menu items are keyed by title, so a repeated title (or the first
+        # entry replacing the placeholder) takes the full rebuild
+        if not self._history_items or item.title in self.history_menu:
+            self._refresh_history_menu()
+            return
+
+        self.history_menu.insert_before(self._history_items[0].title, item)
+        self._history_items.insert(0, item)
+        if len(self._history_items) > HISTORY_MENU_SIZE:
+            del self.history_menu[self._history_items.pop().title]
+        self._history_rendered = self.history
+
     def _refresh_model_menu(self):
         """Refresh the model menu after a change."""
         # Remove all items
@@ -1740,6 +1941,41 @@ read -n 1
         # Re-populate
         self._populate_model_menu()
 
+    def _update_model_menu(self):
+        """Update checkmarks and the current-model info in place.
+
+        Only the titles change when switching between Parakeet models, so the
+        menu tree is kept; falls back to a full rebuild if its shape differs.
+        """
+        current = _MODELS_BY_ID.get(self.config.get("model_name"))
+        if (
+            current is None
+            or not self._model_items
+            or not self._model_info_items
+            or not current.feature_bullets
+            or self._model_features_menu is None
+        ):
+            self._refresh_model_menu()
+            return
+
+        for model_id, item in self._model_items.items():
+            model = _MODELS_BY_ID[model_id]
+            title = model.name
+            if model_id == current.id:
+                title = f"✓ {title}"
+            if model.recommended:
+                title = f"⭐ {title}"
+            item.title = title
+
+        for item, info in zip(self._model_info_items, current.info_lines):
+            item.title = info
+
+        feat_menu = self._model_features_menu
+        for key in list(feat_menu.keys()):
+            del feat_menu[key]
+        for bullet in current.feature_bullets:
+            feat_menu.add(rumps.MenuItem(bullet))
+
     def _refresh_settings_menu(self):
         """Refresh settings menu after a change."""
         keys = list(self.settings_menu.keys())
@@ -1748,92 +1984,156 @@ read -n 1
         self._populate_settings_menu()
 
     def _refresh_history_menu(self):
-        """Refresh history menu."""
+        """Refresh history menu (skipped if history hasn't changed)."""
+        # History is replaced, never mutated in place, so identity tracks changes
+        if self._history_rendered is self.history:
+            return
         keys = list(self.history_menu.keys())
         for key in keys:
             del self.history_menu[key]
         self._populate_history_menu()
 
     def _load_history(self):
-        """Load transcription history from file."""
-        history_path = Path.home() / ".parakeet_history.json"
-        if history_path.exists():
+        """
+        Load transcription history from file (on the history worker at startup).
+
+        Returns:
+        - Number of records in the history file
+        """
+        records = jsonio.read_jsonl(HISTORY_PATH)
+        if not records and LEGACY_HISTORY_PATH.exists():
+            # One-time move from the old newest-first JSON array
+            legacy = jsonio.read_json(LEGACY_HISTORY_PATH, default=[])
+            if isinstance(legacy, list):
+                records = legacy[::-1]
+                try:
+                    jsonio.write_jsonl_atomic(HISTORY_PATH, records)
+                    LEGACY_HISTORY_PATH.unlink()
+                except OSError as e:
+                    logger.warning(f"Could not migrate history: {e}")
+        # Keep anything recorded while the file was loading on top
+        self.history = (self.history + records[::-1])[:HISTORY_LIMIT]
+        _on_main_thread(self._refresh_history_menu)
+        return len(records)
+
+    def _save_history(self, entry=None):
+        """Queue a new entry (appended) or, with no entry, a full rewrite."""
+        self._history_queue.put(entry)
+
+    def _history_writer(self):
+        """Load history, then append new entries to disk as they are queued."""
+        lines = self._load_history()
+        while True:
+            entry = self._history_queue.get()
             try:
-                with open(history_path, "r") as f:
-                    self.history = json.load(f)
-            except Exception:
-                self.history = []
-
-    def _save_history(self):
-        """Save transcription history to file."""
-        history_path = Path.home() / ".parakeet_history.json"
-        try:
-            with open(history_path, "w") as f:
-                json.dump(self.history[:20], f)  # Keep last 20
-        except Exception:
-            pass
+                if entry is not None and lines < HISTORY_COMPACT_AT:
+                    # One small append per transcription
+                    jsonio.append_jsonl(HISTORY_PATH, entry)
+                    lines += 1
+                else:
+                    # Cleared, or time to drop old entries: rewrite once
+                    snapshot = self.history[:HISTORY_LIMIT]
+                    jsonio.write_jsonl_atomic(HISTORY_PATH, snapshot[::-1])
+                    lines = len(snapshot)
+            except Exception as e:
+                logger.warning(f"Could not save history: {e}")
+
+    def _after(self, delay, fn):
+        """Run fn on the UI timer thread after delay seconds."""
+        self._ui_timer_q.put((time.monotonic() + delay, fn))
+
+    def _reset_icon_later(self, delay=2.0):
+        """Return the menu bar icon to idle after a success/error flash."""
+        self._after(delay, lambda: setattr(self, 'title', self.ICON_IDLE))
+
+    def _ui_timer_worker(self):
+        """Run callbacks queued by _after at their deadlines, in order."""
+        pending = []  # heap of (deadline, seq, fn)
+        seq = itertools.count()
+        while True:
+            timeout = max(0.0, pending[0][0] - time.monotonic()) if pending else None
+            try:
+                deadline, fn = self._ui_timer_q.get(timeout=timeout)
+                heapq.heappush(pending, (deadline, next(seq), fn))
+            except queue.Empty:
+                pass
+            now = time.monotonic()
+            while pending and pending[0][0] <= now:
+                fn = heapq.heappop(pending)[2]
+                try:
+                    fn()
+                except Exception as e:
+                    logger.warning(f"UI timer callback failed: {e}")
 
     def _add_to_history(self, text, duration):
         """Add a transcription to history."""
         entry = {
             "text": text,
             "duration": f"{duration:.1f}s",
-            "timestamp": datetime.now().strftime("%H:%M"),
-            "date": datetime.now().strftime("%Y-%m-%d"),
+            "timestamp": time.strftime("%H:%M"),
+            "date": time.strftime("%Y-%m-%d"),
         }
-        self.history.insert(0, entry)
-        self.history = self.history[:20]  # Keep last 20
-        self._save_history()
-        self._refresh_history_menu()
-
-    def _init_transcriber(self):
-        """Initialize transcriber in background with progress feedback."""
-        model_name = self.config.get("model_name", AVAILABLE_MODELS[0]["id"])
+        self.history = [entry] + self.history[:HISTORY_LIMIT - 1]
+        self._save_history(entry)
+        # Called from the transcription thread
+        _on_main_thread(self._prepend_history_item)
+
+    def _init_transcriber(self, generation=None):
+        """Initialize transcriber in background with progress feedback.
+
+        generation identifies the load request (see _submit_load); a load
+        that has been superseded by a newer request discards its result.
+        """
+        model_name = self.config.get("model_name", AVAILABLE_MODELS[0].id)
         model_short = self._get_model_short_name(model_name)
 
         try:
             logger.info(f"Initializing transcriber with model: {model_name}")
-            model_info = self._get_model_by_id(model_name) or {}
+            model_info = self._get_model_by_id(model_name)
 
             # Check if model is cached
             is_cached = self._is_model_cached(model_name)
-            logger.info(f"Model cached: {is_cached}")
+            logger.debug("Model cached: %s", is_cached)
 
             if is_cached:
                 self.status_item.title = f"Loading {model_short}..."
             else:
                 # Model needs to be downloaded
-                size = model_info.get("size", "~1GB")
+                size = model_info.size if model_info else "~1GB"
                 self.status_item.title = f"Downloading {model_short}..."
 
-                if self.config.get("show_notifications", True):
-                    rumps.notification(
-                        title="Downloading Model",
-                        subtitle=model_short,
-                        message=f"First-time download: {size}\nThis may take a few minutes...",
-                        sound=False
-                    )
+                self._notify(
+                    title="Downloading Model",
+                    subtitle=model_short,
+                    message=f"First-time download: {size}\nThis may take a few minutes...",
+                    sound=False
+                )
 
             # Import and load model
-            logger.info("Importing AudioTranscriber...")
+            logger.debug("Importing AudioTranscriber...")
             from parakeet_mlx_guiapi.transcription.transcriber import AudioTranscriber
 
-            logger.info(f"Creating AudioTranscriber with model: {model_name}")
-            logger.info("This may take a moment for first load...")
+            logger.debug("Creating AudioTranscriber with model: %s", model_name)
 
             try:
-                self.transcriber = AudioTranscriber(model_name=model_name)
-                logger.info("AudioTranscriber created successfully")
+                transcriber = AudioTranscriber(model_name=model_name, local_files_only=is_cached)
+                logger.debug("AudioTranscriber created successfully")
             except Exception as load_error:
                 logger.error(f"AudioTranscriber creation failed: {load_error}")
                 logger.error(f"Model ID: {model_name}")
                 raise
 
+            if generation is not None and generation != self._load_generation:
+                logger.info(f"Discarding superseded load of {model_name}")
+                return
+            self.transcriber = transcriber
+            self._transcriber_ready.set()
+
             logger.info("Model loaded successfully")
             self.status_item.title = f"Ready: {model_short}"
             self._last_error = None
 
-            if self.config.get("show_notifications", True):
+            if self._show_notifications:
                 msg = "Model loaded from cache" if is_cached else "Download complete!"
                 rumps.notification(
                     title="Parakeet Ready",
@@ -1844,6 +2144,7 @@ read -n 1
 
         except Exception as e:
             error_msg = str(e)
+            import traceback
             error_trace = traceback.format_exc()
             logger.error(f"Failed to load model: {error_msg}")
             logger.error(f"Traceback:\n{error_trace}")
@@ -1852,7 +2153,7 @@ read -n 1
                 "model": model_name,
                 "error": error_msg,
                 "traceback": error_trace,
-                "time": datetime.now().isoformat()
+                "time": time.strftime("%Y-%m-%dT%H:%M:%S")
             }
 
             self.status_item.title = "⚠️ Error - Click for options"
@@ -1864,16 +2165,52 @@ read -n 1
             )
 
     def _is_model_cached(self, model_name):
-        """Check if a model is already downloaded/cached."""
+        """Check if a model is already downloaded/cached.
+
+        Looks for a snapshot config.json directly in the HF cache layout
+        (disk only, never touches the network) and stops at the first hit.
+        The answer is reused for _STAT_TTL seconds, like cached_stat().
+        """
+        now = time.monotonic()
+        hit = self._model_cached_results.get(model_name)
+        if hit is not None and now - hit[0] < _STAT_TTL:
+            return hit[1]
+        is_cached = self._check_model_cached(model_name)
+        self._model_cached_results[model_name] = (now, is_cached)
+        return is_cached
+
+    def _check_model_cached(self, model_name):
+        """Look for a downloaded snapshot of a model, uncached."""
         try:
-            from huggingface_hub import try_to_load_from_cache
-            # Try to find the config file in cache
-            cached = try_to_load_from_cache(model_name, "config.json")
-            return cached is not None
+            model_dir = self._model_cache_dirs.get(model_name) or os.path.join(
+                self._get_cache_path(), "models--" + model_name.replace("/", "--")
+            )
+            snapshots = os.path.join(model_dir, "snapshots")
+            st = cached_stat(snapshots)
+            if st is None or not stat.S_ISDIR(st.st_mode):
+                return False
+            with os.scandir(snapshots) as it:
+                for entry in it:
+                    if entry.is_dir() and os.path.exists(os.path.join(entry.path, "config.json")):
+                        return True
+            return False
         except Exception:
             # If we can't check, assume not cached
             return False
 
+    def _scan_cached_models(self):
+        """Return the set of model ids that have a directory in the HF cache."""
+        prefix = "models--"
+        present = set()
+        try:
+            with os.scandir(self._get_cache_path()) as it:
+                for entry in it:
+                    if entry.name.startswith(prefix) and entry.is_dir(follow_symlinks=False):
+                        present.add(entry.name[len(prefix):].replace("--", "/", 1))
+        except OSError:
+            pass  # No cache yet
+        return present
+
     def select_model(self, model):
         """Change the transcription model."""
         if self.recording or self.processing:
@@ -1886,15 +2223,15 @@ read -n 1
             return
 
         # Check if model needs to be downloaded
-        is_cached = self._is_model_cached(model["id"])
+        is_cached = self._is_model_cached(model.id)
 
         if not is_cached:
             # Model needs download - ask user and show progress in Terminal
             response = rumps.alert(
                 title="Download Required",
                 message=(
-                    f"Model: {model['name']}\n"
-                    f"Size: {model.get('size', 'unknown')}\n\n"
+                    f"Model: {model.name}\n"
+                    f"Size: {model.size}\n\n"
                     "This model needs to be downloaded first.\n"
                     "Download progress will be shown in Terminal."
                 ),
@@ -1914,25 +2251,26 @@ read -n 1
     def _switch_to_model(self, model):
         """Switch to an already-cached model."""
         # Update config
-        self.config["model_name"] = model["id"]
-        save_config(self.config)
+        self.config["model_name"] = model.id
+        self._schedule_save()
 
         # Update menu
-        self._refresh_model_menu()
+        self._update_model_menu()
 
         # Reload transcriber for direct transcription
         self.transcriber = None
-        self.status_item.title = f"Loading {model['name']}..."
-        threading.Thread(target=self._init_transcriber, daemon=True).start()
+        self._transcriber_ready.clear()
+        self.status_item.title = f"Loading {model.name}..."
+        self._submit_load(self._init_transcriber)
 
         # Restart server if running to use new model
         if self._server_process and self._server_process.poll() is None:
-            logger.info(f"Restarting server for model change: {model['id']}")
+            logger.info(f"Restarting server for model change: {model.id}")
             threading.Thread(target=self._restart_server_for_model_change, daemon=True).start()
 
         rumps.notification(
             title="Loading Model",
-            subtitle=model["name"],
+            subtitle=model.name,
             message="Loading from cache...",
             sound=False
         )
@@ -1944,71 +2282,30 @@ read -n 1
 
     def _download_and_load_model(self, model):
         """Download a model in Terminal with progress, then load it."""
-        model_id = model["id"]
-        model_name = model["name"]
-        model_size = model.get("size", "unknown size")
-        python_path = sys.executable
+        model_id = model.id
+        model_name = model.name
 
         # Update config now so it loads this model after download
         self.config["model_name"] = model_id
-        save_config(self.config)
-        self._refresh_model_menu()
-
-        download_cmd = f'''
-clear
-echo "══════════════════════════════════════════════════════════════"
-echo "  Downloading: {model_name}"
-echo "══════════════════════════════════════════════════════════════"
-echo ""
-echo "Model: {model_id}"
-echo "Size: {model_size}"
-echo ""
-"{python_path}" -c "
-from huggingface_hub import snapshot_download
-import sys
-
-print('Downloading from HuggingFace...')
-print('(Progress bar will appear below)')
-print('')
-
-try:
-    path = snapshot_download('{model_id}', local_files_only=False)
-    print('')
-    print('✅ Download complete!')
-    print(f'Saved to: {{path}}')
-    print('')
-    print('The model will now load in Parakeet.')
-except Exception as e:
-    print(f'')
-    print(f'❌ Download failed: {{e}}')
-    sys.exit(1)
-"
-echo ""
-echo "You can close this window."
-echo "Press any key to close..."
-read -n 1
-'''
-
-        script = f'''
-        tell application "Terminal"
-            activate
-            do script "{download_cmd.replace('"', '\\"').replace('\n', '\\n')}"
-        end tell
-        '''
+        self._schedule_save()
+        self._update_model_menu()
 
         try:
-            subprocess.run(["osascript", "-e", script], check=True)
+            _run_in_terminal(_download_command(model, then_load=True))
             self.status_item.title = f"Downloading... (see Terminal)"
 
             # Start a background thread to wait for download and then load
             def wait_and_load():
-                # Poll until model is cached
-                for _ in range(600):  # Max 10 minutes
-                    time.sleep(1)
+                # Poll until model is cached (the download takes minutes,
+                # a coarse interval is plenty)
+                for _ in range(120):  # Max 10 minutes
+                    time.sleep(5)
+                    if self.config.get("model_name") != model_id:
+                        return  # User picked another model meanwhile
                     if self._is_model_cached(model_id):
                         # Model downloaded, now load it
                         self.status_item.title = f"Loading {model_name}..."
-                        self._init_transcriber()
+                        self._submit_load(self._init_transcriber)
                         return
                 # Timeout
                 self.status_item.title = "Download timeout"
@@ -2027,44 +2324,54 @@ read -n 1
                 message=f"Error: {e}"
             )
 
+    def _on_chunk_pick(self, sender):
+        """Menu callback for the chunk duration items."""
+        self.set_chunk_duration(_menu_number(sender.title))
+
     def set_chunk_duration(self, duration):
         """Set chunk duration for long audio processing."""
         self.config["default_chunk_duration"] = duration
-        save_config(self.config)
-        self._refresh_settings_menu()
-
-        if self.config.get("show_notifications", True):
-            rumps.notification(
-                title="Setting Updated",
-                subtitle="Chunk Duration",
-                message=f"Set to {duration} seconds",
-                sound=False
-            )
+        self._schedule_save()
+        # Only the checkmarks move, so leave the rest of Settings alone
+        for option, items in self._chunk_items.items():
+            for item in items:
+                _set_checked(item, option == duration)
+
+        self._notify(
+            title="Setting Updated",
+            subtitle="Chunk Duration",
+            message=f"Set to {duration} seconds",
+            sound=False
+        )
 
-    def toggle_auto_copy(self, _):
+    def toggle_auto_copy(self, sender):
         """Toggle auto-copy to clipboard."""
         current = self.config.get("auto_copy_clipboard", True)
         self.config["auto_copy_clipboard"] = not current
-        save_config(self.config)
-        self._refresh_settings_menu()
+        self._schedule_save()
+        _set_checked(sender, not current)
 
-    def toggle_notifications(self, _):
+    def toggle_notifications(self, sender):
         """Toggle notification display."""
-        current = self.config.get("show_notifications", True)
-        self.config["show_notifications"] = not current
-        save_config(self.config)
-        self._refresh_settings_menu()
+        self._show_notifications = not self._show_notifications
+        self.config["show_notifications"] = self._show_notifications
+        self._schedule_save()
+        _set_checked(sender, self._show_notifications)
+
+    def _on_history_pick(self, sender):
+        """Menu callback shared by all history items."""
+        self.copy_history_item(sender.history_entry)
 
     def copy_history_item(self, entry):
         """Copy a history item to clipboard."""
-        pyperclip.copy(entry.get("text", ""))
-        if self.config.get("show_notifications", True):
-            rumps.notification(
-                title="Copied to Clipboard",
-                subtitle="",
-                message=entry.get("text", "")[:80],
-                sound=False
-            )
+        text = entry.get("text", "")
+        _copy_to_clipboard(text)
+        self._notify(
+            title="Copied to Clipboard",
+            subtitle="",
+            message=text[:80],
+            sound=False
+        )
 
     def clear_history(self, _):
         """Clear transcription history."""
@@ -2077,13 +2384,12 @@ read -n 1
         logger.info(f"toggle_recording called - recording={self.recording}, processing={self.processing}")
         if self.processing:
             logger.info("Still processing, ignoring toggle")
-            if self.config.get("show_notifications", True):
-                rumps.notification(
-                    title="Parakeet",
-                    subtitle="",
-                    message="Still processing previous recording...",
-                    sound=False
-                )
+            self._notify(
+                title="Parakeet",
+                subtitle="",
+                message="Still processing previous recording...",
+                sound=False
+            )
             return
 
         if not self.recording:
@@ -2096,26 +2402,42 @@ read -n 1
     def start_recording(self):
         """Start recording from microphone."""
         try:
-            import sounddevice as sd
-            import numpy as np
-
             logger.info("start_recording: Initializing...")
             self.recording = True
             self._recording_start_time = time.time()
             self.title = self.ICON_RECORDING
             self.record_button.title = "⏹ Stop Recording"
             self.cancel_button.set_callback(self.cancel_recording)  # Enable cancel button
-            self._audio_data = []
 
             # Recording parameters
             self.sample_rate = 16000
             self.channels = 1
 
+            # One contiguous buffer instead of a list of per-callback copies,
+            # kept between recordings (toggle_recording ignores clicks while
+            # the previous take is still being processed)
+            if self._audio_buf is None:
+                self._audio_buf = np.empty(self.sample_rate * RECORDING_PREALLOC_SECONDS, dtype=np.int16)
+            self._audio_len = 0
+
             def audio_callback(indata, frames, time_info, status):
                 if status:
-                    logger.warning(f"Audio callback status: {status}")
+                    logger.warning("Audio callback status: %s", status)
                 if self.recording:
-                    self._audio_data.append(indata.copy())
+                    with self._audio_lock:
+                        end = self._audio_len + frames
+                        if end > len(self._audio_buf):
+                            # The background grow fell behind; grow inline
+                            # rather than drop audio
+                            grown = np.empty(max(end, 2 * len(self._audio_buf)), dtype=np.int16)
+                            grown[:self._audio_len] = self._audio_buf[:self._audio_len]
+                            self._audio_buf = grown
+                        self._audio_buf[self._audio_len:end] = indata[:, 0]
+                        self._audio_len = end
+                        headroom = len(self._audio_buf) - end
+                    if headroom < self.sample_rate * RECORDING_HEADROOM_SECONDS and not self._audio_growing:
+                        self._audio_growing = True
+                        self._probe_pool.submit(self._grow_audio_buf)
 
             # Start recording stream with selected microphone
             selected_device = self.config.get("selected_microphone", None)
@@ -2129,7 +2451,9 @@ read -n 1
                 device=selected_device,  # None = system default
                 samplerate=self.sample_rate,
                 channels=self.channels,
-                dtype=np.float32,
+                # PortAudio scales and clips to int16 as it fills the block,
+                # so the samples are WAV-ready with no conversion pass
+                dtype=np.int16,
                 callback=audio_callback
             )
             self._stream.start()
@@ -2138,13 +2462,12 @@ read -n 1
             # Start timer to update title
             self._start_recording_timer()
 
-            if self.config.get("show_notifications", True):
-                rumps.notification(
-                    title="Recording Started",
-                    subtitle="",
-                    message="Click the icon again to stop",
-                    sound=False
-                )
+            self._notify(
+                title="Recording Started",
+                subtitle="",
+                message="Click the icon again to stop",
+                sound=False
+            )
 
         except Exception as e:
             logger.error(f"start_recording: Error - {e}", exc_info=True)
@@ -2159,35 +2482,135 @@ read -n 1
                 sound=True
             )
             # Reset icon after a moment
-            threading.Timer(2.0, lambda: setattr(self, 'title', self.ICON_IDLE)).start()
+            self._reset_icon_later()
+
+    def _wait_for_transcriber(self, timeout=30):
+        """Block until a model is loaded and return its transcriber."""
+        # Woken the moment the loader installs the model, no polling
+        if self._transcriber_ready.wait(timeout):
+            transcriber = self.transcriber
+            if transcriber is not None:
+                return transcriber
+        raise Exception("Model not loaded. Please wait and try again.")
+
+    def _grow_audio_buf(self):
+        """Double the capture buffer off the audio thread, or spill it once it is capped."""
+        try:
+            with self._grow_lock:
+                old = self._audio_buf
+                if len(old) >= self.sample_rate * RECORDING_MEMORY_CAP_SECONDS:
+                    self._spill_audio_buf(old)
+                else:
+                    self._double_audio_buf(old)
+        finally:
+            self._audio_growing = False
+
+    def _release_grown_audio_buf(self):
+        """Drop a capture buffer that grew past its preallocated size."""
+        # The default-size buffer is kept for the next recording; a grown
+        # one would pin a long recording's worth of RAM until then
+        buf = self._audio_buf
+        if buf is not None and len(buf) > self.sample_rate * RECORDING_PREALLOC_SECONDS:
+            logger.debug("Releasing %.0fs capture buffer", len(buf) / self.sample_rate)
+            self._audio_buf = None
+
+    def _double_audio_buf(self, old):
+        """Swap in a buffer twice the size of old (hold _grow_lock)."""
+        copied = self._audio_len
+        grown = np.empty(2 * len(old), dtype=np.int16)
+        # Samples below _audio_len are never rewritten, so the bulk copy
+        # runs without the lock; only the tail written meanwhile is
+        # copied while the callback is held off
+        grown[:copied] = old[:copied]
+        with self._audio_lock:
+            if self._audio_buf is old and self._audio_len >= copied:
+                grown[copied:self._audio_len] = old[copied:self._audio_len]
+                self._audio_buf = grown
+        logger.debug("Capture buffer grown to %.0fs", len(grown) / self.sample_rate)
+
+    def _spill_audio_buf(self, buf):
+        """Move the captured samples to the spill WAV and restart the buffer (hold _grow_lock)."""
+        copied = self._audio_len
+        if self._spill_fh is None:
+            fd, self._spill_path = tempfile.mkstemp(suffix='.wav', prefix='parakeet_menubar_')
+            self._spill_fh = os.fdopen(fd, 'wb', buffering=1 << 20)
+            # Placeholder; the real header is written when recording stops
+            self._spill_fh.write(bytes(AudioProcessor.WAV_HEADER_SIZE))
+            self._spill_samples = 0
+
+        buf[:copied].tofile(self._spill_fh)
+
+        with self._audio_lock:
+            if self._audio_len < copied:
+                return  # Recording was cancelled meanwhile
+            tail = self._audio_len - copied
+            # The callback may have swapped in an inline-grown copy of buf
+            # while we wrote; it holds the same samples, so shift that one
+            live = self._audio_buf
+            live[:tail] = live[copied:self._audio_len]
+            self._audio_len = tail
+            self._spill_samples += copied
+        logger.debug("Spilled %.0fs of audio to %s", copied / self.sample_rate, self._spill_path)
+
+    def _finish_spill(self, tail_int16):
+        """Append the in-memory tail to the spill WAV, fix up its header and return its path."""
+        fh = self._spill_fh
+        path = self._spill_path
+        tail_int16.tofile(fh)
+        fh.seek(0)
+        fh.write(AudioProcessor.wav_header(self._spill_samples + len(tail_int16), self.sample_rate))
+        fh.close()
+        self._spill_fh = None
+        self._spill_path = None
+        self._spill_samples = 0
+        return path
+
+    def _discard_spill(self):
+        """Close and delete the spill WAV of a cancelled recording."""
+        with self._grow_lock:
+            if self._spill_fh is None:
+                return
+            self._spill_fh.close()
+            try:
+                os.remove(self._spill_path)
+            except OSError:
+                pass
+            self._spill_fh = None
+            self._spill_path = None
+            self._spill_samples = 0
 
     def _start_recording_timer(self):
         """Start a timer to update recording duration in title."""
-        def update_title():
-            while self.recording:
-                elapsed = time.time() - self._recording_start_time
-                mins = int(elapsed // 60)
-                secs = int(elapsed % 60)
-                self.title = f"🔴 {mins}:{secs:02d}"
-                time.sleep(1)
+        if not self._timer.is_alive():
+            self._timer.start()
 
-        self._timer = threading.Thread(target=update_title, daemon=True)
-        self._timer.start()
+    def _stop_recording_timer(self):
+        """Stop the recording duration timer."""
+        if self._timer.is_alive():
+            self._timer.stop()
+
+    def _tick_title(self, _):
+        """Show elapsed recording time in the menu bar title."""
+        if not self.recording:
+            self._stop_recording_timer()
+            return
+        elapsed = time.time() - self._recording_start_time
+        mins = int(elapsed // 60)
+        secs = int(elapsed % 60)
+        self.title = f"🔴 {mins}:{secs:02d}"
 
     def stop_recording(self):
         """Stop recording and start transcription."""
-        import numpy as np
-        from scipy.io import wavfile
-
         logger.info("stop_recording: Stopping stream...")
         self.recording = False
+        self._stop_recording_timer()
         self.cancel_button.set_callback(None)  # Disable cancel button
         if self._stream:
             self._stream.stop()
             self._stream.close()
             logger.info("stop_recording: Stream closed")
 
-        if not self._audio_data:
+        if not (self._audio_len or self._spill_samples):
             logger.warning("stop_recording: No audio data captured")
             self.title = self.ICON_IDLE
             self.record_button.title = "🎤 Start Recording"
@@ -2201,7 +2624,7 @@ read -n 1
 
         # Calculate duration
         recording_duration = time.time() - self._recording_start_time
-        logger.info(f"stop_recording: Recorded {recording_duration:.1f}s, {len(self._audio_data)} chunks")
+        logger.info(f"stop_recording: Recorded {recording_duration:.1f}s, {self._audio_len} samples")
 
         # Update UI for processing
         self.processing = True
@@ -2219,160 +2642,38 @@ read -n 1
 
     def _process_audio(self, recording_duration):
         """Process recorded audio and transcribe (with optional diarization)."""
-        import numpy as np
-        from scipy.io import wavfile
-
         process_start = time.time()
         logger.info(f"_process_audio: Starting processing for {recording_duration:.1f}s recording")
 
         try:
-            # Concatenate audio data
-            audio_data = np.concatenate(self._audio_data, axis=0)
-            logger.info(f"_process_audio: Audio data shape: {audio_data.shape}")
-
-            # Convert to int16 for WAV
-            audio_int16 = (audio_data * 32767).astype(np.int16)
-
-            # Save to temp file
-            temp_file = tempfile.NamedTemporaryFile(
-                suffix='.wav',
-                delete=False,
-                prefix='parakeet_menubar_'
-            )
-            temp_path = temp_file.name
-            temp_file.close()
-            wavfile.write(temp_path, self.sample_rate, audio_int16)
-
-            # Wait for transcriber if not ready
-            wait_count = 0
-            while self.transcriber is None and wait_count < 60:
-                time.sleep(0.5)
-                wait_count += 1
-
-            if self.transcriber is None:
-                raise Exception("Model not loaded. Please wait and try again.")
-
-            # Transcribe
-            logger.info("_process_audio: Starting transcription...")
-            transcribe_start = time.time()
-            chunk_duration = self.config.get("default_chunk_duration", 120)
-            df, full_text = self.transcriber.transcribe(
-                temp_path,
-                chunk_duration=chunk_duration
-            )
-            transcribe_time = time.time() - transcribe_start
-            logger.info(f"_process_audio: Transcription complete in {transcribe_time:.2f}s")
-
-            # Handle None result
-            if full_text is None:
-                logger.warning("_process_audio: Transcription returned None")
-                full_text = ""
-            logger.info(f"_process_audio: Result: {len(full_text)} chars")
-
-            # === Speaker Diarization (optional) ===
-            output_text = full_text
-            num_speakers = 0
-
-            diarization_enabled = self.config.get("diarization_enabled", False)
-            logger.info(f"_process_audio: Diarization enabled={diarization_enabled}, df is None={df is None}")
-
-            if diarization_enabled and df is not None:
-                try:
-                    logger.info("_process_audio: Starting speaker diarization...")
-                    self.status_item.title = "Identifying speakers..."
-                    from parakeet_mlx_guiapi.diarization import SpeakerDiarizer
-
-                    # Initialize diarizer if needed
-                    if not hasattr(self, '_diarizer') or self._diarizer is None:
-                        self._diarizer = SpeakerDiarizer()
-
-                    # Get speaker count setting (0 = auto-detect)
-                    configured_speakers = self.config.get("diarization_num_speakers", 0)
-
-                    # Run diarization with speaker hint if configured
-                    if configured_speakers > 0:
-                        diarization = self._diarizer.diarize(
-                            temp_path,
-                            num_speakers=configured_speakers
-                        )
-                    else:
-                        diarization = self._diarizer.diarize(temp_path)
-                    num_speakers = diarization.num_speakers
-
-                    logger.info(f"_process_audio: Diarization complete, found {num_speakers} speakers")
-
-                    # Convert DataFrame to list of dicts for merging
-                    segments = df.to_dict('records')
-
-                    # Format with speaker labels (markdown format)
-                    output_text = diarization.format_transcript_markdown(segments)
-                    logger.info(f"_process_audio: Formatted transcript with speaker labels")
-
-                except Exception as e:
-                    error_msg = str(e)
-                    logger.error(f"_process_audio: Diarization failed - {e}", exc_info=True)
-
-                    # Provide helpful error messages for common issues
-                    if "403" in error_msg or "restricted" in error_msg or "authorized" in error_msg:
-                        rumps.notification(
-                            title="Diarization Access Denied",
-                            subtitle="Model license not accepted",
-                            message="Visit huggingface.co/pyannote to accept the model license",
-                            sound=True
-                        )
-                    elif "401" in error_msg or "token" in error_msg.lower():
-                        rumps.notification(
-                            title="Diarization Auth Error",
-                            subtitle="Invalid HuggingFace token",
-                            message="Check your token in Settings > Speaker Diarization",
-                            sound=True
-                        )
-                    else:
-                        rumps.notification(
-                            title="Diarization Failed",
-                            subtitle="",
-                            message=error_msg[:80],
-                            sound=True
-                        )
-
-                    # Fall back to plain transcription
-                    output_text = full_text
-
-            # Clean up temp file
-            os.remove(temp_path)
-
-            if output_text:
-                # Copy to clipboard if enabled
-                if self.config.get("auto_copy_clipboard", True):
-                    pyperclip.copy(output_text)
-
-                # Add to history
-                self._add_to_history(output_text, recording_duration)
-
-                # Show notification with preview
-                if self.config.get("show_notifications", True):
-                    preview = output_text[:80] + "..." if len(output_text) > 80 else output_text
-                    copied_msg = " - Copied!" if self.config.get("auto_copy_clipboard", True) else ""
-                    speaker_info = f" ({num_speakers} speakers)" if num_speakers > 0 else ""
-                    rumps.notification(
-                        title=f"Transcription Complete{copied_msg}",
-                        subtitle=f"{recording_duration:.1f}s of audio{speaker_info}",
-                        message=preview,
-                        sound=True
-                    )
+            # Let an in-flight grow or spill finish before reading the buffer
+            with self._grow_lock:
+                # Recorded int16 samples (a view, no copy or conversion)
+                audio_int16 = self._audio_buf[:self._audio_len]
+                logger.info(f"_process_audio: Audio data shape: {audio_int16.shape}")
+
+                if self._spill_fh is not None:
+                    # Very long recording: the start is already on disk, so
+                    # append the rest and transcribe from the file
+                    temp_path = self._finish_spill(audio_int16)
+                    audio = temp_path
+                    self._release_grown_audio_buf()
+                else:
+                    # Transcribe straight from the capture buffer, no WAV
+                    temp_path = None
+                    audio = audio_int16
+                del audio_int16
 
-                # Flash success icon
-                self.title = self.ICON_READY
-                threading.Timer(2.0, lambda: setattr(self, 'title', self.ICON_IDLE)).start()
-            else:
-                if self.config.get("show_notifications", True):
-                    rumps.notification(
-                        title="Transcription Empty",
-                        subtitle="",
-                        message="No speech detected in the recording",
-                        sound=True
-                    )
-                self.title = self.ICON_IDLE
+            try:
+                self._run_transcription(
+                    audio,
+                    recording_duration,
+                    subtitle=f"{recording_duration:.1f}s of audio",
+                    kind="recording"
+                )
+            finally:
+                if temp_path is not None:
+                    os.remove(temp_path)
 
         except Exception as e:
             logger.error(f"_process_audio: Error - {e}", exc_info=True)
@@ -2383,16 +2684,172 @@ read -n 1
                 sound=True
             )
             self.title = self.ICON_ERROR
-            threading.Timer(2.0, lambda: setattr(self, 'title', self.ICON_IDLE)).start()
+            self._reset_icon_later()
         finally:
+            self._release_grown_audio_buf()
+
             # Reset UI
             total_time = time.time() - process_start
             logger.info(f"_process_audio: Complete. Total processing time: {total_time:.2f}s")
             self.processing = False
             self.record_button.title = "🎤 Start Recording"
-            model_name = self.config.get("model_name", AVAILABLE_MODELS[0]["id"])
+            model_name = self.config.get("model_name", AVAILABLE_MODELS[0].id)
             self.status_item.title = f"Ready: {self._get_model_short_name(model_name)}"
 
+    def _run_transcription(self, audio, duration, subtitle, kind="recording"):
+        """
+        Transcribe audio, optionally label speakers, then copy, record and announce the result.
+
+        Shared by microphone recordings and dropped/picked files; callers
+        own temp-file cleanup, error reporting and resetting the UI.
+
+        Parameters:
+        - audio: Audio file path, or in-memory int16/float32 samples at self.sample_rate
+        - duration: Audio length in seconds, stored in history
+        - subtitle: Notification subtitle describing the source
+        - kind: Source name used in the "nothing heard" notification
+        """
+        transcriber = self._wait_for_transcriber()
+
+        # === Speaker Diarization (optional) ===
+        # Diarization only needs the audio, so it runs alongside the
+        # transcription and the two are joined afterwards
+        diarize_future = None
+        if self.config.get("diarization_enabled", False):
+            self.status_item.title = "Transcribing and identifying speakers..."
+            diarize_future = self._probe_pool.submit(self._diarize_audio, audio)
+
+        logger.info(f"_run_transcription: Transcribing {subtitle} ({duration:.1f}s)")
+        transcribe_start = time.time()
+        chunk_duration = self.config.get("default_chunk_duration", 120)
+        try:
+            if isinstance(audio, str):
+                df, full_text = transcriber.transcribe(
+                    audio,
+                    chunk_duration=chunk_duration
+                )
+            else:
+                df, full_text = transcriber.transcribe_array(
+                    audio,
+                    self.sample_rate,
+                    chunk_duration=chunk_duration
+                )
+        except BaseException:
+            if diarize_future is not None:
+                # The caller deletes the audio once we return
+                diarize_future.cancel()
+                wait([diarize_future])
+            raise
+        transcribe_time = time.time() - transcribe_start
+        logger.info(f"_run_transcription: Transcription complete in {transcribe_time:.2f}s")
+
+        # Handle None result
+        if full_text is None:
+            logger.warning("_run_transcription: Transcription returned None")
+            full_text = ""
+
+        output_text = full_text
+        num_speakers = 0
+
+        if diarize_future is not None:
+            diarization = diarize_future.result()
+            if diarization is not None and df is not None:
+                num_speakers = diarization.num_speakers
+                # The DataFrame is read column-wise, no per-row dicts
+                output_text = diarization.format_transcript_markdown(df)
+
+        if output_text:
+            # Copy to clipboard if enabled
+            if self.config.get("auto_copy_clipboard", True):
+                _copy_to_clipboard(output_text)
+
+            # Add to history
+            self._add_to_history(output_text, duration)
+
+            # Show notification with preview
+            if self._show_notifications:
+                preview = output_text[:80] + "..." if len(output_text) > 80 else output_text
+                copied_msg = " - Copied!" if self.config.get("auto_copy_clipboard", True) else ""
+                speaker_info = f" ({num_speakers} speakers)" if num_speakers > 0 else ""
+                rumps.notification(
+                    title=f"Transcription Complete{copied_msg}",
+                    subtitle=f"{subtitle}{speaker_info}",
+                    message=preview,
+                    sound=True
+                )
+
+            # Flash success icon
+            self.title = self.ICON_READY
+            self._reset_icon_later()
+        else:
+            self._notify(
+                title="Transcription Empty",
+                subtitle="",
+                message=f"No speech detected in the {kind}",
+                sound=True
+            )
+            self.title = self.ICON_IDLE
+
+    def _diarize_audio(self, audio):
+        """
+        Find who spoke when.
+
+        Parameters:
+        - audio: Audio file path or in-memory int16/float32 samples
+
+        Returns:
+        - DiarizationResult, or None if diarization failed
+        """
+        try:
+            logger.info("_diarize_audio: Starting speaker diarization...")
+            diarize_start = time.time()
+
+            # Speaker count hint (0 = auto-detect)
+            kwargs = {}
+            configured_speakers = self.config.get("diarization_num_speakers", 0)
+            if configured_speakers > 0:
+                kwargs["num_speakers"] = configured_speakers
+            if not isinstance(audio, str):
+                kwargs["sample_rate"] = self.sample_rate
+
+            with self._diarizer_lock:
+                diarization = self._shared_diarizer().diarize(audio, **kwargs)
+            logger.info(
+                f"_diarize_audio: Found {diarization.num_speakers} speakers "
+                f"in {time.time() - diarize_start:.2f}s"
+            )
+            return diarization
+
+        except Exception as e:
+            error_msg = str(e)
+            logger.error(f"_diarize_audio: Diarization failed - {e}", exc_info=True)
+
+            # Provide helpful error messages for common issues
+            if "403" in error_msg or "restricted" in error_msg or "authorized" in error_msg:
+                rumps.notification(
+                    title="Diarization Access Denied",
+                    subtitle="Model license not accepted",
+                    message="Visit huggingface.co/pyannote to accept the model license",
+                    sound=True
+                )
+            elif "401" in error_msg or "token" in error_msg.lower():
+                rumps.notification(
+                    title="Diarization Auth Error",
+                    subtitle="Invalid HuggingFace token",
+                    message="Check your token in Settings > Speaker Diarization",
+                    sound=True
+                )
+            else:
+                rumps.notification(
+                    title="Diarization Failed",
+                    subtitle="",
+                    message=error_msg[:80],
+                    sound=True
+                )
+
+            # Caller falls back to the plain transcription
+            return None
+
     # === Server Control Methods ===
 
     def start_server(self, _):
@@ -2411,7 +2868,7 @@ read -n 1
             port = self.config.get("server_port", 8080)
             gradio_port = self.config.get("gradio_port", 5001)
             debug = self.config.get("server_debug", False)
-            model_name = self.config.get("model_name", AVAILABLE_MODELS[0]["id"])
+            model_name = self.config.get("model_name", AVAILABLE_MODELS[0].id)
 
             # Build command
             script_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "run.py")
@@ -2430,29 +2887,38 @@ read -n 1
 
             logger.info(f"Starting server: {' '.join(cmd)}")
 
-            # Start server process
-            self._server_process = subprocess.Popen(
-                cmd,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                env=env,
-                start_new_session=True  # Allow it to run independently
-            )
+            # The server reads the config file, make sure it is current
+            self._flush_save()
+
+            # Start server process. Its output goes to a log file: pipes
+            # nobody drains fill up and eventually block the server on write
+            try:
+                if SERVER_LOG_PATH.stat().st_size > SERVER_LOG_MAX_BYTES:
+                    os.replace(SERVER_LOG_PATH, SERVER_LOG_PATH.with_suffix(".log.1"))
+            except OSError:
+                pass
+            with open(SERVER_LOG_PATH, "ab") as server_log:
+                self._server_process = subprocess.Popen(
+                    cmd,
+                    stdout=server_log,
+                    stderr=subprocess.STDOUT,
+                    env=env,
+                    start_new_session=True  # Allow it to run independently
+                )
             self._server_port = port
             self._gradio_port = gradio_port
 
             # Refresh menu
             self._refresh_server_menu()
 
-            if self.config.get("show_notifications", True):
-                rumps.notification(
-                    title="Server Started",
-                    subtitle=f"Port {port}",
-                    message=f"API: http://127.0.0.1:{port}\nWeb UI: http://127.0.0.1:{gradio_port}",
-                    sound=False
-                )
+            self._notify(
+                title="Server Started",
+                subtitle=f"Port {port}",
+                message=f"API: http://127.0.0.1:{port}\nWeb UI: http://127.0.0.1:{gradio_port}",
+                sound=False
+            )
 
-            logger.info(f"Server started on port {port}")
+            logger.info(f"Server started on port {port} (output: {SERVER_LOG_PATH})")
 
         except Exception as e:
             logger.error(f"Failed to start server: {e}", exc_info=True)
@@ -2489,13 +2955,12 @@ read -n 1
         self._server_process = None
         self._refresh_server_menu()
 
-        if self.config.get("show_notifications", True):
-            rumps.notification(
-                title="Server Stopped",
-                subtitle="",
-                message="The server has been stopped",
-                sound=False
-            )
+        self._notify(
+            title="Server Stopped",
+            subtitle="",
+            message="The server has been stopped",
+            sound=False
+        )
 
     def restart_server(self, _):
         """Restart the server."""
@@ -2506,11 +2971,13 @@ read -n 1
     def open_web_ui(self, _):
         """Open the Gradio web UI in browser."""
         port = self.config.get("gradio_port", 8081)
+        import webbrowser
         webbrowser.open(f"http://127.0.0.1:{port}")
 
     def open_live_transcription(self, _):
         """Open the live transcription page in browser."""
         port = self.config.get("server_port", 8080)
+        import webbrowser
         webbrowser.open(f"http://127.0.0.1:{port}/live")
 
     def open_api_docs(self, _):
@@ -2533,37 +3000,35 @@ read -n 1
     def set_server_port(self, port):
         """Set the server API port."""
         self.config["server_port"] = port
-        save_config(self.config)
+        self._schedule_save()
         self._refresh_server_menu()
 
-        if self.config.get("show_notifications", True):
-            rumps.notification(
-                title="Server Port Updated",
-                subtitle="",
-                message=f"API port set to {port}. Restart server to apply.",
-                sound=False
-            )
+        self._notify(
+            title="Server Port Updated",
+            subtitle="",
+            message=f"API port set to {port}. Restart server to apply.",
+            sound=False
+        )
 
     def set_gradio_port(self, port):
         """Set the Gradio web UI port."""
         self.config["gradio_port"] = port
-        save_config(self.config)
+        self._schedule_save()
         self._refresh_server_menu()
 
-        if self.config.get("show_notifications", True):
-            rumps.notification(
-                title="Gradio Port Updated",
-                subtitle="",
-                message=f"Web UI port set to {port}. Restart server to apply.",
-                sound=False
-            )
+        self._notify(
+            title="Gradio Port Updated",
+            subtitle="",
+            message=f"Web UI port set to {port}. Restart server to apply.",
+            sound=False
+        )
 
-    def toggle_debug_mode(self, _):
+    def toggle_debug_mode(self, sender):
         """Toggle server debug mode."""
         current = self.config.get("server_debug", False)
         self.config["server_debug"] = not current
-        save_config(self.config)
-        self._refresh_server_menu()
+        self._schedule_save()
+        _set_checked(sender, not current)
 
     # === Cancel Recording ===
 
@@ -2574,6 +3039,7 @@ read -n 1
 
         logger.info("Recording cancelled by user")
         self.recording = False
+        self._stop_recording_timer()
 
         # Stop the audio stream
         if self._stream:
@@ -2584,21 +3050,22 @@ read -n 1
                 logger.warning(f"Error closing stream: {e}")
             self._stream = None
 
-        # Clear audio data
-        self._audio_data = []
+        # Discard the captured samples; the buffer is reused next time
+        self._discard_spill()
+        self._audio_len = 0
+        self._release_grown_audio_buf()
 
         # Reset UI
         self.title = self.ICON_IDLE
         self.record_button.title = "🎤 Start Recording"
         self.cancel_button.set_callback(None)  # Disable cancel button
 
-        if self.config.get("show_notifications", True):
-            rumps.notification(
-                title="Recording Cancelled",
-                subtitle="",
-                message="Recording was cancelled",
-                sound=False
-            )
+        self._notify(
+            title="Recording Cancelled",
+            subtitle="",
+            message="Recording was cancelled",
+            sound=False
+        )
 
     # === Transcribe File ===
 
@@ -2613,15 +3080,10 @@ read -n 1
             )
             return
 
-        # Use AppleScript to open file picker
-        script = '''
-        set theFile to choose file with prompt "Select an audio file to transcribe:" of type {"public.audio", "com.apple.m4a-audio", "public.mp3", "com.microsoft.waveform-audio"}
-        return POSIX path of theFile
-        '''
-
+        # Use AppleScript to open file picker (precompiled, see _osascript_args)
         try:
             result = subprocess.run(
-                ["osascript", "-e", script],
+                list(_osascript_args(_FILE_PICKER_SCRIPT)),
                 capture_output=True,
                 text=True
             )
@@ -2650,93 +3112,17 @@ read -n 1
 
         def do_transcribe():
             try:
-                # Wait for transcriber if needed
-                wait_count = 0
-                while self.transcriber is None and wait_count < 60:
-                    time.sleep(0.5)
-                    wait_count += 1
-
-                if self.transcriber is None:
-                    raise Exception("Model not loaded. Please wait and try again.")
-
-                # Get file info
                 file_name = os.path.basename(file_path)
-                from pydub import AudioSegment
-                audio = AudioSegment.from_file(file_path)
-                duration = audio.duration_seconds
-
-                logger.info(f"Transcribing: {file_name} ({duration:.1f}s)")
-
-                # Transcribe
-                chunk_duration = self.config.get("default_chunk_duration", 120)
-                df, full_text = self.transcriber.transcribe(
-                    file_path,
-                    chunk_duration=chunk_duration
-                )
-
-                if full_text is None:
-                    full_text = ""
-
-                # Handle diarization if enabled
-                output_text = full_text
-                num_speakers = 0
-
-                if self.config.get("diarization_enabled", False) and df is not None:
-                    try:
-                        self.status_item.title = "Identifying speakers..."
-                        from parakeet_mlx_guiapi.diarization import SpeakerDiarizer
-
-                        if not hasattr(self, '_diarizer') or self._diarizer is None:
-                            self._diarizer = SpeakerDiarizer()
-
-                        configured_speakers = self.config.get("diarization_num_speakers", 0)
-
-                        if configured_speakers > 0:
-                            diarization = self._diarizer.diarize(
-                                file_path,
-                                num_speakers=configured_speakers
-                            )
-                        else:
-                            diarization = self._diarizer.diarize(file_path)
-
-                        num_speakers = diarization.num_speakers
-                        segments = df.to_dict('records')
-                        output_text = diarization.format_transcript_markdown(segments)
-
-                    except Exception as e:
-                        logger.error(f"Diarization failed: {e}")
-                        output_text = full_text
-
-                if output_text:
-                    # Copy to clipboard if enabled
-                    if self.config.get("auto_copy_clipboard", True):
-                        pyperclip.copy(output_text)
-
-                    # Add to history
-                    self._add_to_history(output_text, duration)
-
-                    # Show notification
-                    if self.config.get("show_notifications", True):
-                        preview = output_text[:80] + "..." if len(output_text) > 80 else output_text
-                        copied_msg = " - Copied!" if self.config.get("auto_copy_clipboard", True) else ""
-                        speaker_info = f" ({num_speakers} speakers)" if num_speakers > 0 else ""
-                        rumps.notification(
-                            title=f"Transcription Complete{copied_msg}",
-                            subtitle=f"{file_name}{speaker_info}",
-                            message=preview,
-                            sound=True
-                        )
-
-                    self.title = self.ICON_READY
-                    threading.Timer(2.0, lambda: setattr(self, 'title', self.ICON_IDLE)).start()
+                if self.config.get("diarization_enabled", False):
+                    # Decode once and share the samples between the
+                    # transcriber and the diarizer
+                    audio = AudioProcessor.load_pcm(file_path, self.sample_rate)
+                    duration = len(audio) / self.sample_rate
                 else:
-                    rumps.notification(
-                        title="Transcription Empty",
-                        subtitle="",
-                        message="No speech detected in the audio file",
-                        sound=True
-                    )
-                    self.title = self.ICON_IDLE
+                    audio = file_path
+                    duration = AudioProcessor.get_audio_duration(file_path)
+
+                self._run_transcription(audio, duration, subtitle=file_name, kind="audio file")
 
             except Exception as e:
                 logger.error(f"File transcription error: {e}", exc_info=True)
@@ -2747,10 +3133,10 @@ read -n 1
                     sound=True
                 )
                 self.title = self.ICON_ERROR
-                threading.Timer(2.0, lambda: setattr(self, 'title', self.ICON_IDLE)).start()
+                self._reset_icon_later()
             finally:
                 self.processing = False
-                model_name = self.config.get("model_name", AVAILABLE_MODELS[0]["id"])
+                model_name = self.config.get("model_name", AVAILABLE_MODELS[0].id)
                 self.status_item.title = f"Ready: {self._get_model_short_name(model_name)}"
 
         threading.Thread(target=do_transcribe, daemon=True).start()
@@ -2785,16 +3171,16 @@ read -n 1
 
     def show_about(self, _):
         """Show about dialog."""
-        current_model_id = self.config.get("model_name", AVAILABLE_MODELS[0]["id"])
+        current_model_id = self.config.get("model_name", AVAILABLE_MODELS[0].id)
         current = self._get_model_by_id(current_model_id)
 
         if current:
             model_info = (
-                f"Current model: {current['name']}\n"
-                f"  Languages: {current.get('languages', 'Unknown')}\n"
-                f"  Accuracy (WER): {current.get('wer', 'N/A')}\n"
-                f"  Speed: {current.get('speed', 'N/A')}\n"
-                f"  Size: {current.get('size', 'Unknown')}"
+                f"Current model: {current.name}\n"
+                f"  Languages: {current.languages}\n"
+                f"  Accuracy (WER): {current.wer}\n"
+                f"  Speed: {current.speed}\n"
+                f"  Size: {current.size}"
             )
         else:
             model_info = f"Current model: {current_model_id}"
@@ -2845,6 +3231,9 @@ read -n 1
                 except Exception:
                     pass
 
+        self._flush_save()
+        self._probe_pool.shutdown(wait=False, cancel_futures=True)
+        self._loader.shutdown(wait=False, cancel_futures=True)
         rumps.quit_application()
 
 
@@ -4,19 +4,40 @@ API routes for Parakeet-MLX GUI and API.
 This module provides API routes for the Parakeet-MLX GUI and API.
 """
 
+import io
 import os
 import uuid
 import json
-from flask import request, jsonify, send_file
+import tempfile
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from flask import Request, request, jsonify, send_file
+from flask.json.provider import DefaultJSONProvider
+from werkzeug.exceptions import BadRequest
 from werkzeug.utils import secure_filename
 
 from parakeet_mlx_guiapi.utils.config import get_config
-from parakeet_mlx_guiapi.transcription.transcriber import AudioTranscriber
+from parakeet_mlx_guiapi.utils import jsonio
 from parakeet_mlx_guiapi.audio.processor import AudioProcessor
-from parakeet_mlx_guiapi.utils.visualization import visualize_transcript, create_transcript_heatmap
 
 # Global transcriber instance
 _transcriber = None
+# Request threads and the job worker may both ask for it first
+_transcriber_lock = threading.Lock()
+# Held while the shared model transcribes. Parallel calls on one model only
+# contend for the GPU, so synchronous requests and jobs take turns
+_model_lock = threading.Lock()
+
+# Background transcription jobs by id, oldest first. One worker runs them:
+# every job shares the model, so more would only contend for the GPU
+_jobs = OrderedDict()
+_jobs_lock = threading.Lock()
+_job_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="transcribe-job")
+# Finished jobs kept for polling before the oldest are dropped
+MAX_FINISHED_JOBS = 100
+# Seconds a client is told to wait after a 429
+RETRY_AFTER_SECONDS = 5
 
 def get_transcriber():
     """
@@ -28,11 +49,224 @@ def get_transcriber():
     global _transcriber
     
     if _transcriber is None:
-        config = get_config()
-        _transcriber = AudioTranscriber(model_name=config["model_name"])
+        with _transcriber_lock:
+            if _transcriber is None:
+                # Imported here so mlx only loads once a transcription is requested
+                from parakeet_mlx_guiapi.transcription.transcriber import AudioTranscriber
+                config = get_config()
+                _transcriber = AudioTranscriber(model_name=config["model_name"])
     
     return _transcriber
 
+def transcribe_shared(file_path, **kwargs):
+    """
+    Transcribe with the shared transcriber, waiting for the model if it is busy.
+    
+    Every blocking caller of the shared model (queued jobs, live sessions
+    through ParakeetProvider) goes through here so calls never overlap;
+    /api/transcribe takes _model_lock itself so it can answer 429 instead.
+    
+    Parameters:
+    - file_path: Audio file to transcribe
+    - **kwargs: Passed on to AudioTranscriber.transcribe
+    
+    Returns:
+    - DataFrame with transcription results and the full text
+    """
+    transcriber = get_transcriber()
+    with _model_lock:
+        return transcriber.transcribe(file_path, **kwargs)
+
+class UploadRequest(Request):
+    """
+    Request that spools uploaded files straight into the upload folder.
+
+    Werkzeug normally buffers file parts in a SpooledTemporaryFile that
+    file.save() then copies out again. Here each part is written once, to
+    a named temp file beside its final location, so save_upload() can
+    hard-link it into place. The temp name goes away when the request
+    closes its files. A part with an unsupported extension is refused
+    before any of it is written.
+    """
+
+    def _get_file_stream(self, total_content_length, content_type, filename=None, content_length=None):
+        ext = unsupported_extension(filename) if filename else None
+        if ext is not None:
+            raise UnsupportedUpload(ext)
+        return tempfile.NamedTemporaryFile(dir=get_config()["upload_folder"], prefix=".upload-")
+
+
+class UnsupportedUpload(BadRequest):
+    """Raised while parsing a file part whose extension isn't supported."""
+
+    def __init__(self, ext):
+        super().__init__(f"Unsupported file format: {ext or 'none'}")
+
+
+def unsupported_extension(filename):
+    """
+    Check a file name against config["supported_formats"].
+    
+    Parameters:
+    - filename: Client-supplied file name
+    
+    Returns:
+    - The lowercased extension ('' if none) when unsupported, else None
+    """
+    ext = os.path.splitext(filename)[1].lower()
+    return None if ext in get_config()["supported_formats"] else ext
+
+
+class JsonioProvider(DefaultJSONProvider):
+    """
+    JSON provider that renders responses with jsonio.
+
+    Transcription responses carry two base64 images and a segment list,
+    which orjson (when installed) serializes several times faster than
+    the stdlib encoder. Flask's own default() still handles dates,
+    decimals, UUIDs and dataclasses, and sort_keys/compact are honoured.
+    """
+
+    def dumps(self, obj, **kwargs):
+        return jsonio.dumps(
+            obj,
+            indent=bool(kwargs.get("indent")),
+            sort_keys=kwargs.get("sort_keys", self.sort_keys),
+            default=kwargs.get("default", self.default),
+        ).decode("utf-8")
+
+    def loads(self, s, **kwargs):
+        return jsonio.loads(s)
+
+
+def reject_upload(file):
+    """
+    Check an uploaded file's name before it is saved or decoded.
+    
+    Parameters:
+    - file: werkzeug FileStorage from request.files
+    
+    Returns:
+    - (response, status) error to send back, or None if the file is acceptable
+    """
+    if file.filename == '':
+        return jsonify({"error": "No selected file"}), 400
+    ext = unsupported_extension(file.filename)
+    if ext is not None:
+        return jsonify({"error": UnsupportedUpload(ext).description}), 400
+    return None
+
+def upload_path(file, file_id):
+    """
+    Pick where an upload is stored on the server.
+
+    The id alone makes the name unique; only the extension is kept so
+    decoders can still sniff the format. The client's file name is
+    sanitized separately, and only when it is offered back as a download.
+    
+    Parameters:
+    - file: werkzeug FileStorage from request.files
+    - file_id: Unique id for this upload
+    
+    Returns:
+    - Path inside the upload folder
+    """
+    ext = os.path.splitext(file.filename)[1].lower()
+    return os.path.join(get_config()["upload_folder"], file_id + ext)
+
+def save_upload(file, file_path):
+    """
+    Save an uploaded file, linking its spooled copy instead of copying it.
+
+    Either way the file only appears under file_path once it is complete.
+
+    Parameters:
+    - file: werkzeug FileStorage from request.files
+    - file_path: Destination path
+    """
+    name = getattr(file.stream, "name", None)
+    if isinstance(name, str):
+        file.stream.flush()
+        try:
+            os.link(name, file_path)
+            return
+        except OSError:
+            pass  # Different filesystem, or no hard links; copy below
+    part_path = file_path + ".part"
+    try:
+        file.save(part_path)
+        os.replace(part_path, file_path)
+    except BaseException:
+        if os.path.exists(part_path):
+            os.remove(part_path)
+        raise
+
+def too_busy(message):
+    """
+    Build a 429 response that tells the client when to retry.
+    
+    Parameters:
+    - message: Error message
+    
+    Returns:
+    - (response, status, headers) tuple
+    """
+    return jsonify({"error": message}), 429, {"Retry-After": str(RETRY_AFTER_SECONDS)}
+
+def send_attachment(data, download_name, mimetype):
+    """
+    Send generated bytes as a download straight from memory.
+    
+    Parameters:
+    - data: Response body
+    - download_name: File name offered to the client
+    - mimetype: Content type
+    
+    Returns:
+    - Flask response
+    """
+    return send_file(
+        io.BytesIO(data),
+        as_attachment=True,
+        download_name=download_name,
+        mimetype=mimetype
+    )
+
+def _run_job(job_id, file_path, chunk_duration, overlap_duration):
+    """
+    Transcribe an uploaded file for a background job and record the result.
+
+    Parameters:
+    - job_id: Job to update
+    - file_path: Uploaded audio, removed when done
+    - chunk_duration: Duration of each chunk in seconds (0 to disable)
+    - overlap_duration: Overlap duration in seconds
+    """
+    with _jobs_lock:
+        _jobs[job_id]["status"] = "running"
+    try:
+        df, full_text = transcribe_shared(
+            file_path,
+            chunk_duration=chunk_duration,
+            overlap_duration=overlap_duration
+        )
+        update = {
+            "status": "done",
+            "text": full_text,
+            "segments": df.to_dict(orient='records')
+        }
+    except Exception as e:
+        update = {"status": "error", "error": str(e)}
+    finally:
+        if os.path.exists(file_path):
+            os.remove(file_path)
+
+    with _jobs_lock:
+        _jobs[job_id].update(update)
+        finished = [jid for jid, job in _jobs.items() if job["status"] in ("done", "error")]
+        for jid in finished[:max(0, len(finished) - MAX_FINISHED_JOBS)]:
+            del _jobs[jid]
+
 def setup_api_routes(app):
     """
     Set up API routes for the Flask app.
@@ -40,12 +274,30 @@ def setup_api_routes(app):
     Parameters:
     - app: Flask app
     """
+    app.request_class = UploadRequest
+    app.json = JsonioProvider(app)
+    # Oversized bodies are refused from Content-Length, before anything is read
+    app.config['MAX_CONTENT_LENGTH'] = get_config()["max_upload_size_mb"] * 1024 * 1024
+    
+    @app.errorhandler(413)
+    def upload_too_large(e):
+        limit = get_config()["max_upload_size_mb"]
+        return jsonify({"error": f"File too large (limit {limit} MB)"}), 413
+    
+    @app.errorhandler(UnsupportedUpload)
+    def upload_unsupported(e):
+        return jsonify({"error": e.description}), 400
     
     @app.route('/api/transcribe', methods=['POST'])
     def api_transcribe():
         """
         Transcribe an audio file.
         """
+        # Refuse while the model is busy before request.files is touched,
+        # so the upload isn't spooled just to be thrown away
+        if _model_lock.locked():
+            return too_busy("A transcription is already running")
+        
         # Check if the post request has the file part
         if 'file' not in request.files:
             return jsonify({"error": "No file part"}), 400
@@ -53,8 +305,9 @@ def setup_api_routes(app):
         file = request.files['file']
         
         # If user does not select file, browser also submits an empty part without filename
-        if file.filename == '':
-            return jsonify({"error": "No selected file"}), 400
+        rejected = reject_upload(file)
+        if rejected:
+            return rejected
         
         # Get parameters from request
         output_format = request.form.get('output_format', 'json')
@@ -62,23 +315,26 @@ def setup_api_routes(app):
         chunk_duration = float(request.form.get('chunk_duration', get_config()["default_chunk_duration"]))
         overlap_duration = float(request.form.get('overlap_duration', get_config()["default_overlap_duration"]))
         
-        # Save the file
-        config = get_config()
-        file_id = str(uuid.uuid4())
-        filename = secure_filename(file.filename)
-        file_path = os.path.join(config["upload_folder"], f"{file_id}_{filename}")
-        file.save(file_path)
-        
+        file_path = upload_path(file, str(uuid.uuid4()))
         try:
+            # Save the file
+            save_upload(file, file_path)
+            
             # Get transcriber
             transcriber = get_transcriber()
             
-            # Transcribe the file
-            df, full_text = transcriber.transcribe(
-                file_path,
-                chunk_duration=chunk_duration if chunk_duration > 0 else None,
-                overlap_duration=overlap_duration
-            )
+            # Transcribe the file, unless a job or request took the model
+            # while the upload was being saved
+            if not _model_lock.acquire(blocking=False):
+                return too_busy("A transcription is already running")
+            try:
+                df, full_text = transcriber.transcribe(
+                    file_path,
+                    chunk_duration=chunk_duration if chunk_duration > 0 else None,
+                    overlap_duration=overlap_duration
+                )
+            finally:
+                _model_lock.release()
             
             if df is None:
                 return jsonify({"error": "Transcription failed"}), 500
@@ -89,50 +345,18 @@ def setup_api_routes(app):
                 content_type = 'text/plain'
             elif output_format == 'srt':
                 # Convert DataFrame to SRT format
-                srt_content = ""
-                for i, row in df.iterrows():
-                    start_time = float(row['Start (s)'])
-                    end_time = float(row['End (s)'])
-                    
-                    # Format times as HH:MM:SS,mmm
-                    start_formatted = format_time_srt(start_time)
-                    end_formatted = format_time_srt(end_time)
-                    
-                    srt_content += f"{i+1}\n"
-                    srt_content += f"{start_formatted} --> {end_formatted}\n"
-                    srt_content += f"{row['Segment']}\n\n"
-                
-                response_data = srt_content
+                response_data = format_srt(df)
                 content_type = 'text/plain'
             elif output_format == 'vtt':
                 # Convert DataFrame to VTT format
-                vtt_content = "WEBVTT\n\n"
-                for i, row in df.iterrows():
-                    start_time = float(row['Start (s)'])
-                    end_time = float(row['End (s)'])
-                    
-                    # Format times as HH:MM:SS.mmm
-                    start_formatted = format_time_vtt(start_time)
-                    end_formatted = format_time_vtt(end_time)
-                    
-                    vtt_content += f"{start_formatted} --> {end_formatted}\n"
-                    vtt_content += f"{row['Segment']}\n\n"
-                
-                response_data = vtt_content
+                response_data = format_vtt(df)
                 content_type = 'text/plain'
             elif output_format == 'csv':
-                # Save to CSV and return the file
-                result_path = os.path.join(config["result_folder"], f"{file_id}.csv")
-                df.to_csv(result_path, index=False)
-                
-                return send_file(
-                    result_path,
-                    as_attachment=True,
-                    download_name=f"{os.path.splitext(filename)[0]}.csv",
-                    mimetype='text/csv'
-                )
+                response_data = df.to_csv(index=False)
+                content_type = 'text/csv'
             else:  # Default to JSON
-                # Create visualization
+                # Create visualization (matplotlib loads on first use)
+                from parakeet_mlx_guiapi.utils.visualization import visualize_transcript, create_transcript_heatmap
                 viz_img = visualize_transcript(df)
                 heatmap_img = create_transcript_heatmap(df)
                 
@@ -144,16 +368,11 @@ def setup_api_routes(app):
                 }
                 return jsonify(response_data)
             
-            # For non-JSON formats, save to file and return the file
-            result_path = os.path.join(config["result_folder"], f"{file_id}.{output_format}")
-            with open(result_path, 'w', encoding='utf-8') as f:
-                f.write(response_data)
-            
-            return send_file(
-                result_path,
-                as_attachment=True,
-                download_name=f"{os.path.splitext(filename)[0]}.{output_format}",
-                mimetype=content_type
+            # For non-JSON formats, send the text as a download
+            return send_attachment(
+                response_data.encode('utf-8'),
+                f"{os.path.splitext(secure_filename(file.filename))[0]}.{output_format}",
+                content_type
             )
             
         except Exception as e:
@@ -163,6 +382,56 @@ def setup_api_routes(app):
             if os.path.exists(file_path):
                 os.remove(file_path)
     
+    @app.route('/api/transcriptions', methods=['POST'])
+    def api_create_transcription():
+        """
+        Queue an audio file for transcription and return its job id.
+        """
+        if 'file' not in request.files:
+            return jsonify({"error": "No file part"}), 400
+        
+        file = request.files['file']
+        
+        rejected = reject_upload(file)
+        if rejected:
+            return rejected
+        
+        config = get_config()
+        chunk_duration = float(request.form.get('chunk_duration', config["default_chunk_duration"]))
+        overlap_duration = float(request.form.get('overlap_duration', config["default_overlap_duration"]))
+        
+        with _jobs_lock:
+            pending = sum(job["status"] in ("queued", "running") for job in _jobs.values())
+            if pending >= config["max_pending_jobs"]:
+                return too_busy("Too many pending transcriptions")
+            job_id = str(uuid.uuid4())
+            _jobs[job_id] = {"status": "queued"}
+        
+        file_path = upload_path(file, job_id)
+        try:
+            save_upload(file, file_path)
+        except OSError as e:
+            with _jobs_lock:
+                del _jobs[job_id]
+            return jsonify({"error": str(e)}), 500
+        _job_executor.submit(_run_job, job_id, file_path, chunk_duration, overlap_duration)
+        
+        return jsonify({"id": job_id, "status": "queued"}), 202
+    
+    @app.route('/api/transcriptions/<job_id>', methods=['GET'])
+    def api_get_transcription(job_id):
+        """
+        Get the status, and once done the result, of a queued transcription.
+        """
+        with _jobs_lock:
+            job = _jobs.get(job_id)
+            job = dict(job) if job is not None else None
+        
+        if job is None:
+            return jsonify({"error": "Unknown transcription"}), 404
+        
+        return jsonify({"id": job_id, **job})
+    
     @app.route('/api/models', methods=['GET'])
     def api_models():
         """
@@ -183,8 +452,9 @@ def setup_api_routes(app):
         file = request.files['file']
         
         # If user does not select file, browser also submits an empty part without filename
-        if file.filename == '':
-            return jsonify({"error": "No selected file"}), 400
+        rejected = reject_upload(file)
+        if rejected:
+            return rejected
         
         # Get parameters from request
         start_time = float(request.form.get('start_time', 0))
@@ -194,11 +464,8 @@ def setup_api_routes(app):
             return jsonify({"error": "Invalid time range"}), 400
         
         # Save the file
-        config = get_config()
-        file_id = str(uuid.uuid4())
-        filename = secure_filename(file.filename)
-        file_path = os.path.join(config["upload_folder"], f"{file_id}_{filename}")
-        file.save(file_path)
+        file_path = upload_path(file, str(uuid.uuid4()))
+        save_upload(file, file_path)
         
         try:
             # Get the segment
@@ -207,16 +474,10 @@ def setup_api_routes(app):
             if segment_data is None:
                 return jsonify({"error": "Failed to extract segment"}), 500
             
-            # Create a temporary file for the segment
-            segment_path = os.path.join(config["result_folder"], f"{file_id}_segment.wav")
-            with open(segment_path, 'wb') as f:
-                f.write(segment_data)
-            
-            return send_file(
-                segment_path,
-                as_attachment=True,
-                download_name=f"{os.path.splitext(filename)[0]}_segment.wav",
-                mimetype='audio/wav'
+            return send_attachment(
+                segment_data,
+                f"{os.path.splitext(secure_filename(file.filename))[0]}_segment.wav",
+                'audio/wav'
             )
             
         except Exception as e:
@@ -226,6 +487,46 @@ def setup_api_routes(app):
             if os.path.exists(file_path):
                 os.remove(file_path)
 
+def _cue_columns(df):
+    """Start times, end times and texts of a transcript as plain lists."""
+    return (
+        df['Start (s)'].astype(float).tolist(),
+        df['End (s)'].astype(float).tolist(),
+        df['Segment'].tolist()
+    )
+
+def format_srt(df):
+    """
+    Format a transcript DataFrame as SRT subtitles.
+    
+    Parameters:
+    - df: DataFrame with 'Start (s)', 'End (s)' and 'Segment' columns
+    
+    Returns:
+    - SRT document
+    """
+    starts, ends, texts = _cue_columns(df)
+    return "".join([
+        f"{i}\n{format_time_srt(start)} --> {format_time_srt(end)}\n{text}\n\n"
+        for i, (start, end, text) in enumerate(zip(starts, ends, texts), 1)
+    ])
+
+def format_vtt(df):
+    """
+    Format a transcript DataFrame as WebVTT subtitles.
+    
+    Parameters:
+    - df: DataFrame with 'Start (s)', 'End (s)' and 'Segment' columns
+    
+    Returns:
+    - WebVTT document
+    """
+    starts, ends, texts = _cue_columns(df)
+    return "WEBVTT\n\n" + "".join([
+        f"{format_time_vtt(start)} --> {format_time_vtt(end)}\n{text}\n\n"
+        for start, end, text in zip(starts, ends, texts)
+    ])
+
 def format_time_srt(seconds):
     """
     Format time in seconds to SRT format (HH:MM:SS,mmm).
@@ -236,12 +537,7 @@ def format_time_srt(seconds):
     Returns:
     - Formatted time string
     """
-    hours = int(seconds // 3600)
-    minutes = int((seconds % 3600) // 60)
-    seconds = seconds % 60
-    milliseconds = int((seconds - int(seconds)) * 1000)
-    
-    return f"{hours:02d}:{minutes:02d}:{int(seconds):02d},{milliseconds:03d}"
+    return _format_timestamp(seconds, ",")
 
 def format_time_vtt(seconds):
     """
@@ -253,9 +549,13 @@ def format_time_vtt(seconds):
     Returns:
     - Formatted time string
     """
-    hours = int(seconds // 3600)
-    minutes = int((seconds % 3600) // 60)
-    seconds = seconds % 60
-    milliseconds = int((seconds - int(seconds)) * 1000)
-    
-    return f"{hours:02d}:{minutes:02d}:{int(seconds):02d}.{milliseconds:03d}"
+    return _format_timestamp(seconds, ".")
+
+def _format_timestamp(seconds, separator):
+    """HH:MM:SS plus milliseconds after separator, from whole milliseconds."""
+    # Rounding once avoids float remainders such as 1.13 -> 1.129
+    ms = round(seconds * 1000)
+    secs, ms = divmod(ms, 1000)
+    minutes, secs = divmod(secs, 60)
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours:02d}:{minutes:02d}:{secs:02d}{separator}{ms:03d}"
@@ -5,10 +5,28 @@ This module provides the AudioProcessor class for processing audio files.
 """
 
 import os
+import math
+import struct
+import subprocess
 import tempfile
 from pathlib import Path
 import io
 
+# RIFF/WAVE header for 16-bit PCM: RIFF chunk, 16-byte fmt chunk, data chunk
+_WAV_HEADER = struct.Struct('<4sI4s4sIHHIIHH4sI')
+
+
+def _writev_all(fd, buffers):
+    """Gather-write buffers to a raw descriptor, retrying after short writes."""
+    views = [memoryview(b).cast('B') for b in buffers]
+    while views:
+        written = os.writev(fd, views)
+        while views and written >= len(views[0]):
+            written -= len(views[0])
+            views.pop(0)
+        if views and written:
+            views[0] = views[0][written:]
+
 class AudioProcessor:
     """
     Class for processing audio files.
@@ -40,6 +58,20 @@ class AudioProcessor:
                 audio_path = temp_path
             else:
                 audio_path = audio_file
+
+            # Fast path: already at the target rate and mono, only the
+            # header is read; other libsndfile formats convert without pydub
+            try:
+                import soundfile as sf
+                info = sf.info(str(audio_path))
+                if info.samplerate == target_sr and info.channels == 1:
+                    return audio_path
+                processed_path = os.path.join(tempfile.gettempdir(), f"processed_{Path(audio_path).stem}.wav")
+                print(f"Converting {info.samplerate}Hz/{info.channels}ch audio to {target_sr}Hz mono")
+                AudioProcessor.to_mono_wav(audio_path, processed_path, target_sr)
+                return processed_path
+            except Exception:
+                pass  # Not readable by libsndfile (mp3/m4a/...), decode below
             
             # Load the audio
             audio = AudioSegment.from_file(audio_path)
@@ -73,6 +105,124 @@ class AudioProcessor:
             print(f"Error preprocessing audio: {e}")
             return audio_path
     
+    @staticmethod
+    def load_pcm(audio_path, target_sr=16000):
+        """
+        Decode an audio file to mono float32 samples at the target rate.
+
+        Decoding once and handing the samples to both the transcriber and
+        the diarizer avoids reading and resampling the same file twice.
+        
+        Parameters:
+        - audio_path: Path to the audio file
+        - target_sr: Target sample rate
+        
+        Returns:
+        - 1-D float32 numpy array in [-1, 1]
+        """
+        import numpy as np
+
+        try:
+            import soundfile as sf
+            data, sr = sf.read(str(audio_path), dtype='float32', always_2d=True)
+        except Exception:
+            # Not readable by libsndfile (mp3/m4a/...), decode with pydub
+            from pydub import AudioSegment
+            audio = AudioSegment.from_file(str(audio_path)).set_channels(1)
+            scale = 1.0 / (1 << (8 * audio.sample_width - 1))
+            data = np.multiply(audio.get_array_of_samples(), scale, dtype=np.float32)[:, None]
+            sr = audio.frame_rate
+
+        data = data.mean(axis=1, dtype=np.float32) if data.shape[1] > 1 else data[:, 0]
+        if sr != target_sr:
+            from scipy.signal import resample_poly
+            g = math.gcd(sr, target_sr)
+            data = resample_poly(data, target_sr // g, sr // g).astype(np.float32, copy=False)
+        return np.ascontiguousarray(data)
+
+    @staticmethod
+    def to_mono_wav(audio_path, output_path, target_sr=16000):
+        """
+        Downmix and resample a file libsndfile can read into a 16-bit WAV.
+
+        Resampling uses scipy's polyphase filter, which is both faster and
+        cleaner than pydub's audioop interpolation.
+        
+        Parameters:
+        - audio_path: Path to the source audio (WAV, FLAC, OGG, ...)
+        - output_path: Path of the WAV file to write
+        - target_sr: Target sample rate
+        
+        Returns:
+        - Duration in seconds
+        """
+        import numpy as np
+        import soundfile as sf
+
+        # Probe first so formats libsndfile can't read still raise here
+        sf.info(str(audio_path))
+        data = AudioProcessor.load_pcm(audio_path, target_sr)
+
+        # libsndfile wraps rather than clips out-of-range floats
+        np.clip(data, -1.0, 1.0, out=data)
+        sf.write(str(output_path), data, target_sr, subtype='PCM_16')
+        return len(data) / target_sr
+
+    WAV_HEADER_SIZE = _WAV_HEADER.size
+
+    @staticmethod
+    def wav_header(num_samples, sample_rate, channels=1):
+        """
+        Build the 44-byte header for a 16-bit PCM WAV file.
+
+        Parameters:
+        - num_samples: Total samples across all channels
+        - sample_rate: Sample rate in Hz
+        - channels: Number of interleaved channels
+
+        Returns:
+        - Header bytes
+        """
+        data_bytes = num_samples * 2
+        return _WAV_HEADER.pack(
+            b'RIFF', 36 + data_bytes, b'WAVE',
+            b'fmt ', 16, 1, channels, sample_rate,
+            sample_rate * channels * 2, channels * 2, 16,
+            b'data', data_bytes
+        )
+
+    @staticmethod
+    def write_wav(destination, samples, sample_rate, channels=1):
+        """
+        Write 16-bit PCM samples as a WAV file.
+
+        The 44-byte header is packed in one go and the samples are written
+        straight from the array, so the file costs a couple of large writes
+        instead of the many small ones scipy.io.wavfile makes.
+
+        Parameters:
+        - destination: File path, binary file object, or raw file descriptor
+          (written with one gather write, no intermediate buffer)
+        - samples: int16 numpy array (interleaved if channels > 1)
+        - sample_rate: Sample rate in Hz
+        - channels: Number of interleaved channels
+        """
+        samples = samples.astype('<i2', copy=False)
+        header = AudioProcessor.wav_header(samples.size, sample_rate, channels)
+
+        if isinstance(destination, int):
+            _writev_all(destination, [header, samples])
+            return
+
+        if hasattr(destination, 'write'):
+            destination.write(header)
+            samples.tofile(destination)
+            return
+
+        with open(destination, 'wb', buffering=1 << 20) as f:
+            f.write(header)
+            samples.tofile(f)
+
     @staticmethod
     def get_audio_segment(audio_path, start_time, end_time):
         """
@@ -86,6 +236,32 @@ class AudioProcessor:
         Returns:
         - Audio segment as bytes
         """
+        # Fast path: formats libsndfile reads (WAV, FLAC, OGG, ...) seek
+        # straight to the segment and decode only its frames
+        try:
+            import soundfile as sf
+            info = sf.info(str(audio_path))
+            start = int(start_time * info.samplerate)
+            stop = min(int(end_time * info.samplerate), info.frames)
+            pcm = info.subtype.startswith('PCM')
+            data, sr = sf.read(
+                str(audio_path), start=start, stop=max(start, stop),
+                dtype='int32' if pcm else 'float32', always_2d=True
+            )
+            subtype = info.subtype if sf.check_format('WAV', info.subtype) else 'PCM_16'
+            buffer = io.BytesIO()
+            sf.write(buffer, data, sr, format='WAV', subtype=subtype)
+            return buffer.getvalue()
+        except Exception:
+            pass  # mp3/m4a/... or no soundfile, try ffmpeg below
+
+        # Compressed formats: ffmpeg seeks before decoding, so only the
+        # requested range is decoded
+        try:
+            return AudioProcessor._ffmpeg_segment(audio_path, start_time, end_time)
+        except Exception:
+            pass  # No ffmpeg or unreadable stream, decode with pydub below
+
         try:
             from pydub import AudioSegment
             
@@ -110,10 +286,33 @@ class AudioProcessor:
             print(f"Error extracting audio segment: {e}")
             return None
     
+    @staticmethod
+    def _ffmpeg_segment(audio_path, start_time, end_time):
+        """Cut a segment with ffmpeg as a 16-bit WAV, keeping rate and channels."""
+        probe = subprocess.run(
+            ["ffprobe", "-v", "error", "-select_streams", "a:0",
+             "-show_entries", "stream=sample_rate,channels",
+             "-of", "csv=p=0", str(audio_path)],
+            capture_output=True, text=True, check=True
+        )
+        sample_rate, channels = (int(v) for v in probe.stdout.strip().split(",")[:2])
+
+        # -ss before -i seeks in the input instead of decoding up to start
+        result = subprocess.run(
+            ["ffmpeg", "-v", "error", "-ss", f"{start_time:.3f}", "-t", f"{end_time - start_time:.3f}",
+             "-i", str(audio_path), "-vn", "-f", "s16le", "-acodec", "pcm_s16le", "-"],
+            capture_output=True, check=True
+        )
+        pcm = result.stdout
+        return AudioProcessor.wav_header(len(pcm) // 2, sample_rate, channels) + pcm
+
     @staticmethod
     def get_audio_duration(audio_path):
         """
         Get the duration of an audio file.
+
+        Only the file header is read (soundfile); formats libsndfile can't
+        open, such as m4a, fall back to ffprobe. Nothing is decoded.
         
         Parameters:
         - audio_path: Path to the audio file
@@ -122,14 +321,19 @@ class AudioProcessor:
         - Duration in seconds
         """
         try:
-            from pydub import AudioSegment
-            
-            # Load audio
-            audio = AudioSegment.from_file(audio_path)
-            
-            # Get duration
-            return audio.duration_seconds
-            
+            import soundfile as sf
+            info = sf.info(str(audio_path))
+            return info.frames / info.samplerate
+        except Exception:
+            pass
+
+        try:
+            result = subprocess.run(
+                ["ffprobe", "-v", "error", "-show_entries", "format=duration",
+                 "-of", "default=noprint_wrappers=1:nokey=1", str(audio_path)],
+                capture_output=True, text=True, check=True
+            )
+            return float(result.stdout.strip())
         except Exception as e:
             print(f"Error getting audio duration: {e}")
             return 0
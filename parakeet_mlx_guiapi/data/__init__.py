@@ -0,0 +1,5 @@
+"""
+Static data files for Parakeet-MLX GUI and API.
+
+This package ships the model catalog (models.json) used by the menu bar app.
+"""
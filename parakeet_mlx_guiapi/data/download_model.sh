@@ -0,0 +1,59 @@
+#!/bin/bash
+# Download a Parakeet model from HuggingFace with visible progress.
+#
+# Usage: download_model.sh <python> <model_id> <model_name> <model_size> [--then-load]
+#
+# Launched in Terminal by the menu bar app; arguments are passed as-is so
+# no shell/AppleScript escaping of the model metadata is needed.
+
+PYTHON="$1"
+MODEL_ID="$2"
+MODEL_NAME="$3"
+MODEL_SIZE="$4"
+THEN_LOAD="$5"
+
+clear
+echo "══════════════════════════════════════════════════════════════"
+echo "  Downloading: $MODEL_NAME"
+echo "══════════════════════════════════════════════════════════════"
+echo ""
+echo "Model: $MODEL_ID"
+echo "Size: $MODEL_SIZE"
+echo ""
+echo "Downloading from HuggingFace..."
+echo "(Progress bar will appear below)"
+echo ""
+
+"$PYTHON" - "$MODEL_ID" <<'PY'
+import sys
+from huggingface_hub import snapshot_download
+
+# Already fully cached: skip the round-trip to the Hub
+try:
+    path = snapshot_download(sys.argv[1], local_files_only=True)
+    print('✅ Model already downloaded.')
+    print(f'Saved to: {path}')
+    sys.exit(0)
+except Exception:
+    pass
+
+try:
+    path = snapshot_download(sys.argv[1], local_files_only=False)
+    print('')
+    print('✅ Download complete!')
+    print(f'Saved to: {path}')
+except Exception as e:
+    print('')
+    print(f'❌ Download failed: {e}')
+    sys.exit(1)
+PY
+EXIT_CODE=$?
+
+echo ""
+if [ $EXIT_CODE -eq 0 ] && [ "$THEN_LOAD" = "--then-load" ]; then
+    echo "The model will now load in Parakeet."
+    echo ""
+fi
+echo "You can close this window."
+echo "Press any key to close..."
+read -n 1
@@ -6,10 +6,22 @@ Requires a HuggingFace token with access to pyannote models.
 """
 
 import os
+import bisect
+import threading
+import numpy as np
+from collections import OrderedDict
 from dataclasses import dataclass
-from typing import List, Optional, Tuple
+from functools import cached_property
+from typing import TYPE_CHECKING, Iterator, List, Optional, Tuple, Union
 import warnings
 
+if TYPE_CHECKING:
+    import pandas as pd
+
+# Transcription segments: dicts with start/end/text keys, or the
+# transcriber's DataFrame ("Start (s)", "End (s)", "Segment" columns)
+Segments = Union[List[dict], "pd.DataFrame"]
+
 
 @dataclass
 class SpeakerSegment:
@@ -29,11 +41,35 @@ class DiarizationResult:
     segments: List[SpeakerSegment]
     num_speakers: int
 
+    @cached_property
+    def _time_index(self) -> Tuple[List[SpeakerSegment], List[float], List[float], List[int]]:
+        """
+        Segments sorted by start, their starts, and the running maximum of
+        their ends with the index of the segment reaching it.
+
+        Built on first lookup; segments may overlap, which is why the running
+        maximum is needed rather than each segment's own end.
+        """
+        ordered = sorted(self.segments, key=lambda s: s.start)
+        starts = [seg.start for seg in ordered]
+        reach, reach_idx = [], []
+        best, best_i = float("-inf"), -1
+        for i, seg in enumerate(ordered):
+            if seg.end > best:
+                best, best_i = seg.end, i
+            reach.append(best)
+            reach_idx.append(best_i)
+        return ordered, starts, reach, reach_idx
+
     def get_speaker_at_time(self, time: float) -> Optional[str]:
         """Get the speaker at a specific time."""
-        for seg in self.segments:
-            if seg.start <= time <= seg.end:
-                return seg.speaker
+        ordered, starts, reach, _ = self._time_index
+        # Segments [0, i) start at or before time; the first whose end
+        # reaches time is where the running maximum first does
+        i = bisect.bisect_right(starts, time)
+        k = bisect.bisect_left(reach, time)
+        if k < i:
+            return ordered[k].speaker
         return None
 
     def merge_with_transcription(self, transcription_segments: List[dict]) -> List[dict]:
@@ -65,31 +101,52 @@ class DiarizationResult:
         if not self.segments:
             return None
 
-        closest = min(self.segments,
-                     key=lambda s: min(abs(s.start - time), abs(s.end - time)))
-        return closest.speaker
+        # Nearest edge is the latest end before time or the first start after
+        ordered, starts, reach, reach_idx = self._time_index
+        i = bisect.bisect_right(starts, time)
+        if i == 0:
+            return ordered[0].speaker
+        before = ordered[reach_idx[i - 1]]
+        if i == len(ordered) or abs(time - reach[i - 1]) <= starts[i] - time:
+            return before.speaker
+        return ordered[i].speaker
 
-    def format_transcript(self, transcription_segments: List[dict]) -> str:
+    @staticmethod
+    def _segment_columns(transcription_segments: Segments) -> Iterator[Tuple[float, float, str]]:
         """
-        Format transcription with speaker labels.
+        Yield (start, end, text) for each transcription segment.
 
-        Returns formatted text like:
-        Speaker 1: Hello, how are you?
-        Speaker 2: I'm doing great, thanks!
+        Accepts a list of segment dicts or the transcriber's DataFrame; the
+        DataFrame is read column-wise so no per-row dicts are built.
         """
-        merged = self.merge_with_transcription(transcription_segments)
+        if hasattr(transcription_segments, "columns"):
+            df = transcription_segments
+            return zip(df["Start (s)"].tolist(), df["End (s)"].tolist(), df["Segment"].tolist())
+        return (
+            (
+                seg.get("start", seg.get("Start (s)", 0)),
+                seg.get("end", seg.get("End (s)", 0)),
+                seg.get("text", seg.get("Segment", "")),
+            )
+            for seg in transcription_segments
+        )
 
-        lines = []
+    def _speaker_turns(self, transcription_segments: Segments) -> List[Tuple[str, List[str]]]:
+        """Group consecutive segments by speaker into (speaker, texts) turns."""
+        turns = []
         current_speaker = None
         current_text = []
 
-        for seg in merged:
-            speaker = seg.get("speaker", "Unknown")
-            text = seg.get("text", seg.get("Segment", ""))
+        for start, end, text in self._segment_columns(transcription_segments):
+            mid_time = (start + end) / 2
+            speaker = self.get_speaker_at_time(mid_time)
+            if speaker is None:
+                speaker = self._find_closest_speaker(mid_time)
+            speaker = speaker or "Unknown"
 
             if speaker != current_speaker:
                 if current_text:
-                    lines.append(f"{current_speaker}: {' '.join(current_text)}")
+                    turns.append((current_speaker, current_text))
                 current_speaker = speaker
                 current_text = [text]
             else:
@@ -97,14 +154,32 @@ class DiarizationResult:
 
         # Don't forget the last speaker
         if current_text:
-            lines.append(f"{current_speaker}: {' '.join(current_text)}")
+            turns.append((current_speaker, current_text))
+
+        return turns
+
+    def format_transcript(self, transcription_segments: Segments) -> str:
+        """
+        Format transcription with speaker labels.
+
+        Accepts segment dicts or the transcriber's DataFrame.
 
+        Returns formatted text like:
+        Speaker 1: Hello, how are you?
+        Speaker 2: I'm doing great, thanks!
+        """
+        lines = [
+            f"{speaker}: {' '.join(texts)}"
+            for speaker, texts in self._speaker_turns(transcription_segments)
+        ]
         return "\n\n".join(lines)
 
-    def format_transcript_markdown(self, transcription_segments: List[dict]) -> str:
+    def format_transcript_markdown(self, transcription_segments: Segments) -> str:
         """
         Format transcription with speaker labels using clean markdown.
 
+        Accepts segment dicts or the transcriber's DataFrame.
+
         Returns formatted text with clear speaker differentiation:
         ---
         **Speaker 1**
@@ -114,32 +189,20 @@ class DiarizationResult:
         **Speaker 2**
         I'm doing great, thanks!
         """
-        merged = self.merge_with_transcription(transcription_segments)
-
-        lines = []
-        current_speaker = None
-        current_text = []
-
-        for seg in merged:
-            speaker = seg.get("speaker", "Unknown")
-            text = seg.get("text", seg.get("Segment", ""))
+        lines = [
+            f"---\n**{speaker.replace('SPEAKER_', 'Speaker ')}**\n{' '.join(texts)}"
+            for speaker, texts in self._speaker_turns(transcription_segments)
+        ]
+        return "\n\n".join(lines)
 
-            if speaker != current_speaker:
-                if current_text:
-                    # Format previous speaker's text
-                    speaker_label = current_speaker.replace("SPEAKER_", "Speaker ")
-                    lines.append(f"---\n**{speaker_label}**\n{' '.join(current_text)}")
-                current_speaker = speaker
-                current_text = [text]
-            else:
-                current_text.append(text)
 
-        # Don't forget the last speaker
-        if current_text:
-            speaker_label = current_speaker.replace("SPEAKER_", "Speaker ")
-            lines.append(f"---\n**{speaker_label}**\n{' '.join(current_text)}")
+# Diarization results kept per SpeakerDiarizer for re-runs on the same file
+RESULT_CACHE_SIZE = 8
 
-        return "\n\n".join(lines)
+# Loaded pipelines shared by every SpeakerDiarizer, keyed by (token, device):
+# (pipeline, device used, lock serializing calls into it)
+_PIPELINES = {}
+_PIPELINES_LOCK = threading.Lock()
 
 
 class SpeakerDiarizer:
@@ -174,7 +237,11 @@ class SpeakerDiarizer:
         self.hf_token = hf_token or self._get_token_from_config() or os.environ.get("HUGGINGFACE_TOKEN") or os.environ.get("HF_TOKEN")
         self.device = device
         self.pipeline = None
+        self._pipeline_lock = threading.Lock()
         self._initialized = False
+        # Results for recently diarized files, keyed by file identity and
+        # speaker hints (see _cache_key)
+        self._result_cache = OrderedDict()
 
     @staticmethod
     def _get_token_from_config() -> Optional[str]:
@@ -204,6 +271,17 @@ class SpeakerDiarizer:
                 "Accept model terms at: https://huggingface.co/pyannote/speaker-diarization-3.1"
             )
 
+        # Weights load once per process; later diarizers reuse them
+        key = (self.hf_token, self.device)
+        with _PIPELINES_LOCK:
+            if key not in _PIPELINES:
+                _PIPELINES[key] = self._load_pipeline() + (threading.Lock(),)
+            self.pipeline, self._device_used, self._pipeline_lock = _PIPELINES[key]
+
+        self._initialized = True
+
+    def _load_pipeline(self) -> Tuple[object, str]:
+        """Load the pyannote pipeline and move it to the configured device."""
         try:
             from pyannote.audio import Pipeline
             import torch
@@ -241,7 +319,7 @@ class SpeakerDiarizer:
         # as the parameter name changes between pyannote/huggingface_hub versions
         os.environ["HF_TOKEN"] = self.hf_token
 
-        self.pipeline = Pipeline.from_pretrained(
+        pipeline = Pipeline.from_pretrained(
             "pyannote/speaker-diarization-3.1"
         )
 
@@ -259,14 +337,14 @@ class SpeakerDiarizer:
                 # Use CPU for reliability on Apple Silicon
                 # MPS has known issues with some pyannote operations
                 print("Apple Silicon detected - using CPU for stability")
-                self.pipeline.to(torch.device("cpu"))
-                self._device_used = "cpu"
+                pipeline.to(torch.device("cpu"))
+                device_used = "cpu"
             elif torch.cuda.is_available():
-                self.pipeline.to(torch.device("cuda"))
-                self._device_used = "cuda"
+                pipeline.to(torch.device("cuda"))
+                device_used = "cuda"
             else:
-                self.pipeline.to(torch.device("cpu"))
-                self._device_used = "cpu"
+                pipeline.to(torch.device("cpu"))
+                device_used = "cpu"
         elif self.device == "mps":
             # User explicitly requested MPS
             if torch.backends.mps.is_available():
@@ -274,42 +352,40 @@ class SpeakerDiarizer:
                     "Using MPS (Apple Silicon GPU). "
                     "This is experimental - if you encounter issues, use device='cpu'"
                 )
-                self.pipeline.to(torch.device("mps"))
-                self._device_used = "mps"
+                pipeline.to(torch.device("mps"))
+                device_used = "mps"
             else:
                 print("MPS not available, falling back to CPU")
-                self.pipeline.to(torch.device("cpu"))
-                self._device_used = "cpu"
+                pipeline.to(torch.device("cpu"))
+                device_used = "cpu"
         else:
-            self.pipeline.to(torch.device("cpu"))
-            self._device_used = "cpu"
+            pipeline.to(torch.device("cpu"))
+            device_used = "cpu"
 
-        self._initialized = True
-        print(f"Speaker diarization model loaded (device: {self._device_used})")
+        print(f"Speaker diarization model loaded (device: {device_used})")
+        return pipeline, device_used
 
     def diarize(
         self,
-        audio_path: str,
+        audio_path: Union[str, np.ndarray],
         num_speakers: Optional[int] = None,
         min_speakers: Optional[int] = None,
-        max_speakers: Optional[int] = None
+        max_speakers: Optional[int] = None,
+        sample_rate: int = 16000
     ) -> DiarizationResult:
         """
-        Perform speaker diarization on an audio file.
+        Perform speaker diarization on an audio file or in-memory samples.
 
         Args:
-            audio_path: Path to the audio file
+            audio_path: Path to the audio file, or a mono float32/int16 numpy array
             num_speakers: Exact number of speakers (if known)
             min_speakers: Minimum expected number of speakers
             max_speakers: Maximum expected number of speakers
+            sample_rate: Sample rate of audio_path when it is an array
 
         Returns:
             DiarizationResult with speaker segments
         """
-        self._ensure_initialized()
-
-        print(f"Diarizing audio: {audio_path}")
-
         # Run diarization
         kwargs = {}
         if num_speakers is not None:
@@ -319,7 +395,30 @@ class SpeakerDiarizer:
         if max_speakers is not None:
             kwargs["max_speakers"] = max_speakers
 
-        diarization = self.pipeline(audio_path, **kwargs)
+        cache_key = self._cache_key(audio_path, kwargs)
+        if cache_key is not None and cache_key in self._result_cache:
+            self._result_cache.move_to_end(cache_key)
+            print(f"Reusing diarization for: {audio_path}")
+            return self._result_cache[cache_key]
+
+        self._ensure_initialized()
+
+        if isinstance(audio_path, (str, os.PathLike)):
+            print(f"Diarizing audio: {audio_path}")
+            audio_input = audio_path
+        else:
+            # Hand the samples to pyannote directly instead of re-reading a WAV
+            import torch
+            print(f"Diarizing {len(audio_path) / sample_rate:.1f}s of in-memory audio")
+            samples = audio_path
+            if samples.dtype == np.int16:
+                samples = np.multiply(samples, 1 / 32768, dtype=np.float32)
+            waveform = torch.from_numpy(samples).reshape(1, -1)
+            audio_input = {"waveform": waveform, "sample_rate": sample_rate}
+
+        # A shared pipeline is not safe to run from two threads at once
+        with self._pipeline_lock:
+            diarization = self.pipeline(audio_input, **kwargs)
 
         # Convert to our format
         segments = []
@@ -338,10 +437,35 @@ class SpeakerDiarizer:
 
         print(f"Found {len(speakers)} speakers in {len(segments)} segments")
 
-        return DiarizationResult(
+        result = DiarizationResult(
             segments=segments,
             num_speakers=len(speakers)
         )
+        if cache_key is not None:
+            self._result_cache[cache_key] = result
+            if len(self._result_cache) > RESULT_CACHE_SIZE:
+                self._result_cache.popitem(last=False)
+        return result
+
+    @staticmethod
+    def _cache_key(audio_path, kwargs) -> Optional[tuple]:
+        """
+        Identify a file plus speaker hints for the result cache.
+
+        In-memory audio is never cached: each recording is new. A file is
+        identified by its resolved path, size and modification time, so an
+        edited file is diarized again.
+        """
+        if not isinstance(audio_path, (str, os.PathLike)):
+            return None
+        try:
+            st = os.stat(audio_path)
+        except OSError:
+            return None
+        return (
+            os.path.realpath(audio_path), st.st_size, st.st_mtime_ns,
+            tuple(sorted(kwargs.items()))
+        )
 
     @staticmethod
     def is_available() -> Tuple[bool, str]:
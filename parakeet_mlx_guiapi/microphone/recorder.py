@@ -9,7 +9,8 @@ import tempfile
 import threading
 import numpy as np
 import sounddevice as sd
-from scipy.io import wavfile
+
+from parakeet_mlx_guiapi.audio import AudioProcessor
 
 
 class MicrophoneRecorder:
@@ -40,6 +41,24 @@ class MicrophoneRecorder:
         except Exception as e:
             raise RuntimeError(f"No microphone found: {e}")
 
+    def _save_wav(self, audio_int16) -> str:
+        """
+        Save int16 samples to a temporary WAV file.
+
+        Parameters:
+        - audio_int16: Recorded int16 samples
+
+        Returns:
+        - Path to the WAV file
+        """
+        fd, temp_path = tempfile.mkstemp(suffix='.wav', prefix='parakeet_mic_')
+        try:
+            # Header and samples in one gather write, no bytes copy
+            AudioProcessor.write_wav(fd, audio_int16, self.sample_rate, self.channels)
+        finally:
+            os.close(fd)
+        return temp_path
+
     def record_until_keypress(self) -> str:
         """
         Record audio from the microphone until Enter is pressed.
@@ -67,7 +86,8 @@ class MicrophoneRecorder:
         with sd.InputStream(
             samplerate=self.sample_rate,
             channels=self.channels,
-            dtype=np.float32,
+            # PortAudio scales and clips to int16, so no conversion pass
+            dtype=np.int16,
             callback=callback
         ):
             # Wait for Enter key
@@ -79,25 +99,13 @@ class MicrophoneRecorder:
         if not self._frames:
             raise RuntimeError("No audio recorded")
 
-        # Concatenate all frames
-        audio_data = np.concatenate(self._frames, axis=0)
-
-        # Convert to int16 for WAV file
-        audio_int16 = (audio_data * 32767).astype(np.int16)
-
-        # Save to temporary file
-        temp_file = tempfile.NamedTemporaryFile(
-            suffix='.wav',
-            delete=False,
-            prefix='parakeet_mic_'
-        )
-        temp_path = temp_file.name
-        temp_file.close()
+        # Concatenate all frames (already int16)
+        audio_int16 = np.concatenate(self._frames, axis=0)
+        self._frames = []
 
-        # Write WAV file
-        wavfile.write(temp_path, self.sample_rate, audio_int16)
+        temp_path = self._save_wav(audio_int16)
 
-        duration = len(audio_data) / self.sample_rate
+        duration = len(audio_int16) / self.sample_rate
         print(f"Recorded {duration:.2f} seconds of audio")
         print(f"Saved to: {temp_path}")
 
@@ -120,30 +128,17 @@ class MicrophoneRecorder:
         print(f"Recording for {duration_seconds} seconds...")
 
         # Record audio
-        audio_data = sd.rec(
+        audio_int16 = sd.rec(
             int(duration_seconds * self.sample_rate),
             samplerate=self.sample_rate,
             channels=self.channels,
-            dtype=np.float32
+            dtype=np.int16
         )
         sd.wait()
 
         print("Recording stopped.")
 
-        # Convert to int16 for WAV file
-        audio_int16 = (audio_data * 32767).astype(np.int16)
-
-        # Save to temporary file
-        temp_file = tempfile.NamedTemporaryFile(
-            suffix='.wav',
-            delete=False,
-            prefix='parakeet_mic_'
-        )
-        temp_path = temp_file.name
-        temp_file.close()
-
-        # Write WAV file
-        wavfile.write(temp_path, self.sample_rate, audio_int16)
+        temp_path = self._save_wav(audio_int16)
 
         print(f"Recorded {duration_seconds:.2f} seconds of audio")
         print(f"Saved to: {temp_path}")
@@ -102,8 +102,10 @@ class ParakeetProvider(STTProvider):
         # Get chunk_duration from kwargs or use default
         chunk_duration = kwargs.get("chunk_duration", 30)
 
-        # Run transcription
-        df, full_text = self.transcriber.transcribe(
+        # Run transcription on the server's shared model; this waits while
+        # an API request or queued job is using it
+        from parakeet_mlx_guiapi.api.routes import transcribe_shared
+        df, full_text = transcribe_shared(
             audio_path,
             chunk_duration=chunk_duration
         )
@@ -9,7 +9,6 @@ import numpy as np
 import pandas as pd
 from pathlib import Path
 import tempfile
-import io
 import logging
 import traceback
 
@@ -19,14 +18,17 @@ logger = logging.getLogger("parakeet")
 # Import the parakeet_mlx library (installed via pip)
 from parakeet_mlx import from_pretrained
 
+from parakeet_mlx_guiapi.audio import AudioProcessor
+
 
 class AudioTranscriber:
-    def __init__(self, model_name="mlx-community/parakeet-tdt-0.6b-v3"):
+    def __init__(self, model_name="mlx-community/parakeet-tdt-0.6b-v3", local_files_only=False):
         """
         Initialize the transcriber with the specified model.
 
         Parameters:
         - model_name: HuggingFace model path for the ASR model
+        - local_files_only: Load from the local HF cache without contacting the Hub
         """
         logger.info(f"AudioTranscriber.__init__ called with model: {model_name}")
         print(f"Loading model: {model_name}...")
@@ -34,8 +36,11 @@ class AudioTranscriber:
         self.model_name = model_name  # Store for later reference
 
         try:
+            model_path = model_name
+            if local_files_only:
+                model_path = self._resolve_local_snapshot(model_name)
             logger.info("Calling parakeet_mlx.from_pretrained()...")
-            self.model = from_pretrained(model_name)
+            self.model = from_pretrained(model_path)
             logger.info("from_pretrained() returned successfully")
             print("Model loaded successfully")
         except Exception as e:
@@ -43,6 +48,26 @@ class AudioTranscriber:
             logger.error(f"Traceback:\n{traceback.format_exc()}")
             raise
 
+    @staticmethod
+    def _resolve_local_snapshot(model_name):
+        """
+        Find the cached snapshot directory for a model without network access.
+
+        Parameters:
+        - model_name: HuggingFace model ID
+
+        Returns:
+        - Local snapshot path, or model_name if it isn't fully cached
+        """
+        try:
+            from huggingface_hub import snapshot_download
+            path = snapshot_download(model_name, local_files_only=True)
+            logger.info(f"Using cached snapshot: {path}")
+            return path
+        except Exception as e:
+            logger.info(f"No complete local snapshot for {model_name} ({e}), using Hub")
+            return model_name
+
     def preprocess_audio(self, audio_path):
         """
         Preprocess audio - convert to mono and resample if needed.
@@ -53,6 +78,26 @@ class AudioTranscriber:
         Returns:
         - Processed audio path and duration in seconds
         """
+        target_sr = 16000
+
+        # Fast path: a file that is already 16 kHz mono (e.g. our own
+        # recordings) is used as-is; only its header is read. Other formats
+        # libsndfile reads are converted without pydub
+        try:
+            import soundfile as sf
+            info = sf.info(str(audio_path))
+            duration_sec = info.frames / info.samplerate
+            if info.samplerate == target_sr and info.channels == 1:
+                print(f"Audio duration: {duration_sec:.2f} seconds (no preprocessing needed)")
+                return audio_path, duration_sec
+            print(f"Audio duration: {duration_sec:.2f} seconds")
+            print(f"Converting {info.samplerate}Hz/{info.channels}ch audio to {target_sr}Hz mono")
+            processed_path = os.path.join(tempfile.gettempdir(), f"{Path(audio_path).stem}_processed.wav")
+            AudioProcessor.to_mono_wav(audio_path, processed_path, target_sr)
+            return processed_path, duration_sec
+        except Exception:
+            pass  # Not readable by libsndfile (mp3/m4a/...), decode below
+
         from pydub import AudioSegment
         
         print(f"Loading audio: {Path(audio_path).name}")
@@ -68,7 +113,6 @@ class AudioTranscriber:
         processed_path = audio_path
 
         # Resample if needed (Parakeet expects 16kHz)
-        target_sr = 16000
         if audio.frame_rate != target_sr:
             print(f"Resampling audio from {audio.frame_rate}Hz to {target_sr}Hz")
             audio = audio.set_frame_rate(target_sr)
@@ -120,27 +164,7 @@ class AudioTranscriber:
                 overlap_duration=overlap_duration
             )
             
-            # Extract sentences and tokens
-            sentences = result.sentences
-            
-            # Create DataFrame
-            data = {
-                "Start (s)": [round(sentence.start, 2) for sentence in sentences],
-                "End (s)": [round(sentence.end, 2) for sentence in sentences],
-                "Segment": [sentence.text for sentence in sentences],
-                "Duration": [round(sentence.duration, 2) for sentence in sentences],
-                "Tokens": [sentence.tokens for sentence in sentences]
-            }
-            
-            df = pd.DataFrame(data)
-            
-            # Save to CSV if requested
-            if output_csv:
-                df.to_csv(output_csv, index=False)
-                print(f"Transcription saved to: {output_csv}")
-            
-            # Return the DataFrame and full text
-            return df, result.text
+            return self._result_frame(result, output_csv)
             
         except Exception as e:
             logger.error(f"Error during transcription: {e}")
@@ -154,38 +178,106 @@ class AudioTranscriber:
                 Path(processed_path).unlink()
                 print(f"Removed temporary file: {processed_path}")
 
-    def get_segment_audio(self, audio_path, start_time, end_time):
+    def transcribe_array(self, samples, sample_rate=16000, chunk_duration=120, overlap_duration=15, output_csv=None):
         """
-        Get a specific segment of audio as bytes
+        Transcribe in-memory mono samples without writing them to disk.
 
         Parameters:
-        - audio_path: Path to the audio file
-        - start_time: Start time in seconds
-        - end_time: End time in seconds
+        - samples: 1-D int16 or float32 numpy array
+        - sample_rate: Sample rate of samples in Hz
+        - chunk_duration: Duration of each chunk in seconds (0 to disable)
+        - overlap_duration: Overlap duration in seconds
+        - output_csv: Optional path to save CSV output
 
         Returns:
-        - Audio segment as bytes
+        - DataFrame with transcription results and the full text
         """
+        target_sr = 16000
+        duration_sec = len(samples) / sample_rate
+        chunked = chunk_duration > 0 and duration_sec > chunk_duration
+
+        if sample_rate != target_sr or chunked:
+            # Resampling and chunk merging live in the file-based path
+            fd, temp_path = tempfile.mkstemp(suffix=".wav", prefix="parakeet_array_")
+            try:
+                try:
+                    AudioProcessor.write_wav(fd, samples, sample_rate)
+                finally:
+                    os.close(fd)
+                return self.transcribe(
+                    temp_path,
+                    chunk_duration=chunk_duration,
+                    overlap_duration=overlap_duration,
+                    output_csv=output_csv
+                )
+            finally:
+                os.remove(temp_path)
+
         try:
-            from pydub import AudioSegment
-            
-            # Convert times to milliseconds
-            start_ms = int(start_time * 1000)
-            end_ms = int(end_time * 1000)
+            import mlx.core as mx
+            from parakeet_mlx.audio import get_logmel
 
-            # Load audio
-            audio = AudioSegment.from_file(audio_path)
+            if samples.dtype == np.int16:
+                samples = samples.astype(np.float32) * (1.0 / 32768.0)
 
-            # Cut segment
-            segment = audio[start_ms:end_ms]
+            print(f"Transcribing {duration_sec:.2f} seconds of audio...")
+            # Same steps as model.transcribe() after it loads a file
+            audio = mx.array(samples).astype(mx.bfloat16)
+            mel = get_logmel(audio, self.model.preprocessor_config)
+            result = self.model.generate(mel)[0]
 
-            # Export to bytes
-            buffer = io.BytesIO()
-            segment.export(buffer, format="wav")
-            buffer.seek(0)
-            
-            return buffer.read()
+            return self._result_frame(result, output_csv)
 
         except Exception as e:
-            print(f"Error getting segment audio: {e}")
-            return None
+            logger.error(f"Error during transcription: {e}")
+            logger.error(f"Traceback:\n{traceback.format_exc()}")
+            print(f"Error during transcription: {e}")
+            raise
+
+    @staticmethod
+    def _result_frame(result, output_csv=None):
+        """
+        Build the sentence DataFrame for a parakeet result.
+
+        Parameters:
+        - result: AlignedResult from the model
+        - output_csv: Optional path to save CSV output
+
+        Returns:
+        - DataFrame with transcription results and the full text
+        """
+        # Extract sentences and tokens
+        sentences = result.sentences
+
+        # Create DataFrame
+        data = {
+            "Start (s)": [round(sentence.start, 2) for sentence in sentences],
+            "End (s)": [round(sentence.end, 2) for sentence in sentences],
+            "Segment": [sentence.text for sentence in sentences],
+            "Duration": [round(sentence.duration, 2) for sentence in sentences],
+            "Tokens": [sentence.tokens for sentence in sentences]
+        }
+
+        df = pd.DataFrame(data)
+
+        # Save to CSV if requested
+        if output_csv:
+            df.to_csv(output_csv, index=False)
+            print(f"Transcription saved to: {output_csv}")
+
+        # Return the DataFrame and full text
+        return df, result.text
+
+    def get_segment_audio(self, audio_path, start_time, end_time):
+        """
+        Get a specific segment of audio as bytes
+
+        Parameters:
+        - audio_path: Path to the audio file
+        - start_time: Start time in seconds
+        - end_time: End time in seconds
+
+        Returns:
+        - Audio segment as bytes
+        """
+        return AudioProcessor.get_audio_segment(audio_path, start_time, end_time)
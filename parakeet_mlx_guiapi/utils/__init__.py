@@ -5,6 +5,13 @@ This module provides utility functions for the Parakeet-MLX GUI and API.
 """
 
 from .config import get_config
-from .visualization import visualize_transcript
 
 __all__ = ['get_config', 'visualize_transcript']
+
+
+def __getattr__(name):
+    # visualization pulls in matplotlib; load it only when asked for
+    if name == 'visualize_transcript':
+        from .visualization import visualize_transcript
+        return visualize_transcript
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -6,9 +6,10 @@ This module provides functions for managing configuration.
 
 import os
 import tempfile
-import json
 from pathlib import Path
 
+from .jsonio import loads, write_json_atomic
+
 # Default configuration
 DEFAULT_CONFIG = {
     "model_name": "mlx-community/parakeet-tdt-0.6b-v3",
@@ -17,7 +18,8 @@ DEFAULT_CONFIG = {
     "default_chunk_duration": 120,
     "default_overlap_duration": 15,
     "max_upload_size_mb": 100,
-    "supported_formats": [".mp3", ".wav", ".m4a", ".flac", ".ogg"],
+    "max_pending_jobs": 8,
+    "supported_formats": [".mp3", ".wav", ".m4a", ".flac", ".ogg", ".webm"],
     "debug": False
 }
 
@@ -60,8 +62,8 @@ def get_config():
         config_path = Path.home() / ".parakeet_mlx_guiapi.json"
         if config_path.exists():
             try:
-                with open(config_path, "r") as f:
-                    file_config = json.load(f)
+                with open(config_path, "rb") as f:
+                    file_config = loads(f.read())
                     _config.update(file_config)
             except Exception as e:
                 print(f"Error loading config file: {e}")
@@ -83,8 +85,8 @@ def save_config(config):
     # Save to config file
     config_path = Path.home() / ".parakeet_mlx_guiapi.json"
     try:
-        with open(config_path, "w") as f:
-            json.dump(config, f, indent=2)
+        # Serialize a snapshot so callers on other threads can keep editing
+        write_json_atomic(config_path, dict(config), indent=True)
     except Exception as e:
         print(f"Error saving config file: {e}")
 
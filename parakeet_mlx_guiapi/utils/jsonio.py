@@ -0,0 +1,194 @@
+"""
+JSON file helpers for Parakeet-MLX GUI and API.
+
+Uses orjson when it is installed and falls back to the standard json module.
+Files are written atomically (unbuffered write + data sync to a temp file,
+then os.replace) so a crash mid-write never leaves a truncated config or
+history file behind. Append-only JSON Lines files are supported for logs
+that grow one record at a time.
+"""
+
+import os
+import json
+import math
+import tempfile
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# fdatasync skips the metadata flush; macOS only has fsync
+_datasync = getattr(os, "fdatasync", os.fsync)
+
+
+def loads(data):
+    """
+    Parse JSON from bytes or str.
+
+    Parameters:
+    - data: JSON document as bytes or str
+
+    Returns:
+    - Parsed Python object
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def dumps(obj, indent=False, sort_keys=False, default=None):
+    """
+    Serialize an object to JSON bytes.
+
+    Output is the same with or without orjson: compact separators, NaN
+    and infinities written as null, non-string keys converted to strings.
+
+    Parameters:
+    - obj: Object to serialize
+    - indent: Pretty-print with two-space indentation
+    - sort_keys: Sort object keys
+    - default: Called for objects neither encoder supports natively;
+      returns a serializable replacement or raises TypeError
+
+    Returns:
+    - UTF-8 encoded JSON bytes
+    """
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        if sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        return orjson.dumps(obj, default=default, option=option)
+    return json.dumps(
+        _like_orjson(obj),
+        indent=2 if indent else None,
+        separators=None if indent else (",", ":"),
+        sort_keys=sort_keys,
+        default=default,
+        ensure_ascii=False,
+    ).encode("utf-8")
+
+
+def _like_orjson(obj):
+    """
+    Prepare an object for the stdlib encoder so it matches orjson's output.
+
+    Non-finite floats become None and non-string keys are stringified up
+    front (which also lets sort_keys order mixed key types).
+    """
+    if isinstance(obj, float):
+        return obj if math.isfinite(obj) else None
+    if isinstance(obj, dict):
+        return {
+            k if isinstance(k, str) else json.dumps(k): _like_orjson(v)
+            for k, v in obj.items()
+        }
+    if isinstance(obj, (list, tuple)):
+        return [_like_orjson(v) for v in obj]
+    return obj
+
+
+def read_json(path, default=None):
+    """
+    Read a JSON file.
+
+    Parameters:
+    - path: File path
+    - default: Value returned if the file is missing or unreadable
+
+    Returns:
+    - Parsed Python object, or default
+    """
+    try:
+        with open(path, "rb") as f:
+            return loads(f.read())
+    except (OSError, ValueError):
+        return default
+
+
+def read_jsonl(path):
+    """
+    Read a JSON Lines file.
+
+    Parameters:
+    - path: File path
+
+    Returns:
+    - List of parsed records in file order; empty if the file is missing.
+      Unparsable lines (e.g. a torn final append) are skipped.
+    """
+    records = []
+    try:
+        with open(path, "rb") as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                try:
+                    records.append(loads(line))
+                except ValueError:
+                    continue
+    except OSError:
+        pass
+    return records
+
+
+def append_jsonl(path, obj):
+    """
+    Append one record to a JSON Lines file with a single write.
+
+    Parameters:
+    - path: File path (created if missing)
+    - obj: Object to serialize
+    """
+    data = dumps(obj) + b"\n"
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+    try:
+        os.write(fd, data)
+    finally:
+        os.close(fd)
+
+
+def write_jsonl_atomic(path, records):
+    """
+    Replace a JSON Lines file atomically.
+
+    Parameters:
+    - path: Destination file path
+    - records: Iterable of objects, one per line
+    """
+    _write_bytes_atomic(path, b"".join(dumps(r) + b"\n" for r in records))
+
+
+def write_json_atomic(path, obj, indent=False):
+    """
+    Write an object as JSON, replacing the file atomically.
+
+    Parameters:
+    - path: Destination file path
+    - obj: Object to serialize
+    - indent: Pretty-print with two-space indentation
+    """
+    _write_bytes_atomic(path, dumps(obj, indent=indent))
+
+
+def _write_bytes_atomic(path, data):
+    """Write bytes to a temp file in the same directory, sync, and rename over path."""
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".tmp-", suffix=".json")
+    try:
+        try:
+            view = memoryview(data)
+            while view:
+                view = view[os.write(fd, view):]
+            _datasync(fd)
+        finally:
+            os.close(fd)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
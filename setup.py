@@ -21,13 +21,18 @@ setup(
     long_description_content_type="text/markdown",
     url="https://github.com/yourusername/parakeet-mlx_guiapi",
     packages=find_packages(),
+    package_data={"parakeet_mlx_guiapi.data": ["models.json", "download_model.sh"]},
     classifiers=[
         "Programming Language :: Python :: 3",
         "License :: OSI Approved :: Apache Software License",
         "Operating System :: MacOS :: MacOS X",
     ],
-    python_requires=">=3.8",
+    python_requires=">=3.10",
     install_requires=requirements,
+    extras_require={
+        # Faster JSON for config/history files and API responses
+        "fast": ["orjson>=3.9"],
+    },
     entry_points={
         "console_scripts": [
             "parakeet-server=run:main",
@@ -0,0 +1,394 @@
+"""
+Unit tests for the API upload handling.
+
+Run with: pytest tests/test_api_routes.py -v
+"""
+
+import io
+import os
+import pytest
+from unittest.mock import MagicMock, patch
+
+from parakeet_mlx_guiapi.utils.config import DEFAULT_CONFIG
+
+
+@pytest.fixture
+def routes():
+    try:
+        from parakeet_mlx_guiapi.api import routes
+    except (ImportError, ModuleNotFoundError) as e:
+        pytest.skip(f"API dependencies not available: {e}")
+    return routes
+
+
+class TestUploadSpooling:
+    """Tests for spooling uploads into the upload folder."""
+
+    def test_upload_is_linked_not_copied(self, routes, tmp_path):
+        """Test that an upload is spooled in the upload folder and linked into place."""
+        from flask import Flask, request
+
+        app = Flask(__name__)
+        app.request_class = routes.UploadRequest
+        saved = {}
+
+        @app.route('/upload', methods=['POST'])
+        def upload():
+            file = request.files['file']
+            saved["spool"] = file.stream.name
+            dest = tmp_path / "dest.wav"
+            with patch.object(file, "save") as save:
+                routes.save_upload(file, str(dest))
+            save.assert_not_called()
+            saved["data"] = dest.read_bytes()
+            return "ok"
+
+        payload = os.urandom(600 * 1024)
+        config = {**DEFAULT_CONFIG, "upload_folder": str(tmp_path)}
+        with patch.object(routes, "get_config", return_value=config):
+            response = app.test_client().post(
+                '/upload',
+                data={"file": (io.BytesIO(payload), "speech.wav")},
+                content_type="multipart/form-data"
+            )
+
+        assert response.status_code == 200
+        assert os.path.dirname(saved["spool"]) == str(tmp_path)
+        assert saved["data"] == payload
+        # The spooled name is removed when the request closes its files
+        assert os.listdir(tmp_path) == ["dest.wav"]
+
+    def test_copy_fallback_appears_complete(self, routes, tmp_path):
+        """Test that an unlinkable upload is copied under a temp name, then renamed."""
+        from werkzeug.datastructures import FileStorage
+
+        file = FileStorage(io.BytesIO(b"RIFF" * 10), filename="../My Talk.WAV")
+        with patch.object(routes, "get_config", return_value={"upload_folder": str(tmp_path)}):
+            dest = routes.upload_path(file, "abc")
+        assert dest == str(tmp_path / "abc.wav")
+
+        routes.save_upload(file, dest)
+        assert os.listdir(tmp_path) == ["abc.wav"]
+        assert (tmp_path / "abc.wav").read_bytes() == b"RIFF" * 10
+
+
+class TestSubtitleFormats:
+    """Tests for SRT and VTT output."""
+
+    def test_srt_and_vtt(self, routes):
+        """Test that cues are numbered and timed correctly."""
+        import pandas as pd
+
+        df = pd.DataFrame({
+            "Start (s)": [0.0, 3661.5],
+            "End (s)": [1.25, 3662.0],
+            "Segment": ["Hello.", "World."],
+        })
+
+        assert routes.format_srt(df) == (
+            "1\n00:00:00,000 --> 00:00:01,250\nHello.\n\n"
+            "2\n01:01:01,500 --> 01:01:02,000\nWorld.\n\n"
+        )
+        assert routes.format_vtt(df) == (
+            "WEBVTT\n\n"
+            "00:00:00.000 --> 00:00:01.250\nHello.\n\n"
+            "01:01:01.500 --> 01:01:02.000\nWorld.\n\n"
+        )
+
+    def test_timestamps_round_to_milliseconds(self, routes):
+        """Test that float remainders don't drop a millisecond."""
+        assert routes.format_time_srt(1.13) == "00:00:01,130"
+        assert routes.format_time_vtt(59.9996) == "00:01:00.000"
+        assert routes.format_time_srt(36000.25) == "10:00:00,250"
+
+
+class TestSendAttachment:
+    """Tests for sending generated output as a download."""
+
+    def test_attachment_from_memory(self, routes):
+        """Test that bytes are sent with a download name and no temp file."""
+        from flask import Flask
+
+        app = Flask(__name__)
+        with app.test_request_context():
+            response = routes.send_attachment(b"a,b\n1,2\n", "talk.csv", "text/csv")
+            response.direct_passthrough = False
+
+            assert response.get_data() == b"a,b\n1,2\n"
+            assert response.mimetype == "text/csv"
+            assert 'filename=talk.csv' in response.headers["Content-Disposition"]
+
+
+class TestJsonProvider:
+    """Tests for rendering JSON responses with jsonio."""
+
+    def test_jsonify_uses_jsonio(self, routes):
+        """Test that responses round-trip and unusual types fall back to Flask."""
+        from decimal import Decimal
+        from flask import Flask, jsonify
+
+        app = Flask(__name__)
+        app.json = routes.JsonioProvider(app)
+        with app.app_context():
+            data = {"segments": [{"Segment": "héllo", "Start (s)": 0.5}], "heatmap": "iVBOR"}
+            response = jsonify(data)
+            assert response.mimetype == "application/json"
+            assert response.get_json() == data
+
+            assert jsonify({"n": Decimal("1.5")}).get_json() == {"n": "1.5"}
+
+            # Keys are sorted and NaN is valid JSON, whichever encoder runs
+            body = jsonify({"b": float("nan"), "a": 1}).get_data()
+            assert body.strip() == b'{"a":1,"b":null}'
+
+
+class TestTranscriptionJobs:
+    """Tests for queued background transcriptions."""
+
+    def _app(self, routes):
+        from flask import Flask
+
+        app = Flask(__name__)
+        routes.setup_api_routes(app)
+        return app.test_client()
+
+    def test_job_runs_and_reports_result(self, routes, tmp_path):
+        """Test that a queued job is transcribed and its result polled."""
+        import time
+        import pandas as pd
+
+        transcriber = MagicMock()
+        transcriber.transcribe.return_value = (
+            pd.DataFrame({"Start (s)": [0.0], "End (s)": [1.0], "Segment": ["Hi."]}),
+            "Hi."
+        )
+        config = {**DEFAULT_CONFIG, "upload_folder": str(tmp_path), "max_pending_jobs": 8}
+        with patch.object(routes, "get_config", return_value=config), \
+                patch.object(routes, "get_transcriber", return_value=transcriber):
+            client = self._app(routes)
+            response = client.post(
+                '/api/transcriptions',
+                data={"file": (io.BytesIO(b"RIFF"), "talk.wav")},
+                content_type="multipart/form-data"
+            )
+            assert response.status_code == 202
+            job_id = response.get_json()["id"]
+
+            for _ in range(100):
+                job = client.get(f'/api/transcriptions/{job_id}').get_json()
+                if job["status"] == "done":
+                    break
+                time.sleep(0.01)
+
+        assert job["text"] == "Hi."
+        assert job["segments"][0]["Segment"] == "Hi."
+        # The upload is removed once transcribed
+        assert os.listdir(tmp_path) == []
+
+    def test_full_queue_is_rejected(self, routes, tmp_path):
+        """Test that submissions past max_pending_jobs get 429."""
+        config = {**DEFAULT_CONFIG, "upload_folder": str(tmp_path), "max_pending_jobs": 0}
+        with patch.object(routes, "get_config", return_value=config):
+            response = self._app(routes).post(
+                '/api/transcriptions',
+                data={"file": (io.BytesIO(b"RIFF"), "talk.wav")},
+                content_type="multipart/form-data"
+            )
+
+        assert response.status_code == 429
+
+    def test_busy_model_refuses_sync_transcribe(self, routes, tmp_path):
+        """Test that /api/transcribe gets 429, without spooling, while the model is busy."""
+        import tempfile
+
+        transcriber = MagicMock()
+        transcriber.transcribe.return_value = (None, None)
+        config = {**DEFAULT_CONFIG, "upload_folder": str(tmp_path)}
+
+        def post(client):
+            return client.post(
+                '/api/transcribe',
+                data={"file": (io.BytesIO(b"RIFF"), "talk.wav")},
+                content_type="multipart/form-data"
+            )
+
+        with patch.object(routes, "get_config", return_value=config), \
+                patch.object(routes, "get_transcriber", return_value=transcriber):
+            client = self._app(routes)
+            with routes._model_lock, \
+                    patch.object(routes.tempfile, "NamedTemporaryFile", wraps=tempfile.NamedTemporaryFile) as spool:
+                response = post(client)
+            spool.assert_not_called()
+            transcriber.transcribe.assert_not_called()
+
+            assert response.status_code == 429
+            assert response.headers["Retry-After"] == str(routes.RETRY_AFTER_SECONDS)
+            # The model is free again once the lock is released
+            assert post(client).status_code == 500
+
+    def test_job_waits_for_the_model(self, routes, tmp_path):
+        """Test that a job doesn't transcribe while a synchronous request holds the model."""
+        import threading
+
+        transcriber = MagicMock()
+        transcriber.transcribe.side_effect = RuntimeError("no audio")
+        path = tmp_path / "talk.wav"
+        path.write_bytes(b"RIFF")
+        routes._jobs["waiting"] = {"status": "queued"}
+        try:
+            with patch.object(routes, "get_transcriber", return_value=transcriber):
+                with routes._model_lock:
+                    job = threading.Thread(target=routes._run_job, args=("waiting", str(path), 0, 0))
+                    job.start()
+                    job.join(0.1)
+                    assert job.is_alive()
+                    transcriber.transcribe.assert_not_called()
+                job.join(5)
+
+            transcriber.transcribe.assert_called_once()
+            assert routes._jobs["waiting"]["status"] == "error"
+        finally:
+            routes._jobs.pop("waiting", None)
+
+    def test_provider_waits_for_running_job(self, routes, tmp_path):
+        """Test that a live-session provider call doesn't run the model alongside a job."""
+        import threading
+        import pandas as pd
+        from parakeet_mlx_guiapi.providers.parakeet import ParakeetProvider
+
+        job_running, finish_job = threading.Event(), threading.Event()
+        calls = []
+
+        def transcribe(path, **kwargs):
+            calls.append(path)
+            if path.endswith("job.wav"):
+                job_running.set()
+                finish_job.wait(5)
+            return pd.DataFrame({"Start (s)": [0.0], "End (s)": [1.0], "Segment": ["Hi."]}), "Hi."
+
+        transcriber = MagicMock()
+        transcriber.transcribe.side_effect = transcribe
+        job_path = tmp_path / "job.wav"
+        job_path.write_bytes(b"RIFF")
+        routes._jobs["busy"] = {"status": "queued"}
+        try:
+            with patch.object(routes, "get_transcriber", return_value=transcriber):
+                job = threading.Thread(target=routes._run_job, args=("busy", str(job_path), 0, 0))
+                job.start()
+                assert job_running.wait(5)
+
+                provider = ParakeetProvider()
+                live = threading.Thread(
+                    target=provider.transcribe, args=("chunk.wav",), kwargs={"enable_diarization": False}
+                )
+                live.start()
+                live.join(0.1)
+                assert live.is_alive()
+                assert calls == [str(job_path)]
+
+                finish_job.set()
+                job.join(5)
+                live.join(5)
+
+            assert calls == [str(job_path), "chunk.wav"]
+        finally:
+            finish_job.set()
+            routes._jobs.pop("busy", None)
+
+    def test_unknown_job_is_404(self, routes):
+        """Test that polling an unknown id returns 404."""
+        assert self._app(routes).get('/api/transcriptions/missing').status_code == 404
+
+
+class TestUploadValidation:
+    """Tests for rejecting uploads before they are processed."""
+
+    def _post(self, routes, tmp_path, filename, size=4):
+        from flask import Flask
+
+        app = Flask(__name__)
+        config = {**DEFAULT_CONFIG, "upload_folder": str(tmp_path), "max_upload_size_mb": 1}
+        with patch.object(routes, "get_config", return_value=config):
+            routes.setup_api_routes(app)
+            return app.test_client().post(
+                '/api/transcriptions',
+                data={"file": (io.BytesIO(b"x" * size), filename)},
+                content_type="multipart/form-data"
+            )
+
+    def test_unsupported_extension_is_400(self, routes, tmp_path):
+        """Test that a file type we can't decode is refused."""
+        import tempfile
+
+        with patch.object(routes.tempfile, "NamedTemporaryFile", wraps=tempfile.NamedTemporaryFile) as spool:
+            response = self._post(routes, tmp_path, "notes.txt", size=512 * 1024)
+        assert response.status_code == 400
+        assert "Unsupported" in response.get_json()["error"]
+        # Refused while parsing, before the part is spooled to disk
+        spool.assert_not_called()
+        assert os.listdir(tmp_path) == []
+
+    def test_webm_is_accepted(self, routes, tmp_path):
+        """Test that a browser MediaRecorder .webm upload is queued, not refused."""
+        with patch.object(routes, "_job_executor") as executor:
+            response = self._post(routes, tmp_path, "recording.webm")
+        assert response.status_code == 202
+        executor.submit.assert_called_once()
+        routes._jobs.pop(response.get_json()["id"], None)
+
+    def test_oversized_body_is_413(self, routes, tmp_path):
+        """Test that a body over max_upload_size_mb is refused."""
+        response = self._post(routes, tmp_path, "talk.wav", size=2 * 1024 * 1024)
+        assert response.status_code == 413
+        assert "too large" in response.get_json()["error"]
+        assert os.listdir(tmp_path) == []
+
+
+class TestLazyImports:
+    """Tests for keeping heavy libraries out of server startup."""
+
+    def test_routes_import_is_light(self, routes):
+        """Test that importing the routes loads neither the model stack nor matplotlib."""
+        import subprocess
+        import sys
+
+        code = (
+            "import sys, parakeet_mlx_guiapi.api.routes; "
+            "print([m for m in ('mlx', 'parakeet_mlx', 'torch', 'matplotlib') if m in sys.modules])"
+        )
+        out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+        assert out.stdout.strip() == "[]"
+
+
+class TestGetTranscriber:
+    """Tests for the shared transcriber instance."""
+
+    def test_concurrent_first_calls_load_once(self, routes):
+        """Test that threads racing on the first call share one model load."""
+        import sys
+        import threading
+        import time
+        import types
+
+        loads = []
+
+        def load(model_name):
+            loads.append(model_name)
+            time.sleep(0.05)
+            return MagicMock()
+
+        fake = types.ModuleType("parakeet_mlx_guiapi.transcription.transcriber")
+        fake.AudioTranscriber = load
+        results = []
+        with patch.dict(sys.modules, {fake.__name__: fake}), \
+                patch.object(routes, "_transcriber", None), \
+                patch.object(routes, "get_config", return_value=DEFAULT_CONFIG):
+            threads = [threading.Thread(target=lambda: results.append(routes.get_transcriber()))
+                       for _ in range(4)]
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+
+        assert len(loads) == 1
+        assert all(r is results[0] for r in results)
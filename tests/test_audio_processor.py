@@ -0,0 +1,189 @@
+"""
+Unit tests for the audio processor helpers.
+
+Run with: pytest tests/test_audio_processor.py -v
+"""
+
+import os
+import subprocess
+import pytest
+import numpy as np
+from unittest.mock import patch, MagicMock
+
+from parakeet_mlx_guiapi.audio import AudioProcessor
+
+
+class TestGetAudioDuration:
+    """Tests for AudioProcessor.get_audio_duration."""
+
+    def test_wav_duration_from_header(self, tmp_path):
+        """Test that a WAV file's duration is read from its header."""
+        pytest.importorskip("soundfile")
+        from scipy.io import wavfile
+
+        path = tmp_path / "tone.wav"
+        wavfile.write(path, 16000, np.zeros(24000, dtype=np.int16))
+
+        assert AudioProcessor.get_audio_duration(path) == pytest.approx(1.5)
+
+    def test_falls_back_to_ffprobe(self, tmp_path):
+        """Test that ffprobe is used when soundfile can't open the file."""
+        path = tmp_path / "clip.m4a"
+        path.write_bytes(b"not audio")
+        probe = MagicMock(stdout="12.345\n")
+
+        with patch("parakeet_mlx_guiapi.audio.processor.subprocess.run", return_value=probe) as run:
+            assert AudioProcessor.get_audio_duration(path) == pytest.approx(12.345)
+
+        assert run.call_args.args[0][0] == "ffprobe"
+        assert run.call_args.args[0][-1] == str(path)
+
+    def test_unreadable_file_returns_zero(self, tmp_path):
+        """Test that a file neither backend can read reports zero duration."""
+        path = tmp_path / "broken.bin"
+        path.write_bytes(b"")
+        error = subprocess.CalledProcessError(1, "ffprobe")
+
+        with patch("parakeet_mlx_guiapi.audio.processor.subprocess.run", side_effect=error):
+            assert AudioProcessor.get_audio_duration(path) == 0
+
+
+class TestWriteWav:
+    """Tests for AudioProcessor.write_wav."""
+
+    def test_roundtrip_with_scipy(self, tmp_path):
+        """Test that scipy reads back the same rate and samples."""
+        from scipy.io import wavfile
+
+        samples = (np.sin(np.linspace(0, 20, 1600)) * 32767).astype(np.int16)
+        path = tmp_path / "out.wav"
+        AudioProcessor.write_wav(path, samples, 16000)
+
+        rate, data = wavfile.read(path)
+        assert rate == 16000
+        assert data.dtype == np.int16
+        np.testing.assert_array_equal(data, samples)
+
+    def test_matches_scipy_bytes(self, tmp_path):
+        """Test that the output is byte-identical to scipy.io.wavfile."""
+        from scipy.io import wavfile
+
+        samples = np.arange(-500, 500, dtype=np.int16)
+        ours = tmp_path / "ours.wav"
+        theirs = tmp_path / "theirs.wav"
+        AudioProcessor.write_wav(ours, samples, 16000)
+        wavfile.write(theirs, 16000, samples)
+
+        assert ours.read_bytes() == theirs.read_bytes()
+
+    def test_writes_to_open_file(self, tmp_path):
+        """Test writing to an already open binary file object."""
+        samples = np.zeros(10, dtype=np.int16)
+        path = tmp_path / "open.wav"
+        with open(path, "wb") as f:
+            AudioProcessor.write_wav(f, samples, 8000)
+
+        data = path.read_bytes()
+        assert data[:4] == b"RIFF"
+        assert len(data) == 44 + samples.nbytes
+
+    def test_writes_to_raw_descriptor(self, tmp_path):
+        """Test the gather-write path used for raw file descriptors."""
+        samples = np.arange(-1000, 1000, dtype=np.int16)
+        ours = tmp_path / "fd.wav"
+        theirs = tmp_path / "path.wav"
+        fd = os.open(ours, os.O_WRONLY | os.O_CREAT)
+        try:
+            AudioProcessor.write_wav(fd, samples, 16000)
+        finally:
+            os.close(fd)
+        AudioProcessor.write_wav(theirs, samples, 16000)
+
+        assert ours.read_bytes() == theirs.read_bytes()
+
+
+class TestGetAudioSegment:
+    """Tests for AudioProcessor.get_audio_segment."""
+
+    def test_wav_segment_skips_pydub(self, tmp_path):
+        """Test that a WAV segment is cut without a full pydub decode."""
+        pytest.importorskip("soundfile")
+        from scipy.io import wavfile
+
+        path = tmp_path / "ramp.wav"
+        samples = np.arange(32000, dtype=np.int16)
+        wavfile.write(path, 16000, samples)
+
+        with patch("pydub.AudioSegment.from_file") as from_file:
+            data = AudioProcessor.get_audio_segment(str(path), 0.5, 1.0)
+        from_file.assert_not_called()
+
+        out = tmp_path / "segment.wav"
+        out.write_bytes(data)
+        rate, segment = wavfile.read(out)
+        assert rate == 16000
+        np.testing.assert_array_equal(segment, samples[8000:16000])
+
+    def test_compressed_segment_seeks_with_ffmpeg(self, tmp_path):
+        """Test that a format soundfile can't read is cut by ffmpeg, not pydub."""
+        path = tmp_path / "talk.m4a"
+        path.write_bytes(b"not audio")
+        pcm = np.arange(8, dtype='<i2').tobytes()
+
+        def run(cmd, **kwargs):
+            if cmd[0] == "ffprobe":
+                return MagicMock(stdout="44100,2\n")
+            return MagicMock(stdout=pcm)
+
+        with patch("parakeet_mlx_guiapi.audio.processor.subprocess.run", side_effect=run) as run_mock, \
+                patch("pydub.AudioSegment.from_file") as from_file:
+            data = AudioProcessor.get_audio_segment(str(path), 60.0, 65.0)
+        from_file.assert_not_called()
+
+        ffmpeg = run_mock.call_args.args[0]
+        assert ffmpeg.index("-ss") < ffmpeg.index("-i")
+        assert ffmpeg[ffmpeg.index("-t") + 1] == "5.000"
+        assert data == AudioProcessor.wav_header(8, 44100, 2) + pcm
+
+
+class TestToMonoWav:
+    """Tests for AudioProcessor.to_mono_wav."""
+
+    def test_stereo_44k_becomes_16k_mono(self, tmp_path):
+        """Test that stereo 44.1 kHz audio is downmixed and resampled."""
+        pytest.importorskip("soundfile")
+        from scipy.io import wavfile
+
+        src = tmp_path / "stereo.wav"
+        t = np.arange(44100) / 44100
+        tone = (0.5 * np.sin(2 * np.pi * 440 * t) * 32767).astype(np.int16)
+        wavfile.write(src, 44100, np.stack([tone, tone], axis=1))
+
+        dst = tmp_path / "mono.wav"
+        duration = AudioProcessor.to_mono_wav(src, dst)
+
+        rate, out = wavfile.read(dst)
+        assert rate == 16000
+        assert out.ndim == 1 and out.dtype == np.int16
+        assert len(out) == 16000
+        assert duration == pytest.approx(1.0)
+        assert np.abs(out).max() == pytest.approx(16383, rel=0.05)
+
+
+class TestLoadPcm:
+    """Tests for AudioProcessor.load_pcm."""
+
+    def test_stereo_int16_becomes_float_mono(self, tmp_path):
+        """Test that a stereo 8 kHz file decodes to 16 kHz mono float32."""
+        pytest.importorskip("soundfile")
+        from scipy.io import wavfile
+
+        src = tmp_path / "stereo.wav"
+        tone = np.full(8000, 16384, dtype=np.int16)
+        wavfile.write(src, 8000, np.stack([tone, tone // 2], axis=1))
+
+        samples = AudioProcessor.load_pcm(src)
+
+        assert samples.dtype == np.float32 and samples.ndim == 1
+        assert len(samples) == 16000
+        assert samples[4000:12000] == pytest.approx(0.375, abs=1e-3)
@@ -95,6 +95,20 @@ class TestDiarizationResult:
         assert result.get_speaker_at_time(0.0) is None
         assert result.get_speaker_at_time(10.0) is None
 
+    def test_get_speaker_at_time_overlapping(self):
+        """Test lookup inside a long segment that a shorter later one overlaps."""
+        from parakeet_mlx_guiapi.diarization.diarizer import SpeakerSegment, DiarizationResult
+
+        segments = [
+            SpeakerSegment(speaker="SPEAKER_00", start=0.0, end=10.0),
+            SpeakerSegment(speaker="SPEAKER_01", start=2.0, end=3.0),
+        ]
+        result = DiarizationResult(segments=segments, num_speakers=2)
+
+        assert result.get_speaker_at_time(2.5) == "SPEAKER_00"
+        assert result.get_speaker_at_time(6.0) == "SPEAKER_00"
+        assert result.get_speaker_at_time(11.0) is None
+
     def test_find_closest_speaker(self):
         """Test finding closest speaker to a time outside segments."""
         from parakeet_mlx_guiapi.diarization.diarizer import SpeakerSegment, DiarizationResult
@@ -221,6 +235,26 @@ class TestTranscriptFormatting:
         assert "**Speaker 01**" in formatted
         assert "---" in formatted
 
+    def test_format_transcript_accepts_dataframe(self):
+        """Test that the transcriber's DataFrame formats like the dict list."""
+        import pandas as pd
+        from parakeet_mlx_guiapi.diarization.diarizer import SpeakerSegment, DiarizationResult
+
+        segments = [
+            SpeakerSegment(speaker="SPEAKER_00", start=0.0, end=5.0),
+            SpeakerSegment(speaker="SPEAKER_01", start=5.0, end=10.0),
+        ]
+        result = DiarizationResult(segments=segments, num_speakers=2)
+
+        df = pd.DataFrame({
+            "Start (s)": [0.0, 2.5, 5.0],
+            "End (s)": [2.5, 5.0, 10.0],
+            "Segment": ["Hello", "again", "Hi there"],
+        })
+
+        assert result.format_transcript_markdown(df) == result.format_transcript_markdown(df.to_dict("records"))
+        assert result.format_transcript(df) == "SPEAKER_00: Hello again\n\nSPEAKER_01: Hi there"
+
 
 class TestSpeakerDiarizerConfig:
     """Tests for SpeakerDiarizer configuration."""
@@ -303,6 +337,23 @@ class TestSpeakerDiarizerLazyInit:
         with pytest.raises(ValueError, match="HuggingFace token required"):
             diarizer._ensure_initialized()
 
+    def test_pipeline_is_shared_between_diarizers(self):
+        """Test that a second diarizer reuses the loaded pipeline."""
+        from parakeet_mlx_guiapi.diarization import diarizer as module
+
+        pipeline = MagicMock()
+        with patch.dict(module._PIPELINES, clear=True), \
+                patch.object(module.SpeakerDiarizer, "_load_pipeline",
+                             return_value=(pipeline, "cpu")) as load:
+            first = module.SpeakerDiarizer(hf_token="shared")
+            second = module.SpeakerDiarizer(hf_token="shared")
+            first._ensure_initialized()
+            second._ensure_initialized()
+
+        load.assert_called_once()
+        assert first.pipeline is pipeline and second.pipeline is pipeline
+        assert first._pipeline_lock is second._pipeline_lock
+
 
 class TestDiarizeMethod:
     """Tests for the diarize method parameters."""
@@ -330,6 +381,78 @@ class TestDiarizeMethod:
         assert sig.parameters["min_speakers"].default is None
         assert sig.parameters["max_speakers"].default is None
 
+    def test_diarize_passes_path_through(self):
+        """Test that a file path is handed to the pipeline unchanged."""
+        from parakeet_mlx_guiapi.diarization.diarizer import SpeakerDiarizer
+
+        diarizer = SpeakerDiarizer(hf_token="test")
+        diarizer._initialized = True
+        diarizer.pipeline = MagicMock()
+        diarizer.pipeline.return_value.itertracks.return_value = []
+
+        result = diarizer.diarize("/tmp/audio.wav", num_speakers=2)
+
+        diarizer.pipeline.assert_called_once_with("/tmp/audio.wav", num_speakers=2)
+        assert result.num_speakers == 0
+
+    def test_diarize_reuses_result_for_unchanged_file(self, tmp_path):
+        """Test that re-diarizing the same file skips the pipeline."""
+        from parakeet_mlx_guiapi.diarization.diarizer import SpeakerDiarizer
+
+        path = tmp_path / "meeting.wav"
+        path.write_bytes(b"RIFF")
+        diarizer = SpeakerDiarizer(hf_token="test")
+        diarizer._initialized = True
+        diarizer.pipeline = MagicMock()
+        diarizer.pipeline.return_value.itertracks.return_value = []
+
+        first = diarizer.diarize(str(path))
+        second = diarizer.diarize(str(path))
+        diarizer.diarize(str(path), num_speakers=2)
+
+        assert second is first
+        assert diarizer.pipeline.call_count == 2
+
+        # A modified file is diarized again
+        path.write_bytes(b"RIFF-changed")
+        diarizer.diarize(str(path))
+        assert diarizer.pipeline.call_count == 3
+
+    def test_diarize_accepts_ndarray(self):
+        """Test that in-memory samples are passed as a waveform dict."""
+        torch = pytest.importorskip("torch")
+        import numpy as np
+        from parakeet_mlx_guiapi.diarization.diarizer import SpeakerDiarizer
+
+        diarizer = SpeakerDiarizer(hf_token="test")
+        diarizer._initialized = True
+        diarizer.pipeline = MagicMock()
+        diarizer.pipeline.return_value.itertracks.return_value = []
+
+        diarizer.diarize(np.zeros(8000, dtype=np.float32), sample_rate=16000)
+
+        audio_input = diarizer.pipeline.call_args.args[0]
+        assert audio_input["sample_rate"] == 16000
+        assert isinstance(audio_input["waveform"], torch.Tensor)
+        assert tuple(audio_input["waveform"].shape) == (1, 8000)
+
+    def test_diarize_scales_int16_samples(self):
+        """Test that int16 samples are scaled to float32 in [-1, 1)."""
+        torch = pytest.importorskip("torch")
+        import numpy as np
+        from parakeet_mlx_guiapi.diarization.diarizer import SpeakerDiarizer
+
+        diarizer = SpeakerDiarizer(hf_token="test")
+        diarizer._initialized = True
+        diarizer.pipeline = MagicMock()
+        diarizer.pipeline.return_value.itertracks.return_value = []
+
+        diarizer.diarize(np.array([-32768, 0, 16384], dtype=np.int16))
+
+        waveform = diarizer.pipeline.call_args.args[0]["waveform"]
+        assert waveform.dtype == torch.float32
+        assert waveform.flatten().tolist() == [-1.0, 0.0, 0.5]
+
 
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
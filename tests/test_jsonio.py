@@ -0,0 +1,79 @@
+"""
+Unit tests for the JSON file helpers.
+
+Run with: pytest tests/test_jsonio.py -v
+"""
+
+import os
+import json
+
+from parakeet_mlx_guiapi.utils import jsonio
+
+
+class TestJsonIO:
+    """Tests for jsonio read/write helpers."""
+
+    def test_roundtrip(self, tmp_path):
+        """Test that written data reads back unchanged."""
+        path = tmp_path / "history.json"
+        data = [{"text": "héllo wörld", "duration": "1.5s"}, {"text": "", "n": 3}]
+        jsonio.write_json_atomic(path, data)
+        assert jsonio.read_json(path) == data
+
+    def test_indent_output_is_standard_json(self, tmp_path):
+        """Test that indented output is readable by the stdlib json module."""
+        path = tmp_path / "config.json"
+        jsonio.write_json_atomic(path, {"a": 1, "b": [1, 2]}, indent=True)
+        text = path.read_text(encoding="utf-8")
+        assert "\n" in text
+        assert json.loads(text) == {"a": 1, "b": [1, 2]}
+
+    def test_read_missing_returns_default(self, tmp_path):
+        """Test that a missing file returns the default."""
+        assert jsonio.read_json(tmp_path / "missing.json", default=[]) == []
+
+    def test_read_corrupt_returns_default(self, tmp_path):
+        """Test that an unparsable file returns the default."""
+        path = tmp_path / "bad.json"
+        path.write_bytes(b"{not json")
+        assert jsonio.read_json(path, default={}) == {}
+
+    def test_atomic_write_leaves_no_temp_files(self, tmp_path):
+        """Test that the temp file is renamed into place."""
+        path = tmp_path / "data.json"
+        jsonio.write_json_atomic(path, {"x": 1})
+        jsonio.write_json_atomic(path, {"x": 2})
+        assert os.listdir(tmp_path) == ["data.json"]
+        assert jsonio.read_json(path) == {"x": 2}
+
+    def test_jsonl_append_and_read(self, tmp_path):
+        """Test that appended records read back in order."""
+        path = tmp_path / "history.jsonl"
+        jsonio.append_jsonl(path, {"n": 1})
+        jsonio.append_jsonl(path, {"n": 2, "text": "é"})
+        assert jsonio.read_jsonl(path) == [{"n": 1}, {"n": 2, "text": "é"}]
+
+    def test_jsonl_skips_torn_lines(self, tmp_path):
+        """Test that a partial trailing line is ignored."""
+        path = tmp_path / "history.jsonl"
+        path.write_bytes(b'{"n": 1}\n\n{"n": 2')
+        assert jsonio.read_jsonl(path) == [{"n": 1}]
+
+    def test_jsonl_rewrite_replaces_contents(self, tmp_path):
+        """Test that an atomic rewrite drops the old records."""
+        path = tmp_path / "history.jsonl"
+        for n in range(5):
+            jsonio.append_jsonl(path, {"n": n})
+        jsonio.write_jsonl_atomic(path, [{"n": 3}, {"n": 4}])
+        assert jsonio.read_jsonl(path) == [{"n": 3}, {"n": 4}]
+        assert jsonio.read_jsonl(tmp_path / "missing.jsonl") == []
+
+    def test_dumps_matches_orjson_conventions(self):
+        """Test that NaN, key order and separators don't depend on orjson being installed."""
+        data = {"b": float("nan"), "a": [1.5, float("inf")], 3: "x"}
+        assert jsonio.dumps(data, sort_keys=True) == b'{"3":"x","a":[1.5,null],"b":null}'
+
+    def test_dumps_default_hook(self):
+        """Test that unsupported objects go through default."""
+        from decimal import Decimal
+        assert jsonio.dumps({"n": Decimal("1.5")}, default=str) == b'{"n":"1.5"}'
@@ -240,6 +240,57 @@ class TestTranscribeMethodSignature:
         assert "DataFrame" in docstring or "Returns" in docstring
 
 
+class TestPreprocessFastPath:
+    """Tests for skipping preprocessing of 16 kHz mono input."""
+
+    def test_16k_mono_wav_is_used_as_is(self, tmp_path):
+        """Test that a 16 kHz mono WAV is returned without decoding."""
+        try:
+            from parakeet_mlx_guiapi.transcription.transcriber import AudioTranscriber
+        except (ImportError, ModuleNotFoundError) as e:
+            pytest.skip(f"parakeet_mlx not available: {e}")
+        pytest.importorskip("soundfile")
+        from scipy.io import wavfile
+
+        path = tmp_path / "speech.wav"
+        wavfile.write(path, 16000, np.zeros(32000, dtype=np.int16))
+
+        transcriber = AudioTranscriber.__new__(AudioTranscriber)
+        with patch("pydub.AudioSegment.from_file") as from_file:
+            processed_path, duration = transcriber.preprocess_audio(str(path))
+
+        from_file.assert_not_called()
+        assert processed_path == str(path)
+        assert duration == pytest.approx(2.0)
+
+
+class TestTranscribeArray:
+    """Tests for transcribing in-memory samples."""
+
+    def test_long_audio_falls_back_to_chunked_file(self):
+        """Test that audio longer than a chunk goes through a temp WAV."""
+        try:
+            from parakeet_mlx_guiapi.transcription.transcriber import AudioTranscriber
+        except (ImportError, ModuleNotFoundError) as e:
+            pytest.skip(f"parakeet_mlx not available: {e}")
+
+        transcriber = AudioTranscriber.__new__(AudioTranscriber)
+        seen = {}
+
+        def fake_transcribe(path, chunk_duration, overlap_duration, output_csv):
+            seen["path"] = path
+            seen["exists"] = os.path.exists(path)
+            return None, "text"
+
+        transcriber.transcribe = fake_transcribe
+        samples = np.zeros(16000 * 3, dtype=np.int16)
+        _, text = transcriber.transcribe_array(samples, 16000, chunk_duration=2)
+
+        assert text == "text"
+        assert seen["exists"]
+        assert not os.path.exists(seen["path"])
+
+
 class TestErrorHandling:
     """Tests for error handling."""
 